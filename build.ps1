@@ -5,6 +5,10 @@ param(
     [switch]$Clean,
     [switch]$PreprocessOnly,
     [switch]$PrintReady,
+    [string]$Personalise = "",
+    [switch]$Timing,
+    [switch]$Html,
+    [switch]$Epub,
     [string]$Output = ""
 )
 
@@ -30,12 +34,25 @@ if ($Clean) {
     exit 0
 }
 
+# Build timeline in Chrome trace format: every step below is recorded into
+# build\build-trace.json (open in chrome://tracing or ui.perfetto.dev)
+$traceScript = Join-Path $ScriptsDir "build_trace.py"
+$env:BUILD_TRACE = Join-Path $BuildDir "trace-events.jsonl"
+function Invoke-Traced([string]$Name, [string]$Category, [string[]]$Inputs,
+                       [string[]]$Outputs, [string[]]$Command) {
+    $traceArgs = @("run", $Name, $Category)
+    foreach ($path in $Inputs) { $traceArgs += @("--in", $path) }
+    foreach ($path in $Outputs) { $traceArgs += @("--out", $path) }
+    & python $traceScript @traceArgs "--" @Command
+}
+$stepStart = python $traceScript start 2>$null
+
 Write-Host "========================================" -ForegroundColor Cyan
 Write-Host "  Building Book of Verse PDF" -ForegroundColor Cyan
 Write-Host "========================================" -ForegroundColor Cyan
 
 # Step 1: Check prerequisites
-Write-Host "`n[1/4] Checking prerequisites..." -ForegroundColor Yellow
+Write-Host "`n[1/7] Checking prerequisites..." -ForegroundColor Yellow
 
 $missingTools = @()
 
@@ -62,14 +79,15 @@ if ($missingTools.Count -gt 0) {
 }
 
 Write-Host "All prerequisites found." -ForegroundColor Green
+python $traceScript span "prerequisites" setup --since $stepStart
 
 # Step 2: Preprocess markdown
-Write-Host "`n[2/4] Preprocessing markdown files..." -ForegroundColor Yellow
+Write-Host "`n[2/7] Preprocessing markdown files..." -ForegroundColor Yellow
 
 $preprocessScript = Join-Path $ScriptsDir "preprocess.py"
 $combinedMd = Join-Path $BuildDir "combined.md"
 
-python $preprocessScript $DocsDir $combinedMd
+Invoke-Traced "preprocess" preprocess @($DocsDir) @($combinedMd) @("python", $preprocessScript, $DocsDir, $combinedMd)
 
 if ($LASTEXITCODE -ne 0) {
     Write-Host "Preprocessing failed!" -ForegroundColor Red
@@ -78,13 +96,34 @@ if ($LASTEXITCODE -ne 0) {
 
 Write-Host "Preprocessing complete: $combinedMd" -ForegroundColor Green
 
+# Fail fast on characters the configured fonts cannot typeset
+$glyphScript = Join-Path $ScriptsDir "check-glyphs.py"
+$glyphTemplate = Join-Path $TemplateDir $(if ($PrintReady) { "print-ready.tex" } else { "pandoc-template.tex" })
+Invoke-Traced "check-glyphs" preprocess @($combinedMd) @() @("python", $glyphScript, $combinedMd, "--template", $glyphTemplate)
+
+if ($LASTEXITCODE -ne 0) {
+    Write-Host "Glyph coverage check failed!" -ForegroundColor Red
+    exit 1
+}
+
 if ($PreprocessOnly) {
     Write-Host "`nPreprocessing only - stopping here." -ForegroundColor Yellow
     exit 0
 }
 
-# Step 3: Convert to LaTeX with Pandoc
-Write-Host "`n[3/4] Converting to PDF with Pandoc..." -ForegroundColor Yellow
+# Step 3: Foil die artwork (SVG + vector PDF, written directly)
+Write-Host "`n[3/7] Generating foil die artwork..." -ForegroundColor Yellow
+
+$dieScript = Join-Path $ScriptsDir "generate-die-artwork.py"
+Invoke-Traced "generate-die-artwork" cover @() @(Join-Path $ScriptDir "cover-design\production") @("python", $dieScript, "--strict")
+
+if ($LASTEXITCODE -ne 0) {
+    Write-Host "Die artwork generation failed!" -ForegroundColor Red
+    exit 1
+}
+
+# Step 4: Convert to LaTeX with Pandoc, typeset with XeLaTeX
+Write-Host "`n[4/7] Converting to PDF with Pandoc + XeLaTeX..." -ForegroundColor Yellow
 
 if ($PrintReady) {
     $template = Join-Path $TemplateDir "print-ready.tex"
@@ -95,13 +134,15 @@ if ($PrintReady) {
     if (-not $Output) { $Output = "output\BookOfVerse.pdf" }
 }
 $outputPdf = Join-Path $ScriptDir $Output
+$bookTex = Join-Path $BuildDir "book.tex"
+$bookLog = Join-Path $BuildDir "book.log"
 
 # Pandoc options for high-quality output
 $pandocArgs = @(
     $combinedMd,
-    "-o", $outputPdf,
+    "-o", $bookTex,
+    "--standalone",
     "--template=$template",
-    "--pdf-engine=xelatex",
     "--toc",
     "--toc-depth=3",
     "--number-sections",
@@ -115,17 +156,69 @@ $pandocArgs = @(
     "-V", "fontsize=11pt"
 )
 
+# Reserve a dedication page for per-copy personalisation
+if ($Personalise) {
+    $pandocArgs += @("-V", "dedication-page=true")
+}
+
+# Per-chapter and per-page typesetting times into build\book.tim
+if ($Timing) {
+    $pandocArgs += @("-V", "timing=true")
+}
+
 Write-Host "Running: pandoc $($pandocArgs -join ' ')" -ForegroundColor DarkGray
 
-& pandoc @pandocArgs
+Invoke-Traced "pandoc" convert @($combinedMd) @($bookTex) (@("pandoc") + $pandocArgs)
 
 if ($LASTEXITCODE -ne 0) {
-    Write-Host "PDF generation failed!" -ForegroundColor Red
+    Write-Host "LaTeX generation failed!" -ForegroundColor Red
     exit 1
 }
 
-# Step 4: Verify output
-Write-Host "`n[4/4] Verifying output..." -ForegroundColor Yellow
+# XeLaTeX runs here rather than inside pandoc so build\book.log is kept for
+# the log analysis step. Same passes as pandoc: at least two (TOC), a third
+# only if labels moved.
+foreach ($pass in 1..3) {
+    Invoke-Traced "xelatex pass $pass" typeset @($bookTex) @(Join-Path $BuildDir "book.pdf") `
+        @("xelatex", "-halt-on-error", "-interaction=nonstopmode", "-output-directory=$BuildDir", $bookTex) | Out-Null
+    if ($LASTEXITCODE -ne 0) {
+        Write-Host "XeLaTeX failed (pass $pass) - see $bookLog" -ForegroundColor Red
+        Select-String -Path $bookLog -Pattern "^!" -Context 0,5 | Select-Object -First 4
+        exit 1
+    }
+    if ($pass -ge 2 -and -not (Select-String -Path $bookLog -Pattern "Rerun to get|Label\(s\) may have changed" -Quiet)) {
+        break
+    }
+}
+Move-Item -Force (Join-Path $BuildDir "book.pdf") $outputPdf
+
+if ($Timing) {
+    $timingFile = Join-Path $BuildDir "book.tim"
+    $timingScript = Join-Path $ScriptsDir "analyse-latex-timing.py"
+    Invoke-Traced "analyse-latex-timing" postprocess @($timingFile) @() `
+        @("python", $timingScript, $timingFile, "--markdown", $combinedMd)
+}
+
+# Step 5: Deduplicate, merge font subsets, recompress; verified by rendering
+Write-Host "`n[5/7] Optimising PDF..." -ForegroundColor Yellow
+
+$optimiseScript = Join-Path $ScriptsDir "optimise-pdf.py"
+Invoke-Traced "optimise-pdf" postprocess @($outputPdf) @($outputPdf) @("python", $optimiseScript, $outputPdf)
+
+if ($LASTEXITCODE -ne 0) {
+    Write-Host "PDF optimisation failed!" -ForegroundColor Red
+    exit 1
+}
+
+# Step 6: Proof worklist from the XeLaTeX log
+Write-Host "`n[6/7] Analysing LaTeX log..." -ForegroundColor Yellow
+
+$logScript = Join-Path $ScriptsDir "analyse-latex-log.py"
+Invoke-Traced "analyse-latex-log" postprocess @($bookLog) @(Join-Path $OutputDir "proofs") `
+    @("python", $logScript, $bookLog, "--markdown", $combinedMd, "--top", "10")
+
+# Step 7: Verify output
+Write-Host "`n[7/7] Verifying output..." -ForegroundColor Yellow
 
 if (Test-Path $outputPdf) {
     $fileInfo = Get-Item $outputPdf
@@ -139,3 +232,44 @@ if (Test-Path $outputPdf) {
     Write-Host "Output file not found!" -ForegroundColor Red
     exit 1
 }
+
+# Optional: personalised copies spliced into the base interior
+if ($Personalise) {
+    Write-Host "`nPersonalising copies for $Personalise..." -ForegroundColor Yellow
+    $personaliseScript = Join-Path $ScriptsDir "personalise-interior.py"
+    $personaliseArgs = @($Personalise, "--base", $outputPdf)
+    if ($PrintReady) { $personaliseArgs += "--print-ready" }
+    Invoke-Traced "personalise-interior" postprocess @($outputPdf) @(Join-Path $OutputDir "personalised") `
+        (@("python", $personaliseScript) + $personaliseArgs)
+    if ($LASTEXITCODE -ne 0) {
+        Write-Host "Personalisation failed!" -ForegroundColor Red
+        exit 1
+    }
+}
+
+# Optional: offline HTML companion edition with search, from the same chapters
+if ($Html) {
+    Write-Host "`nBuilding HTML edition..." -ForegroundColor Yellow
+    $htmlScript = Join-Path $ScriptsDir "build-html.py"
+    Invoke-Traced "build-html" html @($combinedMd) @(Join-Path $OutputDir "html") `
+        @("python", $htmlScript, $combinedMd)
+    if ($LASTEXITCODE -ne 0) {
+        Write-Host "HTML edition failed!" -ForegroundColor Red
+        exit 1
+    }
+}
+
+# Optional: EPUB for e-readers, from the same chapters (and conversion cache)
+if ($Epub) {
+    Write-Host "`nBuilding EPUB edition..." -ForegroundColor Yellow
+    $epubScript = Join-Path $ScriptsDir "build-epub.py"
+    Invoke-Traced "build-epub" epub @($combinedMd) @(Join-Path $OutputDir "BookOfVerse.epub") `
+        @("python", $epubScript, $combinedMd)
+    if ($LASTEXITCODE -ne 0) {
+        Write-Host "EPUB edition failed!" -ForegroundColor Red
+        exit 1
+    }
+}
+
+Write-Host ""
+python $traceScript finish
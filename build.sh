@@ -14,9 +14,17 @@ SCRIPTS_DIR="$SCRIPT_DIR/scripts"
 # Parse arguments
 PRINT_READY=false
 OUTPUT_FILE=""
+PERSONALISE=""
+TIMING=false
+HTML=false
+EPUB=false
 for arg in "$@"; do
     case "$arg" in
         --print-ready) PRINT_READY=true ;;
+        --timing) TIMING=true ;;
+        --html) HTML=true ;;
+        --epub) EPUB=true ;;
+        --personalise=*) PERSONALISE="${arg#*=}" ;;
         *) OUTPUT_FILE="$arg" ;;
     esac
 done
@@ -31,12 +39,22 @@ NC='\033[0m' # No Color
 # Create directories
 mkdir -p "$BUILD_DIR" "$OUTPUT_DIR"
 
+# Build timeline in Chrome trace format: every step below is recorded into
+# build/build-trace.json (open in chrome://tracing or ui.perfetto.dev)
+TRACE="$SCRIPTS_DIR/build_trace.py"
+export BUILD_TRACE="$BUILD_DIR/trace-events.jsonl"
+traced() { python3 "$TRACE" run "$@"; }
+STEP_START=$(python3 "$TRACE" start 2> /dev/null || true)
+if [ -n "$STEP_START" ]; then
+    trap 'echo; python3 "$TRACE" finish' EXIT
+fi
+
 echo -e "${CYAN}========================================"
 echo "  Building Book of Verse PDF"
 echo -e "========================================${NC}"
 
 # Step 1: Check prerequisites
-echo -e "\n${YELLOW}[1/4] Checking prerequisites...${NC}"
+echo -e "\n${YELLOW}[1/7] Checking prerequisites...${NC}"
 
 MISSING_TOOLS=()
 
@@ -63,18 +81,35 @@ if [ ${#MISSING_TOOLS[@]} -gt 0 ]; then
 fi
 
 echo -e "${GREEN}All prerequisites found.${NC}"
+python3 "$TRACE" span "prerequisites" setup --since "$STEP_START"
 
 # Step 2: Preprocess markdown
-echo -e "\n${YELLOW}[2/4] Preprocessing markdown files...${NC}"
+echo -e "\n${YELLOW}[2/7] Preprocessing markdown files...${NC}"
 
 COMBINED_MD="$BUILD_DIR/combined.md"
 
-python3 "$SCRIPTS_DIR/preprocess.py" "$DOCS_DIR" "$COMBINED_MD"
+traced "preprocess" preprocess --in "$DOCS_DIR" --out "$COMBINED_MD" -- \
+    python3 "$SCRIPTS_DIR/preprocess.py" "$DOCS_DIR" "$COMBINED_MD"
 
 echo -e "${GREEN}Preprocessing complete: $COMBINED_MD${NC}"
 
-# Step 3: Convert to PDF with Pandoc
-echo -e "\n${YELLOW}[3/4] Converting to PDF with Pandoc...${NC}"
+# Fail fast on characters the configured fonts cannot typeset
+if [ "$PRINT_READY" = true ]; then
+    GLYPH_TEMPLATE="$TEMPLATE_DIR/print-ready.tex"
+else
+    GLYPH_TEMPLATE="$TEMPLATE_DIR/pandoc-template.tex"
+fi
+traced "check-glyphs" preprocess --in "$COMBINED_MD" -- \
+    python3 "$SCRIPTS_DIR/check-glyphs.py" "$COMBINED_MD" --template "$GLYPH_TEMPLATE"
+
+# Step 3: Foil die artwork (SVG + vector PDF, written directly)
+echo -e "\n${YELLOW}[3/7] Generating foil die artwork...${NC}"
+
+traced "generate-die-artwork" cover --out "$SCRIPT_DIR/cover-design/production" -- \
+    python3 "$SCRIPTS_DIR/generate-die-artwork.py" --strict
+
+# Step 4: Convert to LaTeX with Pandoc, typeset with XeLaTeX
+echo -e "\n${YELLOW}[4/7] Converting to PDF with Pandoc + XeLaTeX...${NC}"
 
 if [ "$PRINT_READY" = true ]; then
     TEMPLATE="$TEMPLATE_DIR/print-ready.tex"
@@ -85,11 +120,24 @@ else
     OUTPUT_FILE="${OUTPUT_FILE:-output/BookOfVerse.pdf}"
 fi
 OUTPUT_PDF="$SCRIPT_DIR/$OUTPUT_FILE"
+BOOK_TEX="$BUILD_DIR/book.tex"
+BOOK_LOG="$BUILD_DIR/book.log"
+
+# Reserve a dedication page for per-copy personalisation
+EXTRA_ARGS=()
+if [ -n "$PERSONALISE" ]; then
+    EXTRA_ARGS+=(-V dedication-page=true)
+fi
+# Per-chapter and per-page typesetting times into build/book.tim
+if [ "$TIMING" = true ]; then
+    EXTRA_ARGS+=(-V timing=true)
+fi
 
-pandoc "$COMBINED_MD" \
-    -o "$OUTPUT_PDF" \
+traced "pandoc" convert --in "$COMBINED_MD" --out "$BOOK_TEX" -- \
+    pandoc "$COMBINED_MD" \
+    -o "$BOOK_TEX" \
+    --standalone \
     --template="$TEMPLATE" \
-    --pdf-engine=xelatex \
     --toc \
     --toc-depth=3 \
     --number-sections \
@@ -100,10 +148,45 @@ pandoc "$COMBINED_MD" \
     --metadata=author:"Tim Sweeney and the Verse Team" \
     -V documentclass=book \
     -V papersize=letter \
-    -V fontsize=11pt
+    -V fontsize=11pt \
+    "${EXTRA_ARGS[@]}"
+
+# XeLaTeX runs here rather than inside pandoc so build/book.log is kept for
+# the log analysis step. Same passes as pandoc: at least two (TOC), a third
+# only if labels moved.
+for PASS in 1 2 3; do
+    if ! traced "xelatex pass $PASS" typeset --in "$BOOK_TEX" --out "$BUILD_DIR/book.pdf" -- \
+            xelatex -halt-on-error -interaction=nonstopmode \
+            -output-directory="$BUILD_DIR" "$BOOK_TEX" > /dev/null; then
+        echo -e "${RED}XeLaTeX failed (pass $PASS) — see $BOOK_LOG${NC}"
+        grep -A 5 "^!" "$BOOK_LOG" | head -20
+        exit 1
+    fi
+    if [ "$PASS" -ge 2 ] && ! grep -q "Rerun to get\|Label(s) may have changed" "$BOOK_LOG"; then
+        break
+    fi
+done
+mv "$BUILD_DIR/book.pdf" "$OUTPUT_PDF"
 
-# Step 4: Verify output
-echo -e "\n${YELLOW}[4/4] Verifying output...${NC}"
+if [ "$TIMING" = true ]; then
+    traced "analyse-latex-timing" postprocess --in "$BUILD_DIR/book.tim" -- \
+        python3 "$SCRIPTS_DIR/analyse-latex-timing.py" "$BUILD_DIR/book.tim" --markdown "$COMBINED_MD"
+fi
+
+# Step 5: Deduplicate, merge font subsets, recompress; verified by rendering
+echo -e "\n${YELLOW}[5/7] Optimising PDF...${NC}"
+
+traced "optimise-pdf" postprocess --in "$OUTPUT_PDF" --out "$OUTPUT_PDF" -- \
+    python3 "$SCRIPTS_DIR/optimise-pdf.py" "$OUTPUT_PDF"
+
+# Step 6: Proof worklist from the XeLaTeX log
+echo -e "\n${YELLOW}[6/7] Analysing LaTeX log...${NC}"
+
+traced "analyse-latex-log" postprocess --in "$BOOK_LOG" --out "$OUTPUT_DIR/proofs" -- \
+    python3 "$SCRIPTS_DIR/analyse-latex-log.py" "$BOOK_LOG" --markdown "$COMBINED_MD" --top 10
+
+# Step 7: Verify output
+echo -e "\n${YELLOW}[7/7] Verifying output...${NC}"
 
 if [ -f "$OUTPUT_PDF" ]; then
     SIZE=$(du -h "$OUTPUT_PDF" | cut -f1)
@@ -116,3 +199,28 @@ else
     echo -e "${RED}Output file not found!${NC}"
     exit 1
 fi
+
+# Optional: personalised copies spliced into the base interior
+if [ -n "$PERSONALISE" ]; then
+    echo -e "\n${YELLOW}Personalising copies for $PERSONALISE...${NC}"
+    PERSONALISE_ARGS=("$PERSONALISE" --base "$OUTPUT_PDF")
+    if [ "$PRINT_READY" = true ]; then
+        PERSONALISE_ARGS+=(--print-ready)
+    fi
+    traced "personalise-interior" postprocess --in "$OUTPUT_PDF" --out "$OUTPUT_DIR/personalised" -- \
+        python3 "$SCRIPTS_DIR/personalise-interior.py" "${PERSONALISE_ARGS[@]}"
+fi
+
+# Optional: offline HTML companion edition with search, from the same chapters
+if [ "$HTML" = true ]; then
+    echo -e "\n${YELLOW}Building HTML edition...${NC}"
+    traced "build-html" html --in "$COMBINED_MD" --out "$OUTPUT_DIR/html" -- \
+        python3 "$SCRIPTS_DIR/build-html.py" "$COMBINED_MD"
+fi
+
+# Optional: EPUB for e-readers, from the same chapters (and conversion cache)
+if [ "$EPUB" = true ]; then
+    echo -e "\n${YELLOW}Building EPUB edition...${NC}"
+    traced "build-epub" epub --in "$COMBINED_MD" --out "$OUTPUT_DIR/BookOfVerse.epub" -- \
+        python3 "$SCRIPTS_DIR/build-epub.py" "$COMBINED_MD"
+fi
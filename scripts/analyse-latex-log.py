@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+analyse-latex-log.py
+
+Proof worklist from the xelatex log of a book build. Every
+  - Overfull / Underfull \\hbox,
+  - missing character (glyph not in the font), and
+  - undefined reference (\\ref, \\pageref, \\hyperref, PDF link target)
+is extracted and traced back through build/combined.md (and the source map
+preprocess.py writes next to it) to the original docs file and line.
+
+The log is read as a stream, one line at a time: TeX's 79-column wrapping is
+undone on the fly, the open-file stack is tracked from its parentheses and
+the physical PDF page from the shipout markers, so a multi-megabyte log is
+processed in one pass.
+
+Mapping back to the source is by text, not by position: the typeset text
+TeX prints for an overfull line (font switches stripped) is matched word by
+word against combined.md, with the TeX line numbers as a tie-breaker, and
+then against the docs file of that chapter. Missing characters and undefined
+labels are looked up directly in the docs files.
+
+Writes a ranked text report and a JSON feed to output/proofs/ and prints
+the top of the list. Run automatically by build.sh / build.ps1; standalone:
+  python scripts/analyse-latex-log.py [build/book.log] [--top 40] [--strict]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+BUILD_DIR = os.path.join(REPO_ROOT, "build")
+PROOF_DIR = os.path.join(REPO_ROOT, "output", "proofs")
+
+MAX_PRINT_LINE = 79       # TeX wraps log lines at this many characters
+MIN_MATCH = 0.5           # fraction of a snippet's words a source line must contain
+MAX_LOCATIONS = 20        # source locations listed per issue in the text report
+
+# Worklist order: broken output first, then layout by severity
+KIND_RANK = {
+    "undefined-reference": 0,
+    "missing-character": 1,
+    "overfull-hbox": 2,
+    "underfull-hbox": 3,
+}
+
+BOX_RE = re.compile(
+    r"^(Overfull|Underfull) \\([hv])box \((?:(-?[\d.]+)pt too \w+|badness (\d+))\) "
+    r"(?:in (?:paragraph|alignment) at lines (\d+)--(\d+)|detected at line (\d+)"
+    r"|has occurred while \\output is active)")
+MISSING_RE = re.compile(
+    r"^Missing character: There is no (.+?) (?:\(U\+([0-9A-Fa-f]+)\) )?in font (.+?)!$")
+FONT_FILE_RE = re.compile(r"\[([^\]]+)\]")
+UNDEFINED_RE = re.compile(
+    r"LaTeX Warning: (?:Hyper r|R)eference [`'](.+?)' on page (\S+) "
+    r"undefined on input line (\d+)\.")
+UNDEFINED_DEST_RE = re.compile(r"Object @(\S+) used, but not defined")
+FILE_RE = re.compile(r"\(([^\s()]+\.[A-Za-z]+)")
+PAGE_RE = re.compile(r"\[(\d+)(?=[\s\]<{]|$)")
+FONT_SWITCH_RE = re.compile(r"\\[A-Z]+\d?/[^\s/]+/[^\s/]+/[^\s/]+/[\d.]+ ?")
+CONTROL_RE = re.compile(r"\\[A-Za-z@]+|\[\]")
+WORD_RE = re.compile(r"\w{2,}")
+
+
+def log_lines(path):
+    """Yield the log's logical lines, undoing TeX's hard wrapping."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        pending = ""
+        for raw in f:
+            line = raw.rstrip("\n")
+            if len(line) == MAX_PRINT_LINE or len(line.encode("utf-8")) == MAX_PRINT_LINE:
+                pending += line
+                continue
+            yield pending + line
+            pending = ""
+        if pending:
+            yield pending
+
+
+def font_name(spec):
+    """Font of a missing-character warning.
+
+    The file name of a bracketed spec ("[SourceSerif4-Regular.otf]/OT:..."),
+    else the name before any ":options".
+    """
+    bracketed = FONT_FILE_RE.search(spec)
+    if bracketed:
+        return bracketed.group(1)
+    return spec.split(":")[0].strip("\"")
+
+
+def box_text(lines):
+    """Plain text of TeX's short display of a box (font switches removed)."""
+    text = FONT_SWITCH_RE.sub("", " ".join(lines))
+    return " ".join(CONTROL_RE.sub(" ", text).split())
+
+
+def parse_log(path):
+    """Raw issues from a xelatex log, in log order."""
+    issues = []
+    files = []            # open-file stack; None for non-file parentheses
+    shipped = 0           # pages shipped out so far
+    lines = log_lines(path)
+
+    def current_file():
+        return next((f for f in reversed(files) if f), None)
+
+    for line in lines:
+        box = BOX_RE.match(line)
+        if box:
+            kind, axis, pt, badness, first, last, at = box.groups()
+            display = []
+            for detail in lines:          # box display runs to the next blank line
+                if not detail.strip():
+                    break
+                display.append(detail)
+            if axis != "h":
+                continue
+            first = first or at
+            issues.append({
+                "kind": f"{kind.lower()}-hbox",
+                "severity": float(pt) if pt else int(badness),
+                "file": current_file(),
+                "tex_lines": [int(first), int(last or first)] if first else None,
+                "pdf_page": shipped + 1,
+                "text": box_text(display),
+            })
+            continue
+
+        missing = MISSING_RE.match(line)
+        if missing:
+            char, code, font = missing.groups()
+            issues.append({
+                "kind": "missing-character",
+                "char": char,
+                "codepoint": f"U+{int(code, 16) if code else ord(char[0]):04X}",
+                "font": font_name(font),
+                "pdf_page": shipped + 1,
+            })
+            continue
+
+        undefined = UNDEFINED_RE.search(line)
+        if undefined:
+            label, _, tex_line = undefined.groups()
+            issues.append({
+                "kind": "undefined-reference",
+                "label": label,
+                "file": current_file(),
+                "tex_lines": [int(tex_line), int(tex_line)],
+                "pdf_page": shipped + 1,
+            })
+            continue
+        undefined = UNDEFINED_DEST_RE.search(line)
+        if undefined:
+            issues.append({"kind": "undefined-reference", "label": undefined.group(1),
+                           "file": None, "tex_lines": None, "pdf_page": None})
+            continue
+
+        # Track input files and shipouts from the remaining transcript text
+        for token in re.finditer(r"\(|\)|\[\d+", line):
+            t = token.group()
+            if t == "(":
+                name = FILE_RE.match(line, token.start())
+                files.append(name.group(1) if name else None)
+            elif t == ")":
+                if files:
+                    files.pop()
+            elif PAGE_RE.match(line, token.start()):
+                shipped += 1
+    return issues
+
+
+class SourceIndex:
+    """Word index over combined.md and the docs files it was built from."""
+
+    def __init__(self, markdown, source_map, tex):
+        self.md = self._read(markdown)
+        self.tex_total = len(self._read(tex)) if tex else 0
+        self.chapters = []
+        self.docs_dir = None
+        if source_map and os.path.exists(source_map):
+            with open(source_map, encoding="utf-8") as f:
+                data = json.load(f)
+            self.docs_dir = data.get("docs_dir")
+            self.chapters = data.get("chapters", [])
+        self.docs = {}
+        for chapter in self.chapters:
+            path = os.path.join(self.docs_dir or "", chapter["file"])
+            if os.path.exists(path):
+                self.docs[chapter["file"]] = self._read(path)
+        self._index = self._build_index(self.md)
+        self._doc_index = {name: self._build_index(lines) for name, lines in self.docs.items()}
+
+    @staticmethod
+    def _read(path):
+        if not path or not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read().split("\n")
+
+    @staticmethod
+    def _build_index(lines):
+        index = defaultdict(set)
+        for i, line in enumerate(lines):
+            for word in WORD_RE.findall(line):
+                index[word].add(i)
+        return index
+
+    @staticmethod
+    def _best_line(words, index, expected=None):
+        """0-based line containing most of words, or None below MIN_MATCH."""
+        words = set(words)
+        if not words:
+            return None
+        hits = Counter()
+        for word in words:
+            hits.update(index.get(word, ()))
+        if not hits:
+            return None
+        best = max(hits.values())
+        if best < MIN_MATCH * len(words):
+            return None
+        candidates = [i for i, n in hits.items() if n == best]
+        if expected is None:
+            return min(candidates)
+        return min(candidates, key=lambda i: abs(i - expected))
+
+    def chapter_of(self, md_line):
+        for chapter in self.chapters:
+            if chapter["start"] <= md_line <= chapter["end"]:
+                return chapter
+        return None
+
+    def locate_text(self, text, tex_lines):
+        """(combined.md line, docs file, docs line) for a typeset snippet."""
+        words = WORD_RE.findall(text)
+        expected = None
+        if tex_lines and self.tex_total and self.md:
+            expected = tex_lines[0] / self.tex_total * len(self.md)
+        i = self._best_line(words, self._index, expected)
+        if i is None:
+            return None, None, None
+        chapter = self.chapter_of(i + 1)
+        if not chapter:
+            return i + 1, None, None
+        name = chapter["file"]
+        if name not in self.docs:
+            return i + 1, name, None
+        # Same snippet against the original file (print fixes may have split
+        # the line, so match the combined line's words as well)
+        j = self._best_line(words + WORD_RE.findall(self.md[i]), self._doc_index[name])
+        return i + 1, name, (j + 1 if j is not None else None)
+
+    def find(self, pattern):
+        """All (file, line) where pattern matches: docs files, else combined.md."""
+        if self.docs:
+            return [(name, n) for name, lines in self.docs.items()
+                    for n, line in enumerate(lines, 1) if pattern.search(line)]
+        return [("combined.md", n) for n, line in enumerate(self.md, 1) if pattern.search(line)]
+
+
+def build_worklist(issues, index):
+    """Group, locate and rank raw issues."""
+    items = []
+
+    for issue in issues:
+        if issue["kind"].endswith("hbox"):
+            md_line, name, line = index.locate_text(issue["text"], issue["tex_lines"])
+            issue.update({"combined_line": md_line,
+                          "source": {"file": name, "line": line} if name else None})
+            items.append(issue)
+
+    missing = {}
+    for issue in (i for i in issues if i["kind"] == "missing-character"):
+        key = (issue["char"], issue["font"])
+        if key not in missing:
+            missing[key] = dict(issue, count=0, pdf_pages=[])
+            missing[key].pop("pdf_page")
+            pattern = re.compile(re.escape(issue["char"]))
+            missing[key]["locations"] = [{"file": f, "line": n} for f, n in index.find(pattern)]
+        missing[key]["count"] += 1
+        if issue["pdf_page"] not in missing[key]["pdf_pages"]:
+            missing[key]["pdf_pages"].append(issue["pdf_page"])
+    for item in missing.values():
+        item["severity"] = item["count"]
+        items.append(item)
+
+    undefined = {}
+    for issue in (i for i in issues if i["kind"] == "undefined-reference"):
+        label = issue["label"]
+        if label not in undefined:
+            pattern = re.compile(r"(?<![\w-])(?:#|\\(?:page)?ref\{)" + re.escape(label) + r"(?![\w-])")
+            undefined[label] = {"kind": "undefined-reference", "label": label, "count": 0,
+                                "tex_lines": [], "pdf_pages": [],
+                                "locations": [{"file": f, "line": n}
+                                              for f, n in index.find(pattern)]}
+        item = undefined[label]
+        item["count"] += 1
+        if issue["tex_lines"]:
+            item["tex_lines"].append(issue["tex_lines"][0])
+        if issue["pdf_page"] and issue["pdf_page"] not in item["pdf_pages"]:
+            item["pdf_pages"].append(issue["pdf_page"])
+    for item in undefined.values():
+        item["severity"] = item["count"]
+        items.append(item)
+
+    items.sort(key=lambda item: (KIND_RANK[item["kind"]], -item["severity"]))
+    for rank, item in enumerate(items, 1):
+        item["rank"] = rank
+    return items
+
+
+def where(item):
+    """'file:line' for a located issue."""
+    source = item.get("source")
+    if source and source["line"]:
+        return f"{source['file']}:{source['line']}"
+    if source:
+        return f"{source['file']} (combined.md:{item['combined_line']})"
+    if item.get("combined_line"):
+        return f"combined.md:{item['combined_line']}"
+    lines = item.get("tex_lines")
+    return f"book.tex:{lines[0]}" if lines else "?"
+
+
+def format_item(item):
+    """One worklist entry as report lines."""
+    kind = item["kind"]
+    if kind.endswith("hbox"):
+        amount = (f"{item['severity']:.1f}pt too wide" if kind == "overfull-hbox"
+                  else f"badness {item['severity']}")
+        text = item["text"] if len(item["text"]) <= 72 else item["text"][:69] + "..."
+        return [f"{item['rank']:4d}. {kind} {amount}  {where(item)}  (p. {item['pdf_page']})",
+                f"        {text}"]
+    if kind == "missing-character":
+        head = (f"{item['rank']:4d}. missing {item['codepoint']} {item['char']!r} in "
+                f"{item['font']} ×{item['count']}")
+    else:
+        head = f"{item['rank']:4d}. undefined reference '{item['label']}' ×{item['count']}"
+    locations = [f"{loc['file']}:{loc['line']}" for loc in item["locations"]]
+    more = len(locations) - MAX_LOCATIONS
+    body = ", ".join(locations[:MAX_LOCATIONS]) + (f" … (+{more})" if more > 0 else "")
+    return [head, f"        {body or 'not found in source'}"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proof worklist from a xelatex build log.")
+    parser.add_argument("log", nargs="?", default=os.path.join(BUILD_DIR, "book.log"),
+                        help="xelatex log (default: build/book.log)")
+    parser.add_argument("--tex", default=None,
+                        help="LaTeX source the log belongs to (default: log name with .tex)")
+    parser.add_argument("--markdown", default=os.path.join(BUILD_DIR, "combined.md"),
+                        help="preprocessed markdown (default: build/combined.md)")
+    parser.add_argument("--out-dir", default=PROOF_DIR,
+                        help="where to write latex-worklist.txt/.json (default: output/proofs)")
+    parser.add_argument("--top", type=int, default=25,
+                        help="entries to print (default: 25; the report has all)")
+    parser.add_argument("--strict", action="store_true",
+                        help="exit 1 on overfull boxes, missing characters or undefined references")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.log):
+        print(f"Error: {args.log} not found — run build.sh first")
+        sys.exit(1)
+    tex = args.tex or os.path.splitext(args.log)[0] + ".tex"
+    source_map = os.path.splitext(args.markdown)[0] + ".map.json"
+
+    index = SourceIndex(args.markdown, source_map, tex)
+    items = build_worklist(parse_log(args.log), index)
+
+    counts = Counter(item["kind"] for item in items)
+    summary = ", ".join(f"{counts[kind]} {kind}" for kind in KIND_RANK)
+    report = [f"LaTeX proof worklist: {os.path.relpath(args.log, REPO_ROOT)}", summary, ""]
+    for item in items:
+        report += format_item(item)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    txt_path = os.path.join(args.out_dir, "latex-worklist.txt")
+    json_path = os.path.join(args.out_dir, "latex-worklist.json")
+    with open(txt_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(report) + "\n")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"log": os.path.relpath(args.log, REPO_ROOT), "counts": dict(counts),
+                   "items": items}, f, indent=2, ensure_ascii=False)
+
+    print(f"  {summary}")
+    shown = 0
+    for item in items[:args.top]:
+        for line in format_item(item):
+            print(f"  {line}")
+        shown += 1
+    if len(items) > shown:
+        print(f"  … {len(items) - shown} more in the report")
+    print(f"  Created: {os.path.relpath(txt_path, REPO_ROOT)}")
+    print(f"  Created: {os.path.relpath(json_path, REPO_ROOT)}")
+
+    blocking = sum(counts[k] for k in KIND_RANK if k != "underfull-hbox")
+    sys.exit(1 if args.strict and blocking else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+analyse-latex-timing.py
+
+Where XeLaTeX spends its time, per chapter and per page. Reads the marks the
+templates write to build/book.tim when built with `pandoc -V timing=true`
+(build.sh --timing):
+  - one mark per page shipped out, and
+  - one at \\mainmatter, every \\part and \\chapter, and \\backmatter,
+each with the elapsed time of the run, and:
+
+  1. Cuts the run into segments at the boundary marks: front matter, each
+     part page, each chapter, back matter.
+  2. Names the body chapters and parts from CHAPTERS and PARTS in
+     preprocess.py, in the order the source map (build/combined.map.json)
+     says they were combined.
+  3. Counts what each chapter asks of the template — code lines and tables —
+     from its line range in build/combined.md, and fits seconds per page,
+     per code line and per table across chapters, so the expensive features
+     stand out from the long chapters.
+  4. Lists the slowest pages.
+
+Writes output/proofs/latex-timing.json. The .tim file is rewritten on every
+xelatex pass; the report covers the last one. An engine with no elapsed-time
+primitive writes only "notimer", which is reported as an error.
+
+Run from repo root:
+  python scripts/analyse-latex-timing.py [build/book.tim] [--top 10]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from preprocess import CHAPTERS, PARTS
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+BUILD_DIR = os.path.join(REPO_ROOT, "build")
+PROOF_DIR = os.path.join(REPO_ROOT, "output", "proofs")
+
+TIMER_UNIT = 65536        # \pdf@elapsedtime ticks per second
+BOUNDARIES = ("begin", "mainmatter", "part", "chapter", "backmatter", "end")
+FEATURES = ("pages", "code_lines", "tables")
+
+FENCE_RE = re.compile(r"^\s*(`{3,}|~{3,})")
+TABLE_RE = re.compile(r"^\s*\|")
+
+
+def read_marks(path):
+    """[(mark, pages shipped, seconds)] in file order."""
+    marks = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
+                marks.append((parts[0], int(parts[1]), int(parts[2]) / TIMER_UNIT))
+    return marks
+
+
+def chapter_features(markdown, source_map):
+    """file -> {code_lines, tables} from each chapter's combined.md lines."""
+    with open(markdown, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    features = {}
+    for chapter in source_map["chapters"]:
+        counts = {"code_lines": 0, "tables": 0}
+        fence, in_table = None, False
+        for line in lines[chapter["start"] - 1:chapter["end"]]:
+            m = FENCE_RE.match(line)
+            if fence:
+                if m and m.group(1)[0] == fence[0] and len(m.group(1)) >= len(fence):
+                    fence = None
+                else:
+                    counts["code_lines"] += 1
+                continue
+            if m:
+                fence = m.group(1)
+                continue
+            table_row = bool(TABLE_RE.match(line))
+            counts["tables"] += table_row and not in_table
+            in_table = table_row
+        features[chapter["file"]] = counts
+    return features
+
+
+def segments(marks, chapter_files):
+    """Split the run at boundary marks; returns (segments, page times).
+
+    Each segment is a dict with name, kind, first/last physical page and
+    seconds; page times map physical page -> seconds spent on it.
+    """
+    titles = {filename: title for filename, title, _ in CHAPTERS}
+    part_names = [name for name, files in PARTS if files[0] in chapter_files]
+
+    start = next((t for mark, _, t in marks if mark == "begin"), 0.0)
+    page_times, previous = {}, start
+    for mark, shipped, t in marks:
+        if mark == "page":
+            page_times[shipped] = t - previous
+            previous = t
+
+    bounds = [(mark, shipped, t) for mark, shipped, t in marks if mark in BOUNDARIES]
+    result, chapters_seen, parts_seen, matter = [], 0, 0, "front"
+    for (mark, shipped, t), (_, next_shipped, next_t) in zip(bounds, bounds[1:]):
+        if mark == "mainmatter":
+            matter = "body"
+        elif mark == "backmatter":
+            matter = "back"
+        if matter == "body" and mark == "chapter":
+            filename = (chapter_files[chapters_seen] if chapters_seen < len(chapter_files)
+                        else None)
+            name, kind = titles.get(filename, f"Chapter {chapters_seen + 1}"), "chapter"
+            chapters_seen += 1
+        elif matter == "body" and mark == "part":
+            filename = None
+            name = (part_names[parts_seen] if parts_seen < len(part_names)
+                    else f"Part {parts_seen + 1}")
+            kind = "part"
+            parts_seen += 1
+        else:
+            filename, name, kind = None, f"{matter.capitalize()} matter", matter
+        segment = {"name": name, "kind": kind, "file": filename,
+                   "first_page": shipped + 1, "last_page": next_shipped,
+                   "seconds": next_t - t}
+        # Consecutive marks of the same matter (front matter chapters, the
+        # boundary itself) fold into one segment
+        if result and kind in ("front", "back") and result[-1]["kind"] == kind:
+            result[-1]["last_page"] = next_shipped
+            result[-1]["seconds"] += next_t - t
+        elif kind != "body" or next_shipped > shipped:
+            result.append(segment)
+    if chapters_seen != len(chapter_files):
+        print(f"  Warning: {chapters_seen} chapters typeset but {len(chapter_files)} in "
+              "the source map — chapter names may be shifted")
+    return result, page_times
+
+
+def fit_costs(rows):
+    """Seconds per unit of each feature, by least squares over chapters.
+
+    Features that come out negative (noise, or collinear with another) are
+    dropped and the fit repeated, so every reported cost is >= 0.
+    """
+    import numpy as np
+    active = list(FEATURES)
+    while active:
+        x = np.array([[row[f] for f in active] for row in rows], float)
+        y = np.array([row["seconds"] for row in rows], float)
+        coefficients, *_ = np.linalg.lstsq(x, y, rcond=None)
+        if (coefficients >= 0).all():
+            return dict(zip(active, (float(c) for c in coefficients)))
+        del active[int(np.argmin(coefficients))]
+    return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-chapter and per-page XeLaTeX timing.")
+    parser.add_argument("timing", nargs="?", default=os.path.join(BUILD_DIR, "book.tim"),
+                        help="timing marks (default: build/book.tim)")
+    parser.add_argument("--markdown", default=os.path.join(BUILD_DIR, "combined.md"),
+                        help="preprocessed markdown (default: build/combined.md)")
+    parser.add_argument("--out-dir", default=PROOF_DIR,
+                        help="where to write latex-timing.json (default: output/proofs)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="slowest pages to list (default: 10)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.timing):
+        print(f"Error: {args.timing} not found — build with --timing "
+              "(pandoc -V timing=true) first")
+        sys.exit(1)
+    with open(args.timing, encoding="utf-8") as f:
+        if f.readline().strip() == "notimer":
+            print(f"Error: {args.timing} has no times — this TeX engine has no "
+                  "elapsed-time primitive (\\pdf@elapsedtime)")
+            sys.exit(1)
+    marks = read_marks(args.timing)
+    if not any(mark == "end" for mark, _, _ in marks):
+        print(f"Error: {args.timing} has no end mark — the xelatex run did not finish")
+        sys.exit(1)
+
+    map_path = os.path.splitext(args.markdown)[0] + ".map.json"
+    features = {}
+    if os.path.exists(map_path) and os.path.exists(args.markdown):
+        with open(map_path, encoding="utf-8") as f:
+            source_map = json.load(f)
+        chapter_files = [c["file"] for c in source_map["chapters"]]
+        features = chapter_features(args.markdown, source_map)
+    else:
+        chapter_files = [filename for filename, _, _ in CHAPTERS]
+
+    rows, page_times = segments(marks, chapter_files)
+    total = sum(row["seconds"] for row in rows) or 1.0
+    for row in rows:
+        row["pages"] = max(0, row["last_page"] - row["first_page"] + 1)
+        row.update(features.get(row["file"], {}))
+
+    print(f"XeLaTeX timing: {os.path.relpath(args.timing, REPO_ROOT)} "
+          f"({total:.1f}s, {len(page_times)} pages)\n")
+    print(f"  {'':34s} {'pages':>9s} {'time':>7s} {'s/page':>7s} {'share':>6s} "
+          f"{'code':>6s} {'tables':>6s}")
+    for row in rows:
+        per_page = row["seconds"] / row["pages"] if row["pages"] else 0.0
+        pages = f"{row['first_page']}–{row['last_page']}" if row["pages"] else "–"
+        extra = (f" {row['code_lines']:6d} {row['tables']:6d}"
+                 if "code_lines" in row else "")
+        print(f"  {row['name'][:34]:34s} {pages:>9s} {row['seconds']:6.2f}s "
+              f"{per_page:7.3f} {row['seconds'] / total:6.1%}{extra}")
+
+    costs = {}
+    chapters = [row for row in rows if row["kind"] == "chapter" and "code_lines" in row]
+    if len(chapters) > len(FEATURES):
+        try:
+            costs = fit_costs(chapters)
+        except ImportError:
+            print("\n  [SKIP] Feature cost estimate — run: pip install numpy")
+    if costs:
+        units = {"pages": "page", "code_lines": "code line", "tables": "table"}
+        print("\n  Estimated cost: " + ", ".join(
+            f"{seconds * 1000:.1f} ms per {units[feature]}"
+            for feature, seconds in costs.items()))
+
+    def segment_of(page):
+        return next((row["name"] for row in rows
+                     if row["first_page"] <= page <= row["last_page"]), "?")
+
+    slowest = sorted(page_times.items(), key=lambda item: -item[1])[:args.top]
+    if slowest:
+        print("\n  Slowest pages:")
+        for page, seconds in slowest:
+            print(f"    p. {page:<4d} {seconds:6.3f}s  {segment_of(page)}")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    json_path = os.path.join(args.out_dir, "latex-timing.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"timing": os.path.relpath(args.timing, REPO_ROOT),
+                   "seconds": round(total, 3), "segments": rows, "costs": costs,
+                   "pages": [{"page": page, "seconds": round(seconds, 4),
+                              "segment": segment_of(page)}
+                             for page, seconds in sorted(page_times.items())]},
+                  f, indent=2, ensure_ascii=False)
+    print(f"\n  Created: {os.path.relpath(json_path, REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
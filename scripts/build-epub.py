@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+build-epub.py
+
+EPUB 3 edition for e-readers, built from the same intermediates as the PDF
+rather than a second Pandoc pipeline from the docs:
+
+  1. Takes the chapters preprocess.py combined (build/combined.md and its
+     source map) — admonitions already mapped to their box classes, Verse
+     blocks marked for line numbers, the generated Concept Index — and
+     converts them with html_chapters.py: one chapter per worker across a
+     process pool, tango highlighting as in the PDF, and a content-hashed
+     cache in build/html-cache/ shared with the HTML edition, so unchanged
+     chapters are read back instead of re-converted.
+  2. Re-serialises each chapter as well-formed XHTML, points cross-references
+     at the chapter file that has the anchor and images at content-hashed
+     names (images/<sha>.png), so an unchanged image is stored under the
+     same name on every build.
+  3. Adds a title page for every part in PARTS and a navigation document
+     nesting the chapters (and their sections) under their parts, then
+     writes the container: mimetype first and stored, everything else
+     deflated.
+
+Writes output/BookOfVerse.epub. Requires Pandoc, as the PDF build.
+
+Run from repo root (after preprocess.py):
+  python scripts/build-epub.py [build/combined.md] [--output output/BookOfVerse.epub]
+                               [--workers N]
+"""
+
+import argparse
+import html
+import os
+import re
+import shutil
+import sys
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from string import Template
+from xml.etree import ElementTree
+
+from build_trace import span
+from html_chapters import convert_chapters, hashed_images, link_pages, load_chapters
+from preprocess import INDEX_FILE, PARTS
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+BUILD_DIR = os.path.join(REPO_ROOT, "build")
+EPUB_TEMPLATE_DIR = os.path.join(REPO_ROOT, "templates", "epub")
+OUTPUT_PATH = os.path.join(REPO_ROOT, "output", "BookOfVerse.epub")
+
+TITLE = "Book of Verse"
+AUTHOR = "Tim Sweeney and the Verse Team"
+# Stable across builds, so e-readers treat a rebuild as the same book
+IDENTIFIER = f"urn:uuid:{uuid.uuid5(uuid.NAMESPACE_URL, 'https://github.com/verselang/book')}"
+
+CONTAINER_XML = """<?xml version="1.0" encoding="utf-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+<rootfiles>
+<rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml" />
+</rootfiles>
+</container>
+"""
+MEDIA_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
+               ".gif": "image/gif", ".svg": "image/svg+xml", ".webp": "image/webp"}
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+                 "meta", "source", "track", "wbr"}
+
+
+class XhtmlWriter(HTMLParser):
+    """Re-serialises an HTML fragment as well-formed XHTML.
+
+    Void elements are closed, attributes quoted, text escaped and comments
+    dropped. Elements left open — raw HTML in the docs such as a stray
+    <decides> outside backticks — are closed with their parent, and end
+    tags with no open element are dropped.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.open = []
+
+    def _attrs(self, attrs):
+        return "".join(f' {name}="{html.escape(name if value is None else value)}"'
+                       for name, value in attrs)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            self.handle_startendtag(tag, attrs)
+            return
+        self.out.append(f"<{tag}{self._attrs(attrs)}>")
+        self.open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.out.append(f"<{tag}{self._attrs(attrs)} />")
+
+    def handle_endtag(self, tag):
+        if tag not in self.open:
+            return
+        while self.open:
+            name = self.open.pop()
+            self.out.append(f"</{name}>")
+            if name == tag:
+                break
+
+    def handle_data(self, data):
+        self.out.append(html.escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        while self.open:
+            self.out.append(f"</{self.open.pop()}>")
+
+
+def to_xhtml(fragment):
+    writer = XhtmlWriter()
+    writer.feed(fragment)
+    writer.close()
+    return "".join(writer.out)
+
+
+def sections_of(fragment):
+    """(id, title) of each ## section, for the navigation document."""
+    return [(anchor, " ".join(re.sub(r"<[^>]+>", "", title).split()))
+            for anchor, title in re.findall(r'<h2[^>]*\sid="([^"]+)"[^>]*>(.*?)</h2>',
+                                            fragment, re.S)]
+
+
+def navigation(entries):
+    """EPUB 3 nav: parts, their chapters, and each chapter's sections."""
+    def item(entry):
+        text = f'<a href="{entry["page"]}">{html.escape(entry["label"])}</a>'
+        children = [item(child) for child in entry.get("children", [])]
+        children += [f'<li><a href="{entry["page"]}#{anchor}">{html.escape(title)}</a></li>'
+                     for anchor, title in entry.get("sections", [])]
+        return f"<li>{text}" + (f"<ol>{''.join(children)}</ol>" if children else "") + "</li>"
+    return ('<nav epub:type="toc" id="toc"><h1>Contents</h1><ol>'
+            + "".join(item(entry) for entry in entries) + "</ol></nav>")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EPUB edition from the preprocessed chapters.")
+    parser.add_argument("markdown", nargs="?", default=os.path.join(BUILD_DIR, "combined.md"),
+                        help="preprocessed markdown (default: build/combined.md)")
+    parser.add_argument("--output", default=OUTPUT_PATH,
+                        help="EPUB to write (default: output/BookOfVerse.epub)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="chapters converted in parallel (default: CPU count)")
+    args = parser.parse_args()
+
+    if shutil.which("pandoc") is None:
+        print("Error: Pandoc is required — see README.md for installation")
+        sys.exit(1)
+    map_path = os.path.splitext(args.markdown)[0] + ".map.json"
+    if not os.path.exists(args.markdown) or not os.path.exists(map_path):
+        print(f"Error: {args.markdown} and its source map not found — "
+              "run scripts/preprocess.py first")
+        sys.exit(1)
+
+    chapters = load_chapters(args.markdown)
+    print(f"EPUB edition: {len(chapters)} chapters from "
+          f"{os.path.relpath(args.markdown, REPO_ROOT)}")
+    try:
+        results = convert_chapters(chapters, args.workers)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"  Converted {sum(not r['cached'] for r in results)} chapters, "
+          f"{sum(r['cached'] for r in results)} unchanged from build/html-cache/")
+
+    # Spine: part title pages before their first chapter
+    part_of = {files[0]: (index, name) for index, (name, files) in enumerate(PARTS, 1)}
+    in_part = {filename for _, files in PARTS for filename in files}
+    owner, pages, nav, current_part = {}, [], [], None
+    for chapter, result in zip(chapters, results):
+        chapter["page"] = f"{chapter['anchor']}.xhtml"
+        if chapter["file"] in part_of:
+            index, name = part_of[chapter["file"]]
+            current_part = {"page": f"part-{index}.xhtml", "label": name, "children": []}
+            nav.append(current_part)
+            pages.append({"page": current_part["page"], "title": name, "type": "part",
+                          "body": f'<h1 class="part-title">{html.escape(name)}</h1>',
+                          "ids": set()})
+        entry = {"page": chapter["page"], "label": chapter["label"],
+                 "sections": ([] if chapter["file"] == INDEX_FILE
+                              else sections_of(result["fragment"]))}
+        if chapter["file"] in in_part and current_part:
+            current_part["children"].append(entry)
+        else:
+            nav.append(entry)
+        kind = ("backmatter" if chapter["file"] == INDEX_FILE
+                else "bodymatter chapter" if chapter["file"] in in_part else "frontmatter")
+        pages.append({"page": chapter["page"], "title": chapter["title"], "type": kind,
+                      "body": result["fragment"], "ids": set(result["ids"]),
+                      "docs_dir": chapter["docs_dir"]})
+        for anchor in result["ids"]:
+            owner.setdefault(anchor, chapter["page"])
+
+    with open(os.path.join(EPUB_TEMPLATE_DIR, "chapter.xhtml"), encoding="utf-8") as f:
+        page_template = Template(f.read())
+    with open(os.path.join(EPUB_TEMPLATE_DIR, "content.opf"), encoding="utf-8") as f:
+        opf_template = Template(f.read())
+
+    files, images = {}, {}
+    with span("xhtml", "epub"):
+        for page in pages:
+            body = page["body"]
+            if "docs_dir" in page:
+                body, used = hashed_images(body, page["docs_dir"], prefix="../images/")
+                images.update(used)
+            body = link_pages(body, page["ids"], owner)
+            document = page_template.substitute(title=html.escape(page["title"]),
+                                                type=page["type"], content=to_xhtml(body))
+            try:
+                ElementTree.fromstring(document.encode("utf-8"))
+            except ElementTree.ParseError as e:
+                print(f"Error: {page['page']} is not well-formed XHTML: {e}")
+                sys.exit(1)
+            files[f"OEBPS/text/{page['page']}"] = document
+        files["OEBPS/text/nav.xhtml"] = page_template.substitute(
+            title="Contents", type="frontmatter", content=navigation(nav))
+
+    now = datetime.now(timezone.utc)
+    manifest = [f'<item id="p-{page["page"][:-6]}" href="text/{page["page"]}" '
+                'media-type="application/xhtml+xml" />' for page in pages]
+    manifest += [f'<item id="img-{name.split(".")[0]}" href="images/{name}" '
+                 f'media-type="{MEDIA_TYPES.get(os.path.splitext(name)[1], "image/png")}" />'
+                 for name in sorted(images)]
+    spine = ['<itemref idref="nav" linear="no" />']
+    spine += [f'<itemref idref="p-{page["page"][:-6]}" />' for page in pages]
+    files["OEBPS/content.opf"] = opf_template.substitute(
+        identifier=IDENTIFIER, title=TITLE, author=AUTHOR, date=now.strftime("%Y-%m-%d"),
+        modified=now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        manifest="\n".join(manifest), spine="\n".join(spine))
+    with open(os.path.join(EPUB_TEMPLATE_DIR, "style.css"), encoding="utf-8") as f:
+        files["OEBPS/style.css"] = f.read()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    partial = args.output + ".part"
+    with span("container", "epub", outputs=[partial]):
+        with zipfile.ZipFile(partial, "w") as epub:
+            # The mimetype must come first, uncompressed, for readers to sniff
+            epub.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+            epub.writestr("META-INF/container.xml", CONTAINER_XML,
+                          compress_type=zipfile.ZIP_DEFLATED)
+            for name, content in files.items():
+                epub.writestr(name, content, compress_type=zipfile.ZIP_DEFLATED)
+            for name, path in sorted(images.items()):
+                epub.write(path, f"OEBPS/images/{name}", compress_type=zipfile.ZIP_DEFLATED)
+    os.replace(partial, args.output)
+
+    print(f"  Created: {os.path.relpath(args.output, REPO_ROOT)} ({len(pages)} pages, "
+          f"{len(images)} images, {os.path.getsize(args.output) / 1024:.0f} KB)")
+    print("\nDone!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+build-html.py
+
+Offline HTML companion edition, built from the chapters preprocess.py has
+already combined for the PDF (build/combined.md and its source map):
+
+  1. Converts each chapter to an HTML fragment with Pandoc, one chapter per
+     worker across a process pool, through html_chapters.py's cache (shared
+     with the EPUB edition). Pages are named and numbered after
+     build_filename_anchor_map() (chapter-05.html, preface.html) with the
+     PDF's section numbers, and grouped in the sidebar by PARTS.
+  2. Points cross-references at the page that actually has the anchor
+     (#anchor -> chapter-05.html#anchor), and turns the Concept Index page
+     references into links.
+  3. Builds an inverted index over every section — prose terms plus the
+     identifiers in code blocks — and writes it sharded by first character
+     (search/terms-a.js, ...). The browser loads a shard only when a query
+     needs it, with <script> tags rather than fetch(), so search is instant
+     and works straight from disk with no server.
+
+Writes output/html/ (open index.html). Requires Pandoc, as the PDF build.
+
+Run from repo root (after preprocess.py):
+  python scripts/build-html.py [build/combined.md] [--out-dir output/html] [--workers N]
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import shutil
+import sys
+from collections import Counter
+from html.parser import HTMLParser
+from string import Template
+
+from build_trace import span
+from html_chapters import convert_chapters, hashed_images, link_pages, load_chapters
+from preprocess import INDEX_FILE, PARTS
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+BUILD_DIR = os.path.join(REPO_ROOT, "build")
+HTML_TEMPLATE_DIR = os.path.join(REPO_ROOT, "templates", "html")
+OUTPUT_DIR = os.path.join(REPO_ROOT, "output", "html")
+
+HEADING_WEIGHT = 5        # score per occurrence of a term in a section heading
+CODE_WEIGHT = 2           # ... of an identifier in code
+MIN_TERM_LENGTH = 2
+STOP_WORDS = frozenset("""
+    an and are as at be but by can do does for from has have if in into is it
+    its not of on or so than that the their then there these this to was we
+    were when which while will with you your
+""".split())
+
+HEADINGS = ("h1", "h2", "h3")
+
+
+def tokenise(text):
+    """Search terms in text; search.js tokenises queries the same way.
+
+    STOP_WORDS and MIN_TERM_LENGTH reach it through search/tokeniser.js.
+    """
+    return [t for t in re.findall(r"[a-z0-9_]+", text.lower())
+            if len(t) >= MIN_TERM_LENGTH and t not in STOP_WORDS and not t.isdigit()]
+
+
+class SectionIndexer(HTMLParser):
+    """Splits a chapter fragment into sections at h1–h3 and scores their terms.
+
+    sections is a list of [anchor, title, level, Counter of term scores];
+    text inside <code>/<pre> counts CODE_WEIGHT, so identifiers used in the
+    examples rank above passing mentions.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.sections = []
+        self.heading = None
+        self.code = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in HEADINGS:
+            self.heading = (dict(attrs).get("id") or "", int(tag[1]), [])
+        elif tag in ("code", "pre"):
+            self.code += 1
+
+    def handle_endtag(self, tag):
+        if tag in HEADINGS and self.heading:
+            anchor, level, parts = self.heading
+            title = " ".join("".join(parts).split())
+            counts = Counter({t: HEADING_WEIGHT * n for t, n in Counter(tokenise(title)).items()})
+            self.sections.append([anchor, title, level, counts])
+            self.heading = None
+        elif tag in ("code", "pre"):
+            self.code = max(0, self.code - 1)
+
+    def handle_data(self, data):
+        if self.heading:
+            self.heading[2].append(data)
+            return
+        if not self.sections:
+            self.sections.append(["", "", 1, Counter()])
+        weight = CODE_WEIGHT if self.code else 1
+        counts = self.sections[-1][3]
+        for term in tokenise(data):
+            counts[term] += weight
+
+
+def navigation(chapters, current=None):
+    """Sidebar: every chapter, under its part, the current page marked."""
+    part_of = {files[0]: name for name, files in PARTS}
+    items = ['<ol class="chapters">']
+    for chapter in chapters:
+        if chapter["file"] in part_of:
+            items.append(f'<li class="part">{html.escape(part_of[chapter["file"]])}</li>')
+        marker = ' class="current"' if chapter["file"] == current else ""
+        items.append(f'<li{marker}><a href="{chapter["page"]}">'
+                     f'{html.escape(chapter["label"])}</a></li>')
+    items.append("</ol>")
+    return "\n  ".join(items)
+
+
+def table_of_contents(chapters, sections):
+    """index.html body: parts, chapters and their ## sections."""
+    part_of = {files[0]: name for name, files in PARTS}
+    body = ['<h1>Book of Verse</h1>', '<div class="toc">']
+    for chapter in chapters:
+        if chapter["file"] in part_of:
+            body.append(f'<h2 class="part">{html.escape(part_of[chapter["file"]])}</h2>')
+        body.append(f'<h3><a href="{chapter["page"]}">{html.escape(chapter["label"])}</a></h3>')
+        subsections = [(anchor, title) for anchor, title, level, _ in sections[chapter["file"]]
+                       if level == 2 and anchor]
+        if subsections:
+            body.append("<ol>" + "".join(
+                f'<li><a href="{chapter["page"]}#{anchor}">{html.escape(title)}</a></li>'
+                for anchor, title in subsections) + "</ol>")
+    body.append("</div>")
+    return "\n".join(body)
+
+
+def write_search_index(chapters, sections, search_dir):
+    """Inverted index shards; returns (sections, terms, shards, bytes).
+
+    The Concept Index is left out: it repeats every term with no content.
+    """
+    docs, shards = [], {}
+    for chapter in chapters:
+        if chapter["file"] == INDEX_FILE:
+            continue
+        for anchor, title, _, counts in sections[chapter["file"]]:
+            if not counts:
+                continue
+            doc = len(docs)
+            docs.append([chapter["page"], anchor, title or chapter["label"], chapter["label"]])
+            for term, score in counts.items():
+                shard = "terms-" + ("0" if term[0].isdigit() else term[0])
+                shards.setdefault(shard, {}).setdefault(term, []).extend((doc, score))
+
+    if os.path.isdir(search_dir):
+        shutil.rmtree(search_dir)
+    os.makedirs(search_dir)
+    total = 0
+    tokeniser = {"stopWords": sorted(STOP_WORDS), "minLength": MIN_TERM_LENGTH}
+    for name, data in [("tokeniser", tokeniser), ("docs", docs)] + sorted(shards.items()):
+        text = (f"VerseSearch.loaded({json.dumps(name)}, "
+                f"{json.dumps(data, ensure_ascii=False, separators=(',', ':'))});\n")
+        with open(os.path.join(search_dir, f"{name}.js"), "w", encoding="utf-8") as f:
+            f.write(text)
+        total += len(text.encode("utf-8"))
+    return len(docs), sum(len(s) for s in shards.values()), len(shards), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline HTML edition with search.")
+    parser.add_argument("markdown", nargs="?", default=os.path.join(BUILD_DIR, "combined.md"),
+                        help="preprocessed markdown (default: build/combined.md)")
+    parser.add_argument("--out-dir", default=OUTPUT_DIR,
+                        help="where to write the site (default: output/html)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="chapters converted in parallel (default: CPU count)")
+    args = parser.parse_args()
+
+    if shutil.which("pandoc") is None:
+        print("Error: Pandoc is required — see README.md for installation")
+        sys.exit(1)
+    map_path = os.path.splitext(args.markdown)[0] + ".map.json"
+    if not os.path.exists(args.markdown) or not os.path.exists(map_path):
+        print(f"Error: {args.markdown} and its source map not found — "
+              "run scripts/preprocess.py first")
+        sys.exit(1)
+
+    chapters = load_chapters(args.markdown)
+    for chapter in chapters:
+        chapter["page"] = f"{chapter['anchor']}.html"
+
+    print(f"HTML edition: {len(chapters)} chapters from "
+          f"{os.path.relpath(args.markdown, REPO_ROOT)}")
+    try:
+        results = convert_chapters(chapters, args.workers)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"  Converted {sum(not r['cached'] for r in results)} chapters, "
+          f"{sum(r['cached'] for r in results)} unchanged from build/html-cache/")
+
+    fragments, page_ids, sections, owner, images = {}, {}, {}, {}, {}
+    for chapter, result in zip(chapters, results):
+        filename = chapter["file"]
+        fragments[filename], used = hashed_images(result["fragment"], chapter["docs_dir"])
+        images.update(used)
+        page_ids[filename] = set(result["ids"])
+        indexer = SectionIndexer()
+        indexer.feed(result["fragment"])
+        sections[filename] = indexer.sections
+        for anchor in result["ids"]:
+            owner.setdefault(anchor, chapter["page"])
+
+    with open(os.path.join(HTML_TEMPLATE_DIR, "page.html"), encoding="utf-8") as f:
+        page = Template(f.read())
+    os.makedirs(os.path.join(args.out_dir, "assets"), exist_ok=True)
+    for asset in ("style.css", "search.js"):
+        shutil.copyfile(os.path.join(HTML_TEMPLATE_DIR, asset),
+                        os.path.join(args.out_dir, "assets", asset))
+    if images:
+        os.makedirs(os.path.join(args.out_dir, "images"), exist_ok=True)
+    for name, path in images.items():
+        target = os.path.join(args.out_dir, "images", name)
+        if not os.path.exists(target):
+            shutil.copyfile(path, target)
+
+    with span("write pages", "html", outputs=[args.out_dir]):
+        for i, chapter in enumerate(chapters):
+            prev = chapters[i - 1] if i > 0 else None
+            next_ = chapters[i + 1] if i + 1 < len(chapters) else None
+            content = link_pages(fragments[chapter["file"]], page_ids[chapter["file"]], owner)
+            with open(os.path.join(args.out_dir, chapter["page"]), "w", encoding="utf-8") as f:
+                f.write(page.substitute(
+                    title=html.escape(chapter["title"]),
+                    nav=navigation(chapters, chapter["file"]),
+                    content=content,
+                    prev=(f'<a href="{prev["page"]}">← {html.escape(prev["label"])}</a>'
+                          if prev else ""),
+                    next=(f'<a href="{next_["page"]}">{html.escape(next_["label"])} →</a>'
+                          if next_ else "")))
+        with open(os.path.join(args.out_dir, "index.html"), "w", encoding="utf-8") as f:
+            f.write(page.substitute(
+                title="Contents", nav=navigation(chapters),
+                content=table_of_contents(chapters, sections), prev="",
+                next=(f'<a href="{chapters[0]["page"]}">{html.escape(chapters[0]["label"])} →</a>'
+                      if chapters else "")))
+    print(f"  Created: {os.path.relpath(args.out_dir, REPO_ROOT)}/ "
+          f"({len(chapters) + 1} pages)")
+
+    with span("search index", "html"):
+        docs, terms, shard_count, size = write_search_index(
+            chapters, sections, os.path.join(args.out_dir, "search"))
+    print(f"  Search index: {docs} sections, {terms} terms in {shard_count} shards "
+          f"({size / 1024:.0f} KB)")
+
+    print(f"\nDone! Open {os.path.relpath(os.path.join(args.out_dir, 'index.html'), REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+build_trace.py
+
+Build timeline in Chrome trace-event format: open build/build-trace.json in
+chrome://tracing or https://ui.perfetto.dev to see where build minutes go
+and how parallel work overlaps.
+
+Each span (start, duration, process ID, bytes in and out) is appended as one
+JSON line to the events file named by the BUILD_TRACE environment variable,
+so any number of processes — build scripts, their pool workers, commands
+wrapped by build.sh — record into the same build without coordination.
+With BUILD_TRACE unset, spans cost nothing and record nothing.
+
+Used by scripts:
+    from build_trace import span
+    with span(filename, "preprocess", inputs=[path]) as s:
+        ...
+        s.bytes_out = len(content)        # or s.outputs.append(path)
+
+From build.sh / build.ps1 (BUILD_TRACE exported first):
+    python scripts/build_trace.py start
+    python scripts/build_trace.py run NAME CATEGORY [--in PATH] [--out PATH] -- CMD ...
+    T0=$(python scripts/build_trace.py now)
+    python scripts/build_trace.py span NAME CATEGORY --since "$T0"
+    python scripts/build_trace.py finish
+
+Cover scripts run on their own join a build's trace the same way:
+    BUILD_TRACE=build/trace-events.jsonl python scripts/generate-cover-mockups.py
+    python scripts/build_trace.py finish
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+EVENTS_PATH = os.path.join(REPO_ROOT, "build", "trace-events.jsonl")
+TRACE_PATH = os.path.join(REPO_ROOT, "build", "build-trace.json")
+
+
+def _now():
+    """Wall-clock microseconds, comparable across processes."""
+    return time.time_ns() // 1000
+
+
+def _size(paths):
+    """Total bytes of files (directories recursively); missing paths count 0."""
+    total = 0
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+        elif os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+
+def record(event, path=None):
+    """Append one event to the trace; no-op unless BUILD_TRACE is set."""
+    path = path or os.environ.get("BUILD_TRACE")
+    if not path:
+        return
+    line = json.dumps(event, ensure_ascii=False) + "\n"
+    # One append-mode write per event keeps concurrent writers' lines whole
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+class span:
+    """Context manager recording a complete ("X") event for the enclosed work.
+
+    inputs are measured on entry and outputs on exit (files or directories);
+    bytes_in / bytes_out may also be set directly, and args carries anything
+    else worth seeing in the viewer.
+    """
+
+    def __init__(self, name, cat="build", inputs=(), outputs=(), **args):
+        self.name, self.cat = name, cat
+        self.outputs = list(outputs)
+        self.args = args
+        self.enabled = bool(os.environ.get("BUILD_TRACE"))
+        self.bytes_in = _size(inputs) if self.enabled and inputs else None
+        self.bytes_out = None
+
+    def __enter__(self):
+        self.start = _now()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.enabled:
+            return False
+        end = _now()
+        args = dict(self.args)
+        if self.bytes_in is not None:
+            args["bytes_in"] = self.bytes_in
+        if self.bytes_out is None and self.outputs:
+            self.bytes_out = _size(self.outputs)
+        if self.bytes_out is not None:
+            args["bytes_out"] = self.bytes_out
+        if exc_type is not None:
+            args["error"] = exc_type.__name__
+        pid = os.getpid()
+        tid = pid if threading.current_thread() is threading.main_thread() \
+            else threading.get_native_id()
+        record({"name": self.name, "cat": self.cat, "ph": "X", "ts": self.start,
+                "dur": end - self.start, "pid": pid, "tid": tid,
+                "process": os.path.basename(sys.argv[0]) or "python", "args": args})
+        return False
+
+
+def run_command(name, cat, command, inputs, outputs):
+    """Run a command as one span, under the child's own process ID."""
+    bytes_in = _size(inputs)
+    start = _now()
+    proc = subprocess.Popen(command)
+    returncode = proc.wait()
+    end = _now()
+    # Name the lane after the script for "python script.py", else the program
+    process = next((os.path.basename(arg) for arg in command[1:] if arg.endswith(".py")),
+                   os.path.basename(command[0]))
+    record({"name": name, "cat": cat, "ph": "X", "ts": start, "dur": end - start,
+            "pid": proc.pid, "tid": proc.pid, "process": process,
+            "args": {"command": " ".join(command), "exit_code": returncode,
+                     "bytes_in": bytes_in, "bytes_out": _size(outputs)}})
+    return returncode
+
+
+def finish(events_path, trace_path, shell_pid):
+    """Events file -> Chrome trace JSON; returns the events for the summary."""
+    events, build_start = [], None
+    with open(events_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            event = json.loads(line)
+            if event.get("ph") == "start":
+                build_start = event["ts"]
+                continue
+            events.append(event)
+    if not events:
+        return []
+
+    first = min([e["ts"] for e in events] + ([build_start] if build_start else []))
+    last = max(e["ts"] + e["dur"] for e in events)
+    events.append({"name": "build", "cat": "build", "ph": "X", "ts": first,
+                   "dur": last - first, "pid": shell_pid, "tid": shell_pid,
+                   "process": "build"})
+
+    names = {}
+    for event in events:
+        names.setdefault(event["pid"], event.pop("process", "?"))
+        event["ts"] -= first
+    metadata = [{"name": "process_name", "ph": "M", "pid": pid, "tid": pid,
+                 "args": {"name": f"{name} ({pid})" if pid != shell_pid else name}}
+                for pid, name in names.items()]
+    metadata += [{"name": "process_sort_index", "ph": "M", "pid": pid, "tid": pid,
+                  "args": {"sort_index": index}}
+                 for index, pid in enumerate(sorted(names, key=lambda p: min(
+                     e["ts"] for e in events if e["pid"] == p)))]
+
+    os.makedirs(os.path.dirname(trace_path), exist_ok=True)
+    with open(trace_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build timeline in Chrome trace format.")
+    parser.add_argument("--events", default=os.environ.get("BUILD_TRACE") or EVENTS_PATH,
+                        help="events file (default: $BUILD_TRACE or build/trace-events.jsonl)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("start", help="begin a new trace (truncates the events file) "
+                                 "and print its start timestamp")
+    sub.add_parser("now", help="print the current trace timestamp")
+
+    p = sub.add_parser("span", help="record a span that started at --since until now")
+    p.add_argument("name")
+    p.add_argument("cat")
+    p.add_argument("--since", type=int, required=True)
+
+    p = sub.add_parser("run", help="run a command as a span: run NAME CAT [...] -- CMD ...")
+    p.add_argument("name")
+    p.add_argument("cat")
+    p.add_argument("--in", dest="inputs", action="append", default=[])
+    p.add_argument("--out", dest="outputs", action="append", default=[])
+
+    p = sub.add_parser("finish", help="write the Chrome trace JSON")
+    p.add_argument("--out", default=TRACE_PATH,
+                   help="trace file (default: build/build-trace.json)")
+
+    # Everything after "--" is the command to run, not our options
+    argv = sys.argv[1:]
+    command = argv[argv.index("--") + 1:] if "--" in argv else []
+    args = parser.parse_args(argv[:len(argv) - len(command) - 1] if "--" in argv else argv)
+
+    if args.command == "now":
+        print(_now())
+    elif args.command == "start":
+        os.makedirs(os.path.dirname(os.path.abspath(args.events)), exist_ok=True)
+        start = _now()
+        with open(args.events, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"ph": "start", "ts": start}) + "\n")
+        print(start)
+    elif args.command == "span":
+        pid = os.getppid()
+        record({"name": args.name, "cat": args.cat, "ph": "X", "ts": args.since,
+                "dur": _now() - args.since, "pid": pid, "tid": pid, "process": "build",
+                "args": {}}, args.events)
+    elif args.command == "run":
+        if not command:
+            parser.error("run: no command given after --")
+        os.environ["BUILD_TRACE"] = args.events
+        sys.exit(run_command(args.name, args.cat, command, args.inputs, args.outputs))
+    elif args.command == "finish":
+        if not os.path.exists(args.events):
+            print(f"Error: {args.events} not found — nothing was traced")
+            sys.exit(1)
+        events = finish(args.events, args.out, os.getppid())
+        if not events:
+            print("  No spans recorded.")
+            return
+        build = events[-1]
+        steps = sorted((e for e in events if e is not build and e.get("pid") == build["pid"]
+                        or "command" in e.get("args", {})), key=lambda e: e["ts"])
+        print(f"  Created: {os.path.relpath(args.out, REPO_ROOT)} "
+              f"({len(events)} spans, {build['dur'] / 1e6:.1f}s)")
+        for e in steps:
+            print(f"    {e['dur'] / 1e6:7.1f}s  {e['name']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+check-glyphs.py
+
+Glyph coverage check of the combined markdown against the fonts the LaTeX
+template configures, run right after preprocessing so a missing character
+fails the build in milliseconds instead of surfacing as a "Missing
+character" line deep in the xelatex log.
+
+  1. Reads the template's font setup: \\setmainfont / \\setsansfont /
+     \\setmonofont and \\newfontfamily, with the \\IfFontExistsTF fallbacks
+     in order, and the \\newunicodechar routes to fallback fonts.
+  2. Resolves each font against the installed fonts (system and user font
+     directories plus the template's \\userfontpath) through a cached index
+     of every face's names and cmap (build/font-index.json); only faces
+     that are new or changed on disk are read again.
+  3. Scans combined.md once, splitting it into body text (main font, with
+     pandoc's smart quotes and dashes), headings (sans bold) and code
+     (mono: fenced blocks and inline spans).
+  4. Lists every code point the responsible font lacks, with the docs file
+     and line it came from (via combined.map.json from preprocess.py).
+
+Exits 1 if any code point is uncovered. Fonts that are not installed are
+reported and skipped: fontspec's own fallback applies to them.
+
+Requires fontTools (pip install fonttools).
+
+Run from repo root:
+  python scripts/check-glyphs.py                       # build/combined.md
+  python scripts/check-glyphs.py build/combined.md --template templates/print-ready.tex
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_MARKDOWN = os.path.join(REPO_ROOT, "build", "combined.md")
+DEFAULT_TEMPLATE = os.path.join(REPO_ROOT, "templates", "pandoc-template.tex")
+CACHE_PATH = os.path.join(REPO_ROOT, "build", "font-index.json")
+CACHE_VERSION = 1
+
+FONT_EXTENSIONS = (".otf", ".ttf", ".ttc", ".otc")
+MAX_LOCATIONS = 5     # source locations listed per missing code point
+
+# Which template font typesets each markdown context, and in which face
+CONTEXTS = {
+    "body": ("main", "Regular"),
+    "heading": ("sans", "Bold"),
+    "code": ("mono", "Regular"),
+}
+
+# Characters pandoc's smart extension produces from ASCII in body text
+SMART_PUNCTUATION = (
+    ("'", "‘’"),
+    ('"', "“”"),
+    ("--", "–"),
+    ("---", "—"),
+    ("...", "…"),
+)
+
+FONT_COMMAND_RE = re.compile(
+    r"\\(setmainfont|setsansfont|setmonofont|newfontfamily\s*\\(\w+))\s*\{([^}]*)\}"
+    r"(?:\s*\[([^\]]*)\])?")
+USER_FONT_PATH_RE = re.compile(r"\\newcommand\{\\userfontpath\}\{([^}]*)\}")
+UNICODE_CHAR_RE = re.compile(r"\\newunicodechar\{([^}]+)\}\{(.*)\}\s*$", re.MULTILINE)
+FENCE_RE = re.compile(r"^\s*(`{3,}|~{3,})")
+HEADING_RE = re.compile(r"^#{1,6}\s")
+INLINE_CODE_RE = re.compile(r"(`+)(.+?)(?<!`)\1(?!`)")
+
+ROLE_NAMES = {"setmainfont": "main", "setsansfont": "sans", "setmonofont": "mono"}
+
+
+def template_fonts(template):
+    """(candidates, options, unicode routes, extra font dirs) from a template.
+
+    candidates maps a role (main, sans, mono, or a \\newfontfamily command
+    such as symbolfont) to its font names in declaration order, so the
+    \\IfFontExistsTF branch comes before its fallback; options maps
+    (role, name) to the fontspec key=value options (BoldFont=...).
+    Unicode routes map a character to the role typesetting it, or None if
+    the template drops it.
+    """
+    with open(template, encoding="utf-8") as f:
+        tex = f.read()
+    tex = re.sub(r"(?<!\\)%.*", "", tex)
+
+    candidates, options = {}, {}
+    for m in FONT_COMMAND_RE.finditer(tex):
+        role = ROLE_NAMES.get(m.group(1)) or m.group(2)
+        name = m.group(3).strip()
+        candidates.setdefault(role, []).append(name)
+        options[role, name] = dict(
+            (k.strip(), v.strip()) for k, _, v in
+            (opt.partition("=") for opt in (m.group(4) or "").split(",")) if v)
+
+    routes = {}
+    for char, body in UNICODE_CHAR_RE.findall(tex):
+        target = re.search(r"\\(\w+)", body)
+        routes[char] = target.group(1) if target else None
+
+    dirs = [m.group(1) for m in USER_FONT_PATH_RE.finditer(tex)]
+    return candidates, options, routes, dirs
+
+
+def font_dirs(extra):
+    """Directories fonts are installed in on this machine, plus extra."""
+    home = os.path.expanduser("~")
+    dirs = list(extra)
+    if sys.platform == "win32":
+        dirs += [os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+                 os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows",
+                              "Fonts")]
+    elif sys.platform == "darwin":
+        dirs += ["/System/Library/Fonts", "/Library/Fonts",
+                 os.path.join(home, "Library", "Fonts")]
+    else:
+        dirs += ["/usr/share/fonts", "/usr/local/share/fonts",
+                 os.path.join(home, ".fonts"), os.path.join(home, ".local", "share", "fonts")]
+    dirs += [os.path.join(d, "fonts", sub)
+             for d in ("/usr/share/texmf", "/usr/share/texlive/texmf-dist")
+             for sub in ("opentype", "truetype")]
+    return [d for d in dict.fromkeys(dirs) if os.path.isdir(d)]
+
+
+def _norm(name):
+    return re.sub(r"[\s_-]", "", name).lower()
+
+
+def _ranges(codepoints):
+    """Sorted code points as [[first, last], ...]."""
+    ranges = []
+    for cp in sorted(codepoints):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return ranges
+
+
+class FontIndex:
+    """Names and cmaps of installed font faces, cached across runs by mtime/size."""
+
+    def __init__(self, dirs, cache_path):
+        self.cache_path = cache_path
+        self.dirty = False
+        self.faces = {}
+        cached = {}
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                cached = data["faces"]
+        except (OSError, ValueError):
+            pass
+
+        for directory in dirs:
+            for root, _, files in os.walk(directory):
+                for filename in files:
+                    if not filename.lower().endswith(FONT_EXTENSIONS):
+                        continue
+                    path = os.path.join(root, filename)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    stamp = [int(st.st_mtime), st.st_size]
+                    keys = [k for k in cached if k.rsplit("#", 1)[0] == path] \
+                        if filename.lower().endswith((".ttc", ".otc")) else [path + "#0"]
+                    if keys and all(k in cached and cached[k]["stamp"] == stamp for k in keys):
+                        for k in keys:
+                            self.faces[k] = cached[k]
+                    else:
+                        self._read_names(path, stamp)
+        self._ranges = {}
+
+    def _read_names(self, path, stamp):
+        from fontTools.ttLib import TTFont, TTLibError
+        count = 1
+        if path.lower().endswith((".ttc", ".otc")):
+            from fontTools.ttLib.ttCollection import TTCollection
+            try:
+                count = len(TTCollection(path, lazy=True).fonts)
+            except (TTLibError, OSError):
+                return
+        for number in range(count):
+            try:
+                font = TTFont(path, fontNumber=number, lazy=True)
+                name = font["name"]
+            except (TTLibError, OSError, KeyError):
+                continue
+            names = {name.getDebugName(i) for i in (1, 4, 6, 16)} - {None}
+            style = name.getDebugName(17) or name.getDebugName(2) or "Regular"
+            self.faces[f"{path}#{number}"] = {"stamp": stamp, "names": sorted(names),
+                                              "style": style, "cmap": None}
+            font.close()
+        self.dirty = True
+
+    def find(self, name, style):
+        """Key of the face for a fontspec name (family or file name), or None."""
+        wanted = _norm(name)
+        by_file = [k for k in self.faces
+                   if _norm(os.path.basename(k.rsplit("#", 1)[0])) == wanted]
+        if by_file:
+            return by_file[0]
+        family = [k for k, face in self.faces.items()
+                  if wanted in (_norm(n) for n in face["names"])]
+        for preferred in (style, "Regular", "Book", "Roman"):
+            for k in family:
+                if _norm(self.faces[k]["style"]) == _norm(preferred):
+                    return k
+        return family[0] if family else None
+
+    def covers(self, key, cp):
+        if key not in self._ranges:
+            face = self.faces[key]
+            if face["cmap"] is None:
+                from fontTools.ttLib import TTFont
+                path, number = key.rsplit("#", 1)
+                with TTFont(path, fontNumber=int(number), lazy=True) as font:
+                    face["cmap"] = _ranges((font.getBestCmap() or {}).keys())
+                self.dirty = True
+            self._ranges[key] = ([r[0] for r in face["cmap"]], face["cmap"])
+        starts, ranges = self._ranges[key]
+        i = bisect.bisect_right(starts, cp) - 1
+        return i >= 0 and cp <= ranges[i][1]
+
+    def label(self, key):
+        face = self.faces[key]
+        return f"{face['names'][0]} ({os.path.basename(key.rsplit('#', 1)[0])})"
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "faces": self.faces}, f)
+
+
+def resolve_fonts(index, candidates, options):
+    """role -> {style: face key or None} for every role and face needed."""
+    styles = {role: {style} for role, style in CONTEXTS.values()}
+    resolved = {}
+    for role, names in candidates.items():
+        resolved[role] = {}
+        for style in styles.get(role, {"Regular"}):
+            key = None
+            for name in names:
+                face_file = options.get((role, name), {}).get(f"{style}Font") \
+                    if style != "Regular" else None
+                key = (face_file and index.find(face_file, style)) or index.find(name, style)
+                if key:
+                    break
+            resolved[role][style] = key
+    return resolved
+
+
+def segments(path):
+    """(line number, context, text) for each piece of the markdown."""
+    fence = None
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            m = FENCE_RE.match(line)
+            if fence:
+                if m and m.group(1)[0] == fence[0] and len(m.group(1)) >= len(fence) \
+                        and not line.strip()[len(m.group(1)):].strip():
+                    fence = None
+                else:
+                    yield number, "code", line
+                continue
+            if m:
+                fence = m.group(1)
+                continue
+            context = "heading" if HEADING_RE.match(line) else "body"
+            pos = 0
+            for code in INLINE_CODE_RE.finditer(line):
+                yield number, context, line[pos:code.start()]
+                yield number, "code", code.group(2)
+                pos = code.end()
+            yield number, context, line[pos:]
+
+
+def characters(context, text):
+    """Characters a piece of markdown will typeset as."""
+    chars = set(text)
+    if context != "code":
+        for ascii_form, produced in SMART_PUNCTUATION:
+            if ascii_form in text:
+                chars.update(produced)
+    return chars
+
+
+class SourceLocator:
+    """combined.md line -> docs file:line, through preprocess.py's source map."""
+
+    def __init__(self, markdown):
+        self.chapters, self.docs_dir, self.files = [], None, {}
+        self.markdown = markdown
+        try:
+            with open(os.path.splitext(markdown)[0] + ".map.json", encoding="utf-8") as f:
+                source_map = json.load(f)
+            self.chapters, self.docs_dir = source_map["chapters"], source_map["docs_dir"]
+        except (OSError, ValueError, KeyError):
+            pass
+        with open(markdown, encoding="utf-8") as f:
+            self.lines = f.read().split("\n")
+
+    def locate(self, number):
+        fallback = f"{os.path.basename(self.markdown)}:{number}"
+        chapter = next((c for c in self.chapters if c["start"] <= number <= c["end"]), None)
+        if chapter is None:
+            return fallback
+        if chapter["file"] not in self.files:
+            try:
+                with open(os.path.join(self.docs_dir, chapter["file"]), encoding="utf-8") as f:
+                    self.files[chapter["file"]] = f.read().split("\n")
+            except OSError:
+                self.files[chapter["file"]] = []
+        text = self.lines[number - 1]
+        guess = number - chapter["start"]
+        matches = [i for i, line in enumerate(self.files[chapter["file"]]) if line == text]
+        if not matches:
+            return f"{fallback} ({chapter['file']})"
+        best = min(matches, key=lambda i: abs(i - guess))
+        return f"{chapter['file']}:{best + 1}"
+
+
+def char_label(cp):
+    char = chr(cp)
+    shown = char if unicodedata.category(char)[0] not in "CZM" else " "
+    return f"U+{cp:04X} {shown} {unicodedata.name(char, '<unnamed>')}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Glyph coverage of combined.md against "
+                                                 "the template's fonts.")
+    parser.add_argument("markdown", nargs="?", default=DEFAULT_MARKDOWN,
+                        help="combined markdown (default: build/combined.md)")
+    parser.add_argument("--template", default=DEFAULT_TEMPLATE,
+                        help="LaTeX template (default: templates/pandoc-template.tex)")
+    parser.add_argument("--font-dir", action="append", default=[],
+                        help="additional font directory (repeatable)")
+    parser.add_argument("--cache", default=CACHE_PATH,
+                        help="font index cache (default: build/font-index.json)")
+    args = parser.parse_args()
+
+    try:
+        import fontTools  # noqa: F401
+    except ImportError:
+        print("  [SKIP] Glyph coverage check — run: pip install fonttools")
+        return
+
+    if not os.path.exists(args.markdown):
+        print(f"Error: {args.markdown} not found — run preprocess.py first")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    candidates, options, routes, template_dirs = template_fonts(args.template)
+    index = FontIndex(font_dirs(args.font_dir + template_dirs), args.cache)
+    resolved = resolve_fonts(index, candidates, options)
+    index.save()
+
+    print(f"Checking glyph coverage ({os.path.relpath(args.template, REPO_ROOT)})...\n")
+    for context, (role, style) in CONTEXTS.items():
+        key = resolved.get(role, {}).get(style)
+        print(f"  {context:8s} {index.label(key) if key else 'not installed — skipped'}")
+    for role in sorted(set(routes.values()) - {None}):
+        key = resolved.get(role, {}).get("Regular")
+        command = "\\" + role
+        print(f"  {command:8s} {index.label(key) if key else 'not installed — skipped'}")
+
+    # Each (font face, code point) is decided once; ASCII lines skip the lookup
+    # entirely when the face covers printable ASCII.
+    decided = {}
+    ascii_ok = {}
+    missing = {}   # (code point, context) -> [line numbers]
+
+    def face_for(context, char):
+        if char in routes:
+            role = routes[char]
+            return resolved.get(role, {}).get("Regular") if role else None
+        role, style = CONTEXTS[context]
+        return resolved.get(role, {}).get(style)
+
+    for key in {k for faces in resolved.values() for k in faces.values() if k}:
+        ascii_ok[key] = all(index.covers(key, cp) for cp in range(0x21, 0x7F))
+
+    for number, context, text in segments(args.markdown):
+        if not text:
+            continue
+        context_face = face_for(context, "")
+        if text.isascii() and ascii_ok.get(context_face) and (
+                context == "code" or not any(a in text for a, _ in SMART_PUNCTUATION)):
+            continue
+        for char in characters(context, text):
+            cp = ord(char)
+            if cp < 0x20 or char.isspace() and cp < 0x80:
+                continue
+            face = face_for(context, char)
+            if face is None:
+                continue
+            if (face, cp) not in decided:
+                decided[face, cp] = index.covers(face, cp)
+            if not decided[face, cp]:
+                missing.setdefault((cp, context), []).append(number)
+    index.save()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if not missing:
+        print(f"\nDone! Every character is covered ({elapsed:.0f} ms).")
+        return
+
+    locator = SourceLocator(args.markdown)
+    print(f"\n  {len({cp for cp, _ in missing})} code points not covered:\n")
+    for (cp, context), numbers in sorted(missing.items()):
+        face = face_for(context, chr(cp))
+        where = ", ".join(locator.locate(n) for n in numbers[:MAX_LOCATIONS])
+        more = f" (+{len(numbers) - MAX_LOCATIONS})" if len(numbers) > MAX_LOCATIONS else ""
+        print(f"  {char_label(cp)}")
+        print(f"      {context} in {index.faces[face]['names'][0]}: {where}{more}")
+    print(f"\n  Route them to a fallback font with \\newunicodechar in "
+          f"{os.path.relpath(args.template, REPO_ROOT)} or replace them in the docs.")
+    print(f"\nFailed: {len({cp for cp, _ in missing})} code points not covered "
+          f"({elapsed:.0f} ms).")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
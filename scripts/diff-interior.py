@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+diff-interior.py
+
+Which pages of the interior changed between two builds, and how.
+
+  1. Every page of both PDFs is fingerprinted without rendering: a hash of
+     its decoded content stream(s) and, recursively, the resources it uses
+     (images, forms, graphics states). Fonts are identified by name with the
+     subset tag stripped — glyph IDs in the content are stable across
+     builds, while subsets change whenever any page gains a character.
+  2. The two fingerprint sequences are aligned (difflib); pages in matching
+     runs are unchanged.
+  3. Every other page of the new build is classified by its body text
+     (running head and folio excluded):
+       reflowed  the text exists unchanged in the old build, only on a
+                 different page or across a different page break;
+       changed   new or edited text, or the same text drawn differently.
+  4. Only changed pages are rasterised, in parallel: old | new | difference
+     side by side, one PNG each.
+  5. Page-count drift is summarised per chapter from the PDF outline.
+
+Writes output/proofs/diff/page-NNN.png and diff-report.json.
+
+Requires pikepdf, pymupdf, numpy and Pillow.
+
+Run from repo root:
+  python scripts/diff-interior.py OLD.pdf [NEW.pdf]
+  python scripts/diff-interior.py --rev HEAD~1          # against a committed build
+"""
+
+import argparse
+import difflib
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_PDF = os.path.join(REPO_ROOT, "output", "BookOfVerse-print.pdf")
+DIFF_DIR = os.path.join(REPO_ROOT, "output", "proofs", "diff")
+BUILD_DIR = os.path.join(REPO_ROOT, "build", "diff")
+
+DIFF_DPI = 100
+HEAD_FOOT_BAND_IN = 0.75   # running heads and folios sit this close to the trim
+PIXEL_THRESHOLD = 32       # grey-level difference that counts as changed
+ANCHOR_CHARS = 80          # text used to find a changed page's old counterpart
+
+SUBSET_TAG = re.compile(r"^/?[A-Z]{6}\+")
+IGNORED_KEYS = {"/Length", "/Filter", "/DecodeParms", "/Parent"}
+
+
+class PageHasher:
+    """Content fingerprints of pages, memoising shared resources by object."""
+
+    def __init__(self):
+        self._memo = {}
+
+    def _digest(self, obj):
+        import pikepdf
+        if not isinstance(obj, pikepdf.Object):
+            return repr(obj).encode()
+        key = obj.objgen if obj.is_indirect else None
+        if key and key in self._memo:
+            return self._memo[key]
+        if key:
+            self._memo[key] = b"cycle"
+
+        if isinstance(obj, pikepdf.Dictionary) and obj.get("/Type") == "/Font" \
+                and "/BaseFont" in obj:
+            digest = b"font:" + SUBSET_TAG.sub("", str(obj.BaseFont)).encode()
+        elif isinstance(obj, (pikepdf.Dictionary, pikepdf.Stream)):
+            h = hashlib.sha1()
+            for k in sorted(obj.keys()):
+                if k not in IGNORED_KEYS:
+                    h.update(k.encode() + self._digest(obj[k]))
+            if isinstance(obj, pikepdf.Stream):
+                try:
+                    h.update(obj.read_bytes())
+                except pikepdf.PdfError:
+                    h.update(obj.read_raw_bytes())
+            digest = h.digest()
+        elif isinstance(obj, pikepdf.Array):
+            h = hashlib.sha1()
+            for item in obj:
+                h.update(self._digest(item))
+            digest = h.digest()
+        else:
+            digest = obj.unparse()
+        if key:
+            self._memo[key] = digest
+        return digest
+
+    def page(self, page):
+        import pikepdf
+        h = hashlib.sha1()
+        contents = page.obj.get("/Contents")
+        streams = contents if isinstance(contents, pikepdf.Array) else [contents]
+        for stream in streams:
+            if stream is not None:
+                h.update(stream.read_bytes())
+        h.update(self._digest(page.obj.get("/Resources")))
+        return h.hexdigest()
+
+
+def page_hashes(path):
+    """Fingerprint of every page, in order."""
+    import pikepdf
+    hasher = PageHasher()
+    with pikepdf.open(path, access_mode=pikepdf.AccessMode.mmap) as pdf:
+        return [hasher.page(page) for page in pdf.pages]
+
+
+def body_texts(path):
+    """Normalised body text of every page (running heads and folios dropped)."""
+    import pymupdf
+    band = HEAD_FOOT_BAND_IN * 72
+    texts = []
+    with pymupdf.open(path) as doc:
+        for page in doc:
+            trim = page.trimbox
+            lines = []
+            for block in page.get_text("dict")["blocks"]:
+                for line in block.get("lines", []):
+                    middle = (line["bbox"][1] + line["bbox"][3]) / 2
+                    if trim.y0 + band < middle < trim.y1 - band:
+                        lines.append("".join(span["text"] for span in line["spans"]))
+            texts.append(normalise("\n".join(lines)))
+    return texts
+
+
+def normalise(text):
+    """Join hyphenated line breaks and collapse whitespace."""
+    text = text.replace("­", "")
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+    return " ".join(text.split())
+
+
+def outline_chapters(path, pages):
+    """[(title, first page, page count)] for outline entries of level 1–2."""
+    import pymupdf
+    with pymupdf.open(path) as doc:
+        entries = [(title, page) for level, title, page in doc.get_toc() if level <= 2]
+    chapters = []
+    for i, (title, first) in enumerate(entries):
+        end = entries[i + 1][1] if i + 1 < len(entries) else pages + 1
+        chapters.append((title, first, max(0, end - first)))
+    return chapters
+
+
+def classify(old_hashes, new_hashes, old_texts, new_texts):
+    """Per new page: (status, old page index or None)."""
+    result = [None] * len(new_hashes)
+    matcher = difflib.SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+    blocks = matcher.get_opcodes()
+
+    # Old text as one stream, with the offset each page starts at
+    starts = []
+    pieces = []
+    offset = 0
+    for text in old_texts:
+        starts.append(offset)
+        pieces.append(text)
+        offset += len(text) + 1
+    old_all = " ".join(pieces)
+    text_pages = {}
+    for i, text in enumerate(old_texts):
+        text_pages.setdefault(text, i)
+
+    def page_at(pos):
+        lo, hi = 0, len(starts) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if starts[mid] <= pos:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    for tag, i1, i2, j1, j2 in blocks:
+        for j in range(j1, j2):
+            if tag == "equal":
+                result[j] = ("unchanged", i1 + j - j1)
+                continue
+            text = new_texts[j]
+            aligned = min(i1 + j - j1, i2 - 1) if i2 > i1 else None
+            if text and text in text_pages and text_pages[text] != aligned:
+                result[j] = ("reflowed", text_pages[text])
+                continue
+            pos = old_all.find(text) if text else -1
+            if pos >= 0 and not (aligned is not None and old_texts[aligned] == text):
+                result[j] = ("reflowed", page_at(pos))
+                continue
+            # Changed: pair with the old page holding the start (or end) of its text
+            counterpart = aligned
+            for anchor in (text[:ANCHOR_CHARS], text[-ANCHOR_CHARS:]):
+                pos = old_all.find(anchor) if len(anchor) >= 20 else -1
+                if pos >= 0:
+                    counterpart = page_at(pos)
+                    break
+            result[j] = ("changed", counterpart)
+    return result
+
+
+def _render_diff(job):
+    """Worker: old | new | difference side-by-side PNG of one page pair."""
+    import numpy as np
+    import pymupdf
+    from PIL import Image
+
+    old_path, old_index, new_path, new_index, dpi, out_path = job
+
+    def render(path, index):
+        if index is None:
+            return None
+        with pymupdf.open(path) as doc:
+            pix = doc[index].get_pixmap(dpi=dpi, colorspace=pymupdf.csGRAY, alpha=False)
+        return np.frombuffer(pix.samples, np.uint8).reshape(pix.h, pix.stride)[:, :pix.w]
+
+    new = render(new_path, new_index)
+    old = render(old_path, old_index)
+    if old is None:
+        old = np.full_like(new, 255)
+    h, w = max(old.shape[0], new.shape[0]), max(old.shape[1], new.shape[1])
+    old = np.pad(old, ((0, h - old.shape[0]), (0, w - old.shape[1])), constant_values=255)
+    new = np.pad(new, ((0, h - new.shape[0]), (0, w - new.shape[1])), constant_values=255)
+
+    changed = np.abs(old.astype(np.int16) - new.astype(np.int16)) > PIXEL_THRESHOLD
+    diff = np.repeat((new // 2 + 128)[..., None], 3, axis=2)   # faded new page
+    diff[changed] = (220, 0, 0)
+
+    gap = np.full((h, 8, 3), 128, np.uint8)
+    panels = [np.repeat(old[..., None], 3, axis=2), gap,
+              np.repeat(new[..., None], 3, axis=2), gap, diff]
+    Image.fromarray(np.concatenate(panels, axis=1)).save(out_path, optimize=True)
+    return out_path, int(changed.sum())
+
+
+def committed_pdf(rev, path):
+    """Extract path as committed at rev into build/diff/; returns the copy's path."""
+    rel = os.path.relpath(os.path.abspath(path), REPO_ROOT).replace(os.sep, "/")
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    out = os.path.join(BUILD_DIR, f"{re.sub(r'[^A-Za-z0-9]+', '_', rev)}.pdf")
+    result = subprocess.run(["git", "show", f"{rev}:{rel}"], cwd=REPO_ROOT,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        print(f"Error: {rel} not found at {rev}: {result.stderr.decode().strip()}")
+        sys.exit(1)
+    with open(out, "wb") as f:
+        f.write(result.stdout)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Changed and reflowed pages between two "
+                                                 "interior builds.")
+    parser.add_argument("old", nargs="?", help="previous build (or use --rev)")
+    parser.add_argument("new", nargs="?", default=DEFAULT_PDF,
+                        help="current build (default: output/BookOfVerse-print.pdf)")
+    parser.add_argument("--rev", default="HEAD",
+                        help="git revision of NEW to compare against when OLD is omitted "
+                             "(default: HEAD)")
+    parser.add_argument("--dpi", type=int, default=DIFF_DPI,
+                        help=f"diff image resolution (default: {DIFF_DPI})")
+    parser.add_argument("--reflowed", action="store_true",
+                        help="also render diff images for reflowed pages")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="render processes (default: CPU count)")
+    args = parser.parse_args()
+
+    try:
+        import numpy  # noqa: F401
+        import pikepdf  # noqa: F401
+        import pymupdf  # noqa: F401
+        from PIL import Image  # noqa: F401
+    except ImportError:
+        print("Error: pikepdf, pymupdf, numpy and Pillow are required — "
+              "run: pip install pikepdf pymupdf numpy Pillow")
+        sys.exit(1)
+
+    if not os.path.exists(args.new):
+        print(f"Error: {args.new} not found")
+        sys.exit(1)
+    old_path = args.old or committed_pdf(args.rev, args.new)
+    old_label = args.old or f"{args.rev}:{os.path.relpath(args.new, REPO_ROOT)}"
+    start = time.perf_counter()
+
+    old_hashes, new_hashes = page_hashes(old_path), page_hashes(args.new)
+    old_texts, new_texts = body_texts(old_path), body_texts(args.new)
+    pages = classify(old_hashes, new_hashes, old_texts, new_texts)
+    counts = {status: sum(1 for s, _ in pages if s == status)
+              for status in ("unchanged", "reflowed", "changed")}
+
+    print(f"Comparing {old_label} ({len(old_hashes)} pages) with "
+          f"{os.path.relpath(args.new, REPO_ROOT)} ({len(new_hashes)} pages)\n")
+    print(f"  {counts['unchanged']} unchanged, {counts['reflowed']} reflowed, "
+          f"{counts['changed']} changed")
+
+    # Per-chapter drift, matched by outline title
+    old_chapters = {title: (first, n) for title, first, n in
+                    outline_chapters(old_path, len(old_hashes))}
+    drift = []
+    for title, first, n in outline_chapters(args.new, len(new_hashes)):
+        old_first, old_n = old_chapters.get(title, (None, 0))
+        in_chapter = [pages[p - 1][0] for p in range(first, first + n)]
+        drift.append({"chapter": title, "old_first": old_first, "new_first": first,
+                      "old_pages": old_n, "new_pages": n, "drift": n - old_n,
+                      "changed": in_chapter.count("changed"),
+                      "reflowed": in_chapter.count("reflowed")})
+    moved = [d for d in drift if d["drift"] or d["changed"] or d["old_first"] != d["new_first"]]
+    if moved:
+        print(f"\n  {'Chapter':36s} {'pages':>11s} {'drift':>6s} {'start':>9s} {'changed':>8s}")
+        for d in moved:
+            start_move = (f"{d['old_first']}→{d['new_first']}" if d["old_first"] is not None
+                          else f"new {d['new_first']}")
+            print(f"  {d['chapter'][:36]:36s} {d['old_pages']:4d} → {d['new_pages']:<4d} "
+                  f"{d['drift']:+6d} {start_move:>9s} {d['changed']:8d}")
+
+    # Rasterise only the pages a proofreader has to look at
+    os.makedirs(DIFF_DIR, exist_ok=True)
+    for stale in glob.glob(os.path.join(DIFF_DIR, "page-*.png")):
+        os.remove(stale)
+    review = {"changed"} | ({"reflowed"} if args.reflowed else set())
+    jobs = [(old_path, old_index, args.new, j, args.dpi,
+             os.path.join(DIFF_DIR, f"page-{j + 1:03d}.png"))
+            for j, (status, old_index) in enumerate(pages) if status in review]
+    images = {}
+    if jobs:
+        print()
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for (path, pixels), job in zip(pool.map(_render_diff, jobs), jobs):
+                images[job[3]] = os.path.basename(path)
+                old_page = f"old p. {job[1] + 1}" if job[1] is not None else "new page"
+                print(f"  Created: {os.path.relpath(path, REPO_ROOT)}  "
+                      f"({old_page}, {pixels} px differ)")
+
+    report = {
+        "old": old_label,
+        "new": os.path.relpath(os.path.abspath(args.new), REPO_ROOT),
+        "old_pages": len(old_hashes),
+        "new_pages": len(new_hashes),
+        "counts": counts,
+        "pages": [{"page": j + 1, "status": status,
+                   "old_page": old_index + 1 if old_index is not None else None,
+                   **({"image": images[j]} if j in images else {})}
+                  for j, (status, old_index) in enumerate(pages) if status != "unchanged"],
+        "chapters": drift,
+    }
+    report_path = os.path.join(DIFF_DIR, "diff-report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"  Created: {os.path.relpath(report_path, REPO_ROOT)}")
+    print(f"\nDone in {time.perf_counter() - start:.1f}s — "
+          f"{counts['changed']} pages to review.")
+
+
+if __name__ == "__main__":
+    main()
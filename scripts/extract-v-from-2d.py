@@ -2,117 +2,90 @@
 """
 Extract V geometry from the canonical 2D logo (VerseLogo2D.png).
 This is a clean white-on-black image, so threshold detection is very precise.
+
+Sweeps thresholds and approximation epsilons (see v_outline.py), picks the
+best-scoring 7-vertex fit, refines it to subpixel accuracy and records it in
+cover-design/assets/v-outline.json. The approved outline the generators use
+is only replaced with --accept.
+
+Debug images (threshold mask, fitted polygon) are only written with --debug.
+
+Run from repo root:  python scripts/extract-v-from-2d.py [--accept] [--decimals N] [--debug]
 """
 
+import argparse
+import os
+
 import cv2
 import numpy as np
-import os
+
+from source_image import load_image
+from v_outline import LABELS, OUTLINE_PATH, extract, load_v_outline, write_outline
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 REPO_ROOT = os.path.dirname(SCRIPT_DIR)
 OUTPUT_DIR = os.path.join(REPO_ROOT, "cover-design", "assets")
 
+
 def main():
+    parser = argparse.ArgumentParser(description="Measure the V outline from VerseLogo2D.png.")
+    parser.add_argument("--accept", action="store_true",
+                        help="replace the approved outline with this measurement")
+    parser.add_argument("--decimals", type=int, default=0,
+                        help="decimal places kept in accepted vertices (default: 0)")
+    parser.add_argument("--debug", action="store_true",
+                        help="write debug-2d-*.png images to cover-design/assets/")
+    args = parser.parse_args()
+
     png_path = os.path.join(REPO_ROOT, "VerseLogo2D.png")
-    img = cv2.imread(png_path)
-    h, w = img.shape[:2]
+    src = load_image(png_path)
+    w, h = src.size
     print(f"Image size: {w}×{h}")
 
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-    # Clean white on black — threshold at 128
-    _, thresh = cv2.threshold(gray, 128, 255, cv2.THRESH_BINARY)
-
-    # Save threshold
-    cv2.imwrite(os.path.join(OUTPUT_DIR, "debug-2d-threshold.png"), thresh)
-
-    # Find outer contour
-    contours, hierarchy = cv2.findContours(thresh, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-    contours_ext, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    contours_ext = sorted(contours_ext, key=cv2.contourArea, reverse=True)
-
-    v_contour = contours_ext[0]
-    area = cv2.contourArea(v_contour)
-    bx, by, bw, bh = cv2.boundingRect(v_contour)
-    print(f"  Bounding box: x={bx}, y={by}, w={bw}, h={bh}")
-    print(f"  Area: {area:.0f} px²")
-
-    # Try multiple epsilon values
-    for eps_factor in [0.01, 0.015, 0.02, 0.025, 0.03]:
-        epsilon = eps_factor * cv2.arcLength(v_contour, True)
-        approx = cv2.approxPolyDP(v_contour, epsilon, True)
-        print(f"\n  eps={eps_factor}: {len(approx)} vertices")
-
-        if 6 <= len(approx) <= 10:
-            for i, pt in enumerate(approx):
-                px, py = pt[0]
-                vx = (px - bx) / bw * 100
-                vy = (py - by) / bh * 100
-                print(f"    [{i}] pixel=({px:4d}, {py:4d})  viewBox=({vx:5.1f}, {vy:5.1f})")
-
-    # Use eps=0.02 for the debug drawing
-    epsilon = 0.02 * cv2.arcLength(v_contour, True)
-    approx = cv2.approxPolyDP(v_contour, epsilon, True)
-
-    # Draw debug image
-    debug_img = img.copy()
-    cv2.drawContours(debug_img, [v_contour], -1, (0, 255, 0), 1)
-    cv2.drawContours(debug_img, [approx], -1, (0, 0, 255), 2)
-    for i, pt in enumerate(approx):
-        px, py = pt[0]
-        cv2.circle(debug_img, (px, py), 6, (0, 255, 255), -1)
-        cv2.putText(debug_img, str(i), (px + 10, py + 5),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-
-    cv2.imwrite(os.path.join(OUTPUT_DIR, "debug-2d-contours.png"), debug_img)
-    print(f"\n  Saved debug images to {OUTPUT_DIR}")
-
-    # Also print current vs measured comparison
-    print("\n--- Current vs 2D Canonical ---")
-    current = [
-        (0, 1), (24, 1), (53, 64), (77, 15), (59, 1), (99, 1), (49, 100),
-    ]
-    labels = ["TL outer", "inner TL", "inner bottom", "notch apex",
-              "notch left", "TR outer", "bottom"]
-
-    # Find the best matching 7-vertex approximation
-    best_approx = None
-    for eps_factor in [0.015, 0.02, 0.025, 0.03]:
-        epsilon = eps_factor * cv2.arcLength(v_contour, True)
-        a = cv2.approxPolyDP(v_contour, epsilon, True)
-        if len(a) == 7:
-            best_approx = a
-            print(f"  Using eps={eps_factor} for 7-vertex match")
-            break
-
-    if best_approx is None:
-        # Fall back to closest
-        for eps_factor in [0.015, 0.02, 0.025, 0.03]:
-            epsilon = eps_factor * cv2.arcLength(v_contour, True)
-            a = cv2.approxPolyDP(v_contour, epsilon, True)
-            if len(a) >= 7:
-                best_approx = a
-                print(f"  Using eps={eps_factor} ({len(a)} vertices)")
-                break
-
-    if best_approx is not None:
-        # Convert to viewBox coordinates and sort to match our vertex order
-        measured = []
-        for pt in best_approx:
-            px, py = pt[0]
-            vx = (px - bx) / bw * 100
-            vy = (py - by) / bh * 100
-            measured.append((round(vx, 1), round(vy, 1)))
-
-        # Sort by a heuristic to match our ordering (TL, inner-TL, inner-bottom, etc.)
-        # Just print all and let human match
-        print(f"\n  Measured vertices ({len(measured)}):")
-        for i, (vx, vy) in enumerate(measured):
-            print(f"    [{i}] ({vx:5.1f}, {vy:5.1f})")
-
-        print(f"\n  Current vertices:")
-        for i, ((cx, cy), label) in enumerate(zip(current, labels)):
-            print(f"    [{i}] ({cx:5.1f}, {cy:5.1f})  — {label}")
+    gray = src.gray
+    best, candidates = extract(gray)
+    sevens = sorted((c for c in candidates if c["vertices"] == 7),
+                    key=lambda c: c["score"], reverse=True)
+    print(f"  Swept {len(candidates)} candidates, {len(sevens)} with 7 vertices")
+    if best is None:
+        print("  ERROR: no 7-vertex fit found")
+        return
+
+    print("\n  Best candidates (IoU × mask stability):")
+    for c in sevens[:5]:
+        print(f"    threshold={c['threshold']:3d}  eps={c['epsilon']:<6}  "
+              f"IoU={c['iou']:.4f}  stability={c['stability']:.4f}")
+
+    # Debug images for the selected fit
+    if args.debug:
+        cv2.imwrite(os.path.join(OUTPUT_DIR, "debug-2d-threshold.png"),
+                    (gray > best["threshold"]).astype(np.uint8) * 255)
+        debug_img = src.bgr()
+        cv2.drawContours(debug_img, [best["contour"]], -1, (0, 255, 0), 1)
+        pts = np.round(np.array(best["pixel"])).astype(np.int32)
+        cv2.polylines(debug_img, [pts], True, (0, 0, 255), 2)
+        for i, (px, py) in enumerate(pts):
+            cv2.circle(debug_img, (int(px), int(py)), 6, (0, 255, 255), -1)
+            cv2.putText(debug_img, str(i + 1), (int(px) + 10, int(py) + 5),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        cv2.imwrite(os.path.join(OUTPUT_DIR, "debug-2d-contours.png"), debug_img)
+        print(f"\n  Saved debug images to {OUTPUT_DIR}")
+
+    # Measured vs approved outline
+    approved = load_v_outline() if os.path.exists(OUTLINE_PATH) else [None] * 7
+    print(f"\n--- Measured (threshold={best['threshold']}, eps={best['epsilon']}) "
+          f"vs approved ---")
+    for i, ((mx, my), cur, label) in enumerate(zip(best["viewbox"], approved, LABELS)):
+        if cur is None:
+            print(f"    [{i + 1}] ({mx:6.2f}, {my:6.2f})  — {label}")
+        else:
+            print(f"    [{i + 1}] ({mx:6.2f}, {my:6.2f})  approved ({cur[0]:5.1f}, {cur[1]:5.1f})"
+                  f"  Δ=({mx - cur[0]:+.2f}, {my - cur[1]:+.2f})  — {label}")
+
+    data = write_outline(best, os.path.basename(png_path), args.decimals, args.accept)
+    state = "accepted" if args.accept else "recorded (approved vertices unchanged; --accept to use)"
+    print(f"\n  Measurement {state}: {os.path.relpath(OUTLINE_PATH, REPO_ROOT)}")
+    print(f"  Vertices: {data['vertices']}")
 
 
 if __name__ == "__main__":
@@ -5,129 +5,98 @@ extract-v-geometry.py
 Uses OpenCV to detect the V shape in verselanguageimage.jpeg
 and extract the polygon vertices. Outputs coordinates in both
 pixel space and mapped to a 100×100 viewBox.
+
+The metallic render has soft, shaded edges, so no single threshold is
+reliable: thresholds and epsilons are swept and the best 7-vertex fit is
+chosen automatically (see v_outline.py). The result is compared with the
+approved outline in cover-design/assets/v-outline.json; the canonical
+measurement comes from extract-v-from-2d.py.
+
+Debug images are only written with --debug.
+
+Run from repo root:  python scripts/extract-v-geometry.py [--debug]
 """
 
+import argparse
 import cv2
 import numpy as np
 import os
 
+from source_image import load_image
+from v_outline import LABELS, OUTLINE_PATH, extract, load_v_outline
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 REPO_ROOT = os.path.dirname(SCRIPT_DIR)
 OUTPUT_DIR = os.path.join(REPO_ROOT, "cover-design", "assets")
 
+
 def main():
+    parser = argparse.ArgumentParser(description="Measure the V outline from the metallic render.")
+    parser.add_argument("--debug", action="store_true",
+                        help="write debug-threshold.png and debug-contours.png to cover-design/assets/")
+    args = parser.parse_args()
+
     jpeg_path = os.path.join(REPO_ROOT, "verselanguageimage.jpeg")
-    img = cv2.imread(jpeg_path)
-    h, w = img.shape[:2]
+    src = load_image(jpeg_path)
+    w, h = src.size
     print(f"Image size: {w}×{h}")
 
-    # Convert to grayscale
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
     # The V is a bright metallic shape on a dark background.
-    # Threshold to isolate the V.
-    # Try multiple thresholds and pick the one that gives us a good V contour.
-    _, thresh = cv2.threshold(gray, 55, 255, cv2.THRESH_BINARY)
-
-    # Save threshold image for inspection
-    thresh_path = os.path.join(OUTPUT_DIR, "debug-threshold.png")
-    cv2.imwrite(thresh_path, thresh)
-    print(f"  Saved threshold image: {thresh_path}")
-
-    # Find contours
-    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-    # Sort by area, largest first
-    contours = sorted(contours, key=cv2.contourArea, reverse=True)
-    print(f"  Found {len(contours)} contours")
-
-    if not contours:
-        print("  ERROR: No contours found!")
+    gray = src.gray
+    best, candidates = extract(gray)
+    sevens = sorted((c for c in candidates if c["vertices"] == 7),
+                    key=lambda c: c["score"], reverse=True)
+    print(f"  Swept {len(candidates)} candidates, {len(sevens)} with 7 vertices")
+    if best is None:
+        print("  ERROR: no 7-vertex fit found")
         return
 
-    # The largest contour should be the V
-    v_contour = contours[0]
-    area = cv2.contourArea(v_contour)
-    print(f"  Largest contour area: {area:.0f} px²")
+    for c in sevens[:5]:
+        print(f"    threshold={c['threshold']:3d}  eps={c['epsilon']:<6}  "
+              f"IoU={c['iou']:.4f}  stability={c['stability']:.4f}")
+
+    mask = (gray > best["threshold"]).astype(np.uint8) * 255
+    if args.debug:
+        thresh_path = os.path.join(OUTPUT_DIR, "debug-threshold.png")
+        cv2.imwrite(thresh_path, mask)
+        print(f"\n  Saved threshold image: {thresh_path}")
 
-    # Get bounding box
+    v_contour = best["contour"]
     x, y, bw, bh = cv2.boundingRect(v_contour)
+    print(f"  Largest contour area: {cv2.contourArea(v_contour):.0f} px²")
     print(f"  Bounding box: x={x}, y={y}, w={bw}, h={bh}")
     print(f"  Bounding box (relative): x={x/w:.3f}, y={y/h:.3f}, w={bw/w:.3f}, h={bh/h:.3f}")
 
-    # Approximate the contour with fewer points
-    # The V should be approximable with 6-8 key vertices
-    for eps_factor in [0.02, 0.03, 0.04, 0.05]:
-        epsilon = eps_factor * cv2.arcLength(v_contour, True)
-        approx = cv2.approxPolyDP(v_contour, epsilon, True)
-        print(f"\n  Approximation (eps={eps_factor}): {len(approx)} vertices")
-
-        if len(approx) <= 12:
-            for i, pt in enumerate(approx):
-                px, py = pt[0]
-                # Map to viewBox coordinates relative to bounding box
-                vx = (px - x) / bw * 100
-                vy = (py - y) / bh * 100
-                print(f"    [{i}] pixel=({px}, {py})  viewBox=({vx:.1f}, {vy:.1f})")
-
-    # Use 0.03 approximation for the debug drawing
-    epsilon = 0.03 * cv2.arcLength(v_contour, True)
-    approx = cv2.approxPolyDP(v_contour, epsilon, True)
-
-    # Draw the contour and approximation on the image
-    debug_img = img.copy()
-    cv2.drawContours(debug_img, [v_contour], -1, (0, 255, 0), 2)
-    cv2.drawContours(debug_img, [approx], -1, (0, 0, 255), 3)
-
-    # Draw vertex numbers
-    for i, pt in enumerate(approx):
-        px, py = pt[0]
-        cv2.circle(debug_img, (px, py), 8, (0, 255, 255), -1)
-        cv2.putText(debug_img, str(i), (px + 12, py + 5),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-
-    contour_path = os.path.join(OUTPUT_DIR, "debug-contours.png")
-    cv2.imwrite(contour_path, debug_img)
-    print(f"\n  Saved contour debug image: {contour_path}")
-
-    # Also find the inner void (hole in the V)
-    # Re-find contours with hierarchy to get inner contours
-    contours_h, hierarchy = cv2.findContours(thresh, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-    print(f"\n  Contours with hierarchy: {len(contours_h)}")
-
-    if hierarchy is not None:
-        for i, (cnt, hier) in enumerate(zip(contours_h, hierarchy[0])):
-            a = cv2.contourArea(cnt)
-            if a > 1000:  # skip tiny noise
-                parent = hier[3]
-                cx, cy, cw, ch = cv2.boundingRect(cnt)
-                print(f"    Contour {i}: area={a:.0f}, parent={parent}, "
-                      f"bbox=({cx},{cy},{cw},{ch})")
-
-    # Try to find the notch as an inner contour
-    # Look for contours that are children of the main V contour
-    main_idx = 0
-    for i, cnt in enumerate(contours_h):
-        if cv2.contourArea(cnt) == cv2.contourArea(v_contour):
-            main_idx = i
-            break
-
-    print(f"\n  Main V contour index: {main_idx}")
-    if hierarchy is not None:
-        for i, (cnt, hier) in enumerate(zip(contours_h, hierarchy[0])):
-            if hier[3] == main_idx:  # parent is the main V
-                a = cv2.contourArea(cnt)
-                if a > 500:
-                    eps = 0.04 * cv2.arcLength(cnt, True)
-                    inner_approx = cv2.approxPolyDP(cnt, eps, True)
-                    print(f"    Inner contour {i}: area={a:.0f}, "
-                          f"{len(inner_approx)} approx vertices")
-                    for j, pt in enumerate(inner_approx):
-                        px, py = pt[0]
-                        vx = (px - x) / bw * 100
-                        vy = (py - y) / bh * 100
-                        print(f"      [{j}] pixel=({px}, {py})  "
-                              f"viewBox=({vx:.1f}, {vy:.1f})")
+    # Holes inside the V, from the same contour pass that found it
+    contours, hierarchy = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    main_idx = next(i for i, c in enumerate(contours)
+                    if cv2.contourArea(c) == cv2.contourArea(v_contour))
+    holes = [c for c, hier in zip(contours, hierarchy[0])
+             if hier[3] == main_idx and cv2.contourArea(c) > 500]
+    print(f"  Inner contours (holes > 500 px²): {len(holes)}")
+
+    # Draw the contour and refined polygon on the image
+    if args.debug:
+        debug_img = src.bgr()
+        cv2.drawContours(debug_img, [v_contour], -1, (0, 255, 0), 2)
+        pts = np.round(np.array(best["pixel"])).astype(np.int32)
+        cv2.polylines(debug_img, [pts], True, (0, 0, 255), 3)
+        for i, (px, py) in enumerate(pts):
+            cv2.circle(debug_img, (int(px), int(py)), 8, (0, 255, 255), -1)
+            cv2.putText(debug_img, str(i + 1), (int(px) + 12, int(py) + 5),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+
+        contour_path = os.path.join(OUTPUT_DIR, "debug-contours.png")
+        cv2.imwrite(contour_path, debug_img)
+        print(f"  Saved contour debug image: {contour_path}")
+
+    approved = load_v_outline() if os.path.exists(OUTLINE_PATH) else [None] * 7
+    print(f"\n  Refined vertices (threshold={best['threshold']}, eps={best['epsilon']}):")
+    for i, ((px, py), (vx, vy), cur, label) in enumerate(
+            zip(best["pixel"], best["viewbox"], approved, LABELS)):
+        delta = f"  Δ=({vx - cur[0]:+.2f}, {vy - cur[1]:+.2f})" if cur else ""
+        print(f"    [{i + 1}] pixel=({px:7.2f}, {py:7.2f})  viewBox=({vx:6.2f}, {vy:6.2f})"
+              f"{delta}  — {label}")
 
 
 if __name__ == "__main__":
@@ -11,65 +11,169 @@ Produces 4 mockups in cover-design/mockups/:
   C. Black + Silver   (mockup-black-silver.svg)
   D. Dark Brown + Gold (mockup-brown-gold.svg)
 
-Run from repo root:  python scripts/generate-cover-mockups.py
+Each SVG is also rasterised to PNG (at --scale, default 2x) across a process
+pool. Renderers are tried in order: cairosvg, PyMuPDF, then the rsvg-convert
+or inkscape command-line tools. PNGs are cached in build/png-cache/ by SVG
+content hash, scale and renderer, so unchanged mockups are never re-rendered.
+
+With --proof-dpi N, also exports a print proof of each full spread to
+output/proofs/ at N DPI (TIFF by default, or PNG) plus a 72 DPI preview.
+The spread is rasterised in horizontal strips that are compressed and written
+as they arrive, so peak memory stays roughly constant at any DPI.
+
+With --preflight, checks each spread and the printer bundles' cover artwork
+(print-bundle-*/cover-artwork, foil dies excluded) for CMYK printing: each
+one is rasterised in strips at --preflight-dpi (default 300) across the
+process pool, separated to CMYK with a local ICC profile (--icc FILE,
+$VERSE_ICC_PROFILE, or the first CMYK profile in the system colour
+folders), and measured with NumPy. Reports max total area coverage (TAC),
+the area over --tac-limit and rich-black usage, writes over-limit maps and
+output/preflight/cover-preflight.json. Without a CMYK profile an
+uncalibrated separation is used and the report says so.
+
+With --matrix, generates every edition (EDITIONS) × colour scheme × spine
+width variant, spreads and slipcases, into cover-design/mockups/matrix/ with
+a combined compare-mockups.html. Spine widths default to each edition's page
+count; override with --spine 1.2 1.33 1.5.
+
+Run from repo root:  python scripts/generate-cover-mockups.py [--scale N] [--workers N]
+                     python scripts/generate-cover-mockups.py --proof-dpi 600
+                     python scripts/generate-cover-mockups.py --matrix [--spine W ...]
+                     python scripts/generate-cover-mockups.py --preflight [--icc FILE]
 """
 
+import functools
+import glob
+import hashlib
+import json
 import os
+import re
+import shutil
+import struct
+import subprocess
+import tempfile
+import zlib
+
+from build_trace import span
+from svg_optimize import optimize_svg
+from svg_to_pdf import LENGTH_UNITS
+from v_outline import load_v_outline
 
 # ---------------------------------------------------------------------------
-# Geometry from generate-verse-logo.py
+# Geometry from cover-design/assets/v-outline.json (see v_outline.py)
 # ---------------------------------------------------------------------------
-V_OUTLINE = [
-    (0, 0),     # 1 — top-left outer
-    (22, 0),    # 2 — inner top-left
-    (53, 62),   # 3 — inner bottom
-    (78, 14),   # 4 — right arm inner angle
-    (60, 0),    # 5 — right arm inner top
-    (100, 0),   # 6 — top-right outer
-    (50, 100),  # 7 — outer bottom point
-]
+V_OUTLINE = load_v_outline()
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 REPO_ROOT = os.path.dirname(SCRIPT_DIR)
 OUTPUT_DIR = os.path.join(REPO_ROOT, "cover-design", "mockups")
+PNG_CACHE_DIR = os.path.join(REPO_ROOT, "build", "png-cache")
+PROOF_DIR = os.path.join(REPO_ROOT, "output", "proofs")
+PROOF_STRIP_ROWS = 256   # pixel rows rasterised per strip
+PREVIEW_DPI = 72
+
+PREFLIGHT_DIR = os.path.join(REPO_ROOT, "output", "preflight")
+PREFLIGHT_DPI = 300
+TAC_LIMIT = 300          # % total area coverage the press accepts
+RICH_BLACK_K = 80        # % K from which a colour counts as black
+RICH_BLACK_CMY = 30      # % C+M+Y under that K which makes it a rich black
+UNCALIBRATED_UCR = 1 / 3  # CMY removed under K when no ICC profile is found
+ICC_DIRS = [
+    os.path.join(REPO_ROOT, "cover-design", "specs"),
+    os.path.expanduser("~/.local/share/color/icc"),
+    "/usr/share/color/icc",
+    "/usr/local/share/color/icc",
+    "/Library/ColorSync/Profiles",
+    os.path.expanduser("~/Library/ColorSync/Profiles"),
+    r"C:\Windows\System32\spool\drivers\color",
+]
 
 # ---------------------------------------------------------------------------
 # Cover dimensions (in pixels at 72 DPI)
-# Updated for 469 pages: spine = 1.33"
+# The default spread uses the Spine Width in print-bundle-ultra/specs.md;
+# --matrix sizes each edition's spine from its page count (EDITIONS)
 # ---------------------------------------------------------------------------
 DPI = 72
 BLEED = 0.3125  # inches
 COVER_W = 7.0   # inches (each cover panel)
-SPINE_W = 1.33  # inches (469 pages × 0.0025" + 0.16" boards)
+SPINE_W = 1.33  # inches (print-bundle-ultra/specs.md)
 HEIGHT = 10.0   # inches
 
-# Pixel conversions
-BLEED_PX = round(BLEED * DPI)        # ~22px
-COVER_W_PX = round(COVER_W * DPI)    # 504px
-SPINE_W_PX = round(SPINE_W * DPI)    # ~96px
-HEIGHT_PX = round(HEIGHT * DPI)      # 720px
-
-TOTAL_W_PX = 2 * BLEED_PX + 2 * COVER_W_PX + SPINE_W_PX
-TOTAL_H_PX = 2 * BLEED_PX + HEIGHT_PX
-
-# Key positions
-TRIM_LEFT = BLEED_PX
-TRIM_TOP = BLEED_PX
-BACK_LEFT = TRIM_LEFT
-BACK_RIGHT = TRIM_LEFT + COVER_W_PX
-SPINE_LEFT = BACK_RIGHT
-SPINE_RIGHT = SPINE_LEFT + SPINE_W_PX
-FRONT_LEFT = SPINE_RIGHT
-FRONT_RIGHT = FRONT_LEFT + COVER_W_PX
-TRIM_BOTTOM = TRIM_TOP + HEIGHT_PX
-
-# Front cover center
-FRONT_CX = FRONT_LEFT + COVER_W_PX // 2
-FRONT_CY = TRIM_TOP + HEIGHT_PX // 2
-
-# Spine center
-SPINE_CX = SPINE_LEFT + SPINE_W_PX // 2
-SPINE_CY = TRIM_TOP + HEIGHT_PX // 2
+PAGE_CALIPER = 0.0025  # inches per page
+SPINE_BOARDS = 0.16    # inches added to the text block for boards
+
+
+def spine_width(pages):
+    """Spine width in inches for a page count (text block + boards)."""
+    return round(pages * PAGE_CALIPER + SPINE_BOARDS, 2)
+
+
+@functools.lru_cache(maxsize=None)
+def spread_geometry(cover_w=COVER_W, spine_w=SPINE_W, height=HEIGHT, bleed=BLEED):
+    """Pixel positions for a full spread (back + spine + front) at DPI.
+
+    Memoised, so every colour scheme for the same trim/spine spec shares one
+    layout.
+    """
+    g = {
+        "cover_w": cover_w, "spine_w": spine_w, "height": height, "bleed": bleed,
+        "bleed_px": round(bleed * DPI),
+        "cover_w_px": round(cover_w * DPI),
+        "spine_w_px": round(spine_w * DPI),
+        "height_px": round(height * DPI),
+    }
+    g["total_w_px"] = 2 * g["bleed_px"] + 2 * g["cover_w_px"] + g["spine_w_px"]
+    g["total_h_px"] = 2 * g["bleed_px"] + g["height_px"]
+
+    # Key positions
+    g["trim_left"] = g["trim_top"] = g["back_left"] = g["bleed_px"]
+    g["back_right"] = g["spine_left"] = g["trim_left"] + g["cover_w_px"]
+    g["spine_right"] = g["front_left"] = g["spine_left"] + g["spine_w_px"]
+    g["front_right"] = g["front_left"] + g["cover_w_px"]
+    g["trim_bottom"] = g["trim_top"] + g["height_px"]
+
+    # Front cover and spine centres
+    g["front_cx"] = g["front_left"] + g["cover_w_px"] // 2
+    g["front_cy"] = g["trim_top"] + g["height_px"] // 2
+    g["spine_cx"] = g["spine_left"] + g["spine_w_px"] // 2
+    g["spine_cy"] = g["trim_top"] + g["height_px"] // 2
+    return g
+
+
+# Module-level positions for the default (Ultra-Premium) spread
+_DEFAULT = spread_geometry()
+BLEED_PX = _DEFAULT["bleed_px"]        # ~22px
+COVER_W_PX = _DEFAULT["cover_w_px"]    # 504px
+SPINE_W_PX = _DEFAULT["spine_w_px"]    # ~96px
+HEIGHT_PX = _DEFAULT["height_px"]      # 720px
+TOTAL_W_PX = _DEFAULT["total_w_px"]
+TOTAL_H_PX = _DEFAULT["total_h_px"]
+
+# ---------------------------------------------------------------------------
+# Editions: page count (for spine width), raised bands, slipcase
+# ---------------------------------------------------------------------------
+PAGE_COUNT_RE = re.compile(r"^\|\s*Page Count\s*\|\s*(\d+) pages", re.MULTILINE)
+
+
+def bundle_pages(edition):
+    """Text block page count from print-bundle-<edition>/specs.md."""
+    path = os.path.join(REPO_ROOT, f"print-bundle-{edition}", "specs.md")
+    with open(path, encoding="utf-8") as f:
+        m = PAGE_COUNT_RE.search(f.read())
+    if not m:
+        raise ValueError(f"{path}: no Page Count row")
+    return int(m.group(1))
+
+
+# Page counts come from the bundles' specs.md, so each edition's spine width
+# follows the text block the printer is quoting for
+EDITIONS = [
+    {"name": "ultra", "label": "Ultra-Premium", "pages": bundle_pages("ultra"),
+     "bands": 5, "slipcase": True},
+    {"name": "team", "label": "Team", "pages": bundle_pages("team"),
+     "bands": 0, "slipcase": True},
+]
+MATRIX_DIR = os.path.join(OUTPUT_DIR, "matrix")
 
 # ---------------------------------------------------------------------------
 # Color schemes
@@ -125,86 +229,114 @@ def v_path_d(offset_x=0, offset_y=0, scale=1.0):
     return " ".join(parts)
 
 
-def generate_cover_mockup(scheme):
-    """Generate a single cover mockup SVG."""
+@functools.lru_cache(maxsize=None)
+def emblem_path(x, y, size):
+    """Memoised V emblem path data of the given width at (x, y)."""
+    return v_path_d(x, y, size / 100)
+
+
+@functools.lru_cache(maxsize=None)
+def band_positions(trim_top, height_px, count):
+    """Top edges of count raised bands evenly spaced along the spine."""
+    spacing = height_px // (count + 1)
+    return tuple(trim_top + spacing * (i + 1) - 3 for i in range(count))
+
+
+def _inches(value):
+    return f"{value:g}\""
+
+
+def generate_cover_mockup(scheme, geometry=None, bands=5, edition_label=None):
+    """Generate a single cover mockup SVG.
+
+    geometry comes from spread_geometry() (default: the module constants);
+    bands is the number of raised spine bands.
+    """
+    g = geometry or _DEFAULT
     cc = scheme["cover_color"]
     cd = scheme["cover_darker"]
     fc = scheme["foil_color"]
     bc = scheme["band_color"]
+    total_w, total_h = g["total_w_px"], g["total_h_px"]
+    trim_top, height_px = g["trim_top"], g["height_px"]
+    spine_left, spine_w_px = g["spine_left"], g["spine_w_px"]
+    cover_w_px = g["cover_w_px"]
+    front_cx, spine_cx = g["front_cx"], g["spine_cx"]
+    back_cx = g["back_left"] + cover_w_px // 2
 
     # Emblem sizes
     front_emblem_size = 180  # ~2.5" at 72dpi
     spine_emblem_size = 50   # ~0.7" at 72dpi
 
     # Front cover emblem position (centered horizontally, upper portion)
-    fe_x = FRONT_CX - front_emblem_size // 2
-    fe_y = TRIM_TOP + 140
+    fe_x = front_cx - front_emblem_size // 2
+    fe_y = trim_top + 140
 
     # Spine emblem positions (top and bottom, mirrored)
-    se_x = SPINE_CX - spine_emblem_size // 2
-    se_top_y = TRIM_TOP + 38
-    se_bot_y = TRIM_BOTTOM - 38 - spine_emblem_size
+    se_x = spine_cx - spine_emblem_size // 2
+    se_top_y = trim_top + 38
+    se_bot_y = g["trim_bottom"] - 38 - spine_emblem_size
 
-    # Raised band positions (5 evenly spaced)
-    band_spacing = HEIGHT_PX // 6
-    bands = [TRIM_TOP + band_spacing * (i + 1) - 3 for i in range(5)]
+    band_rects = "\n".join(
+        f'  <rect x="{spine_left}" y="{y}" width="{spine_w_px}" height="6" fill="{bc}" opacity="0.6"/>'
+        for y in band_positions(trim_top, height_px, bands))
+
+    trim_w = 2 * g["cover_w"] + g["spine_w"]
+    caption = (f"{edition_label}, {_inches(g['spine_w'])} spine" if edition_label
+               else "Book of Verse Cover Spread")
 
     svg = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {TOTAL_W_PX} {TOTAL_H_PX}"
-     width="{TOTAL_W_PX}" height="{TOTAL_H_PX}">
+<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {total_w} {total_h}"
+     width="{total_w}" height="{total_h}">
   <!--
     Book of Verse — Cover Mockup {scheme["name"]}: {scheme["label"]}
     Full spread: Back Cover + Spine + Front Cover
-    Trim: 7" + 1.33" + 7" = 15.33" × 10"
-    With bleed: {TOTAL_W_PX}px × {TOTAL_H_PX}px at 72 DPI
+    Trim: {_inches(g["cover_w"])} + {_inches(g["spine_w"])} + {_inches(g["cover_w"])} = {trim_w:g}" × {_inches(g["height"])}
+    With bleed: {total_w}px × {total_h}px at 72 DPI
   -->
 
   <!-- Bleed area background -->
-  <rect x="0" y="0" width="{TOTAL_W_PX}" height="{TOTAL_H_PX}" fill="#e0e0e0"/>
+  <rect x="0" y="0" width="{total_w}" height="{total_h}" fill="#e0e0e0"/>
 
   <!-- Full trim area -->
-  <rect x="{TRIM_LEFT}" y="{TRIM_TOP}" width="{FRONT_RIGHT - TRIM_LEFT}" height="{HEIGHT_PX}" fill="{cc}"/>
+  <rect x="{g["trim_left"]}" y="{trim_top}" width="{g["front_right"] - g["trim_left"]}" height="{height_px}" fill="{cc}"/>
 
   <!-- Back Cover panel -->
-  <rect x="{BACK_LEFT}" y="{TRIM_TOP}" width="{COVER_W_PX}" height="{HEIGHT_PX}" fill="{cc}"/>
+  <rect x="{g["back_left"]}" y="{trim_top}" width="{cover_w_px}" height="{height_px}" fill="{cc}"/>
 
   <!-- Spine panel (slightly darker) -->
-  <rect x="{SPINE_LEFT}" y="{TRIM_TOP}" width="{SPINE_W_PX}" height="{HEIGHT_PX}" fill="{cd}"/>
+  <rect x="{spine_left}" y="{trim_top}" width="{spine_w_px}" height="{height_px}" fill="{cd}"/>
 
   <!-- Front Cover panel -->
-  <rect x="{FRONT_LEFT}" y="{TRIM_TOP}" width="{COVER_W_PX}" height="{HEIGHT_PX}" fill="{cc}"/>
+  <rect x="{g["front_left"]}" y="{trim_top}" width="{cover_w_px}" height="{height_px}" fill="{cc}"/>
 
   <!-- ====== FRONT COVER ELEMENTS ====== -->
 
   <!-- V emblem on front cover (foil color) -->
-  <path d="{v_path_d(fe_x, fe_y, front_emblem_size / 100)}" fill="{fc}"/>
+  <path d="{emblem_path(fe_x, fe_y, front_emblem_size)}" fill="{fc}"/>
 
   <!-- Title: BOOK OF VERSE -->
-  <text x="{FRONT_CX}" y="{fe_y + front_emblem_size + 60}"
+  <text x="{front_cx}" y="{fe_y + front_emblem_size + 60}"
         text-anchor="middle" fill="{fc}"
         font-family="Georgia, 'Times New Roman', serif"
         font-size="36" font-weight="bold" letter-spacing="3">BOOK OF VERSE</text>
 
   <!-- Subtitle -->
-  <text x="{FRONT_CX}" y="{fe_y + front_emblem_size + 100}"
+  <text x="{front_cx}" y="{fe_y + front_emblem_size + 100}"
         text-anchor="middle" fill="{fc}" opacity="0.8"
         font-family="Arial, Helvetica, sans-serif"
         font-size="16" font-style="italic">The Verse Programming Language</text>
 
   <!-- ====== SPINE ELEMENTS ====== -->
 
-  <!-- Raised bands on spine (5 bands) -->
-  <rect x="{SPINE_LEFT}" y="{bands[0]}" width="{SPINE_W_PX}" height="6" fill="{bc}" opacity="0.6"/>
-  <rect x="{SPINE_LEFT}" y="{bands[1]}" width="{SPINE_W_PX}" height="6" fill="{bc}" opacity="0.6"/>
-  <rect x="{SPINE_LEFT}" y="{bands[2]}" width="{SPINE_W_PX}" height="6" fill="{bc}" opacity="0.6"/>
-  <rect x="{SPINE_LEFT}" y="{bands[3]}" width="{SPINE_W_PX}" height="6" fill="{bc}" opacity="0.6"/>
-  <rect x="{SPINE_LEFT}" y="{bands[4]}" width="{SPINE_W_PX}" height="6" fill="{bc}" opacity="0.6"/>
+  <!-- Raised bands on spine ({bands} bands) -->
+{band_rects}
 
   <!-- V emblem on spine (top) -->
-  <path d="{v_path_d(se_x, se_top_y, spine_emblem_size / 100)}" fill="{fc}"/>
+  <path d="{emblem_path(se_x, se_top_y, spine_emblem_size)}" fill="{fc}"/>
 
   <!-- Spine title (rotated, centered on spine) -->
-  <g transform="translate({SPINE_CX}, {TRIM_TOP + HEIGHT_PX // 2})">
+  <g transform="translate({spine_cx}, {trim_top + height_px // 2})">
     <text transform="rotate(90)" x="0" y="0"
           text-anchor="middle" fill="{fc}"
           font-family="Georgia, 'Times New Roman', serif"
@@ -212,59 +344,60 @@ def generate_cover_mockup(scheme):
   </g>
 
   <!-- V emblem on spine (bottom) -->
-  <path d="{v_path_d(se_x, se_bot_y, spine_emblem_size / 100)}" fill="{fc}"/>
+  <path d="{emblem_path(se_x, se_bot_y, spine_emblem_size)}" fill="{fc}"/>
 
   <!-- ====== BACK COVER ====== -->
 
   <!-- Back cover placeholder text -->
-  <text x="{BACK_LEFT + COVER_W_PX // 2}" y="{FRONT_CY - 20}"
+  <text x="{back_cx}" y="{g["front_cy"] - 20}"
         text-anchor="middle" fill="{fc}" opacity="0.3"
         font-family="Arial, Helvetica, sans-serif" font-size="14">BACK COVER</text>
-  <text x="{BACK_LEFT + COVER_W_PX // 2}" y="{FRONT_CY + 5}"
+  <text x="{back_cx}" y="{g["front_cy"] + 5}"
         text-anchor="middle" fill="{fc}" opacity="0.2"
         font-family="Arial, Helvetica, sans-serif" font-size="11">(description or blind deboss pattern)</text>
 
   <!-- ====== DIMENSION LABELS ====== -->
 
   <!-- Top dimension lines -->
-  <line x1="{BACK_LEFT}" y1="10" x2="{BACK_RIGHT}" y2="10" stroke="#888" stroke-width="0.5"/>
-  <text x="{BACK_LEFT + COVER_W_PX // 2}" y="8" text-anchor="middle"
-        fill="#888" font-family="Arial, sans-serif" font-size="9">7" (Back)</text>
+  <line x1="{g["back_left"]}" y1="10" x2="{g["back_right"]}" y2="10" stroke="#888" stroke-width="0.5"/>
+  <text x="{back_cx}" y="8" text-anchor="middle"
+        fill="#888" font-family="Arial, sans-serif" font-size="9">{_inches(g["cover_w"])} (Back)</text>
 
-  <line x1="{SPINE_LEFT}" y1="10" x2="{SPINE_RIGHT}" y2="10" stroke="#888" stroke-width="0.5"/>
-  <text x="{SPINE_CX}" y="8" text-anchor="middle"
-        fill="#888" font-family="Arial, sans-serif" font-size="9">1.33"</text>
+  <line x1="{spine_left}" y1="10" x2="{g["spine_right"]}" y2="10" stroke="#888" stroke-width="0.5"/>
+  <text x="{spine_cx}" y="8" text-anchor="middle"
+        fill="#888" font-family="Arial, sans-serif" font-size="9">{_inches(g["spine_w"])}</text>
 
-  <line x1="{FRONT_LEFT}" y1="10" x2="{FRONT_RIGHT}" y2="10" stroke="#888" stroke-width="0.5"/>
-  <text x="{FRONT_CX}" y="8" text-anchor="middle"
-        fill="#888" font-family="Arial, sans-serif" font-size="9">7" (Front)</text>
+  <line x1="{g["front_left"]}" y1="10" x2="{g["front_right"]}" y2="10" stroke="#888" stroke-width="0.5"/>
+  <text x="{front_cx}" y="8" text-anchor="middle"
+        fill="#888" font-family="Arial, sans-serif" font-size="9">{_inches(g["cover_w"])} (Front)</text>
 
   <!-- Label -->
-  <text x="{TOTAL_W_PX // 2}" y="{TOTAL_H_PX - 5}" text-anchor="middle"
+  <text x="{total_w // 2}" y="{total_h - 5}" text-anchor="middle"
         fill="#888" font-family="Arial, sans-serif" font-size="10">
-    Mockup {scheme["name"]}: {scheme["label"]} — Book of Verse Cover Spread</text>
+    Mockup {scheme["name"]}: {scheme["label"]} — {caption}</text>
 
 </svg>'''
     return svg
 
 
-def generate_slipcase_mockup(scheme):
-    """Generate a slipcase mockup SVG (ultra-premium only)."""
+def generate_slipcase_mockup(scheme, geometry=None, edition_label="Ultra-Premium"):
+    """Generate a slipcase mockup SVG for the given spread geometry."""
+    g = geometry or _DEFAULT
     cc = scheme["cover_color"]
     fc = scheme["foil_color"]
 
     # Slipcase dimensions: slightly larger than the book
     # Width: covers book front/back + spine + clearance
-    sc_w = round((COVER_W + SPINE_W + 0.25) * DPI)  # front panel + depth
-    sc_h = round((HEIGHT + 0.25) * DPI)              # slightly taller
-    sc_depth = round((SPINE_W + 0.25) * DPI)         # spine + clearance
+    sc_w = round((g["cover_w"] + g["spine_w"] + 0.25) * DPI)  # front panel + depth
+    sc_h = round((g["height"] + 0.25) * DPI)                   # slightly taller
+    sc_depth = round((g["spine_w"] + 0.25) * DPI)              # spine + clearance
 
     svg = f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {sc_w + 80} {sc_h + 80}"
      width="{sc_w + 80}" height="{sc_h + 80}">
   <!--
     Book of Verse — Slipcase Mockup {scheme["name"]}: {scheme["label"]}
-    Ultra-Premium Edition
+    {edition_label} Edition
   -->
 
   <!-- Background -->
@@ -293,93 +426,687 @@ def generate_slipcase_mockup(scheme):
   <!-- Label -->
   <text x="{(sc_w + 80) // 2}" y="{sc_h + 70}" text-anchor="middle"
         fill="#888" font-family="Arial, sans-serif" font-size="10">
-    Slipcase — Mockup {scheme["name"]}: {scheme["label"]} (Ultra-Premium)</text>
+    Slipcase — Mockup {scheme["name"]}: {scheme["label"]} ({edition_label})</text>
 
 </svg>'''
     return svg
 
 
-def render_png(svg_path):
-    """Render SVG to PNG using cairosvg if available, else Pillow placeholder."""
+def find_renderer():
+    """Return the name of the first usable SVG renderer, or None."""
     try:
-        import cairosvg
-        png_path = svg_path.replace(".svg", ".png")
-        cairosvg.svg2png(url=svg_path, write_to=png_path, scale=2)
-        print(f"  Created PNG: {png_path}")
-        return True
+        import cairosvg  # noqa: F401 — raises OSError when libcairo is missing
+        return "cairosvg"
     except (ImportError, OSError):
         pass
+    try:
+        import pymupdf  # noqa: F401
+        return "pymupdf"
+    except ImportError:
+        pass
+    for tool in ("rsvg-convert", "inkscape"):
+        if shutil.which(tool):
+            return tool
+    return None
+
 
+def _rasterise(renderer, svg_path, png_path, scale):
+    """Render one SVG file to PNG with the named renderer."""
+    if renderer == "cairosvg":
+        import cairosvg
+        cairosvg.svg2png(url=svg_path, write_to=png_path, scale=scale)
+    elif renderer == "pymupdf":
+        import pymupdf
+        with pymupdf.open(svg_path) as doc:
+            pix = doc[0].get_pixmap(matrix=pymupdf.Matrix(scale, scale), alpha=False)
+            pix.save(png_path)
+    elif renderer == "rsvg-convert":
+        subprocess.run(["rsvg-convert", "--zoom", str(scale), "-o", png_path, svg_path],
+                       check=True)
+    else:
+        subprocess.run(["inkscape", svg_path, "--export-type=png",
+                        f"--export-filename={png_path}", f"--export-dpi={96 * scale}"],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def render_png(job):
+    """Worker: render one SVG to PNG, reusing the cached PNG when unchanged.
+
+    Returns (png_path, cached).
+    """
+    svg_path, scale, renderer = job
+    png_path = svg_path[:-len(".svg")] + ".png"
+    with open(svg_path, "rb") as f:
+        key = hashlib.sha1(f.read() + f"|{scale}|{renderer}".encode()).hexdigest()
+    cached_png = os.path.join(PNG_CACHE_DIR, f"{key}.png")
+
+    with span(os.path.basename(png_path), "render", inputs=[svg_path],
+              outputs=[png_path]) as render_span:
+        if not os.path.exists(cached_png):
+            tmp_path = f"{cached_png[:-4]}.{os.getpid()}.tmp.png"
+            _rasterise(renderer, svg_path, tmp_path, scale)
+            os.replace(tmp_path, cached_png)
+            cached = False
+        else:
+            cached = True
+        shutil.copyfile(cached_png, png_path)
+        render_span.args["cached"] = cached
+    return png_path, cached
+
+
+def render_pngs(svg_paths, scale=2, workers=None):
+    """Rasterise SVGs to PNG in parallel; returns the number actually rendered."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    renderer = find_renderer()
+    if renderer is None:
+        print("  [SKIP] No PNG renderer available "
+              "(pip install cairosvg or pymupdf, or install rsvg-convert)")
+        return 0
+
+    os.makedirs(PNG_CACHE_DIR, exist_ok=True)
+    print(f"  Rendering {len(svg_paths)} PNGs at {scale}x with {renderer}...")
+    rendered = 0
+    jobs = [(path, scale, renderer) for path in svg_paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for png_path, cached in pool.map(render_png, jobs):
+            rendered += not cached
+            status = "cached" if cached else "rendered"
+            print(f"  Created PNG: {os.path.relpath(png_path, REPO_ROOT)} ({status})")
+    return rendered
+
+
+class PngStripWriter:
+    """Streams an RGB PNG to disk a strip of rows at a time."""
+
+    def __init__(self, path, width, height, dpi):
+        self.file = open(path, "wb")
+        self.stride = width * 3
+        self.deflate = zlib.compressobj(6)
+        ppm = round(dpi / 0.0254)
+        self.file.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        self._chunk(b"pHYs", struct.pack(">IIB", ppm, ppm, 1))
+
+    def _chunk(self, tag, data):
+        self.file.write(struct.pack(">I", len(data)) + tag + data
+                        + struct.pack(">I", zlib.crc32(tag + data)))
+
+    def write(self, rgb):
+        """Append whole rows of packed RGB bytes."""
+        rows = b"".join(b"\x00" + rgb[i:i + self.stride]
+                        for i in range(0, len(rgb), self.stride))
+        data = self.deflate.compress(rows)
+        if data:
+            self._chunk(b"IDAT", data)
+
+    def close(self):
+        self._chunk(b"IDAT", self.deflate.flush())
+        self._chunk(b"IEND", b"")
+        self.file.close()
+
+
+class TiffStripWriter:
+    """Streams a Deflate-compressed RGB TIFF, one TIFF strip per write()."""
+
+    def __init__(self, path, width, height, dpi, rows_per_strip):
+        self.file = open(path, "wb")
+        self.width, self.height, self.dpi = width, height, dpi
+        self.rows_per_strip = rows_per_strip
+        self.offsets, self.counts = [], []
+        self.file.write(b"II*\x00\x00\x00\x00\x00")  # IFD offset patched on close
+
+    def write(self, rgb):
+        """Append one strip of packed RGB bytes."""
+        data = zlib.compress(rgb, 6)
+        self.offsets.append(self.file.tell())
+        self.counts.append(len(data))
+        self.file.write(data)
+
+    def _array(self, fmt, values):
+        """Write an out-of-line tag value (word aligned) and return its offset."""
+        if self.file.tell() % 2:
+            self.file.write(b"\x00")
+        offset = self.file.tell()
+        self.file.write(struct.pack(f"<{len(values)}{fmt}", *values))
+        return offset
+
+    def close(self):
+        n = len(self.offsets)
+        bits = self._array("H", [8, 8, 8])
+        offsets = self._array("I", self.offsets) if n > 1 else self.offsets[0]
+        counts = self._array("I", self.counts) if n > 1 else self.counts[0]
+        res = self._array("I", [self.dpi, 1])
+        # (tag, type, count, value or offset); type 3 = SHORT, 4 = LONG, 5 = RATIONAL
+        entries = [
+            (256, 4, 1, self.width), (257, 4, 1, self.height), (258, 3, 3, bits),
+            (259, 3, 1, 8), (262, 3, 1, 2), (273, 4, n, offsets), (277, 3, 1, 3),
+            (278, 4, 1, self.rows_per_strip), (279, 4, n, counts),
+            (282, 5, 1, res), (283, 5, 1, res), (296, 3, 1, 2),
+        ]
+        ifd = self._array("H", [len(entries)])
+        for tag, typ, count, value in entries:
+            fmt = "<HHIHH" if typ == 3 and count == 1 else "<HHII"
+            self.file.write(struct.pack(fmt, tag, typ, count, value, *([0] if fmt == "<HHIHH" else [])))
+        self.file.write(b"\x00\x00\x00\x00")
+        self.file.seek(4)
+        self.file.write(struct.pack("<I", ifd))
+        self.file.close()
+
+
+def svg_window(svg, top, rows, scale, width_px):
+    """Crop an SVG to the pixel band top..top+rows of its render at scale."""
+    vb = (f'viewBox="0 {top / scale:.4f} {width_px / scale:.4f} {rows / scale:.4f}" '
+          f'width="{width_px}" height="{rows}" preserveAspectRatio="none"')
+
+    def retag(m):
+        tag = re.sub(r'\s(viewBox|width|height|preserveAspectRatio)="[^"]*"', "", m.group(0))
+        return tag[:-1].rstrip() + f" {vb}>"
+
+    return re.sub(r"<svg\b[^>]*>", retag, svg, count=1)
+
+
+def _render_strip(job):
+    """Worker: rasterise one horizontal band of a spread to a temporary PNG."""
+    svg, top, rows, scale, width_px, renderer, tmp_dir = job
+    stem = os.path.join(tmp_dir, f"strip-{top:07d}")
+    with span(f"strip {top}", "render", outputs=[stem + ".png"], rows=rows):
+        with open(stem + ".svg", "w", encoding="utf-8") as f:
+            f.write(svg_window(svg, top, rows, scale, width_px))
+        _rasterise(renderer, stem + ".svg", stem + ".png", 1)
+        os.remove(stem + ".svg")
+    return stem + ".png"
+
+
+def export_proof(svg, out_stem, dpi, fmt="tiff", workers=None, renderer=None):
+    """Tiled high-DPI export of a spread SVG, plus a PREVIEW_DPI preview.
+
+    The proof is sized from the spread's viewBox (DPI user units per inch),
+    so any spread_geometry() layout exports at its own size. Strips are
+    rendered in parallel to temporary PNGs and streamed, in order, into the
+    proof file, so only a few strips are ever held in memory.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from PIL import Image
+
+    renderer = renderer or find_renderer()
+    scale = dpi / DPI
+    width_in, height_in, _ = _svg_size(svg, DPI)
+    width_px = round(width_in * dpi)
+    height_px = round(height_in * dpi)
+    factor = max(1, round(dpi / PREVIEW_DPI))
+    rows = max(factor, PROOF_STRIP_ROWS - PROOF_STRIP_ROWS % factor)
+
+    proof_path = f"{out_stem}.{'tif' if fmt == 'tiff' else 'png'}"
+    if fmt == "tiff":
+        writer = TiffStripWriter(proof_path, width_px, height_px, dpi, rows)
+    else:
+        writer = PngStripWriter(proof_path, width_px, height_px, dpi)
+    preview = Image.new("RGB", (-(-width_px // factor), -(-height_px // factor)))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        jobs = [(svg, top, min(rows, height_px - top), scale, width_px, renderer, tmp_dir)
+                for top in range(0, height_px, rows)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (_, top, *_), strip_path in zip(jobs, pool.map(_render_strip, jobs)):
+                with Image.open(strip_path) as strip:
+                    strip = strip.convert("RGB")
+                writer.write(strip.tobytes())
+                preview.paste(strip.reduce(factor), (0, top // factor))
+                os.remove(strip_path)
+    writer.close()
+
+    preview_path = f"{out_stem}-preview.png"
+    preview.save(preview_path, dpi=(dpi / factor, dpi / factor))
+    return proof_path, preview_path, width_px, height_px
+
+
+def export_proofs(dpi, fmt="tiff", workers=None):
+    """Export a print proof of every cover spread mockup."""
     try:
-        from PIL import Image, ImageDraw
-        png_path = svg_path.replace(".svg", ".png")
-        img = Image.new("RGB", (800, 100), "#ffffff")
-        draw = ImageDraw.Draw(img)
-        draw.text((20, 40),
-                  f"Open {os.path.basename(svg_path)} in a browser for full render",
-                  fill="#333333")
-        img.save(png_path, "PNG")
-        print(f"  Created placeholder PNG: {png_path}")
-        return True
+        import PIL  # noqa: F401
     except ImportError:
-        print(f"  [SKIP] No PNG renderer available (install cairosvg or Pillow)")
-        return False
+        print("  [SKIP] Proof export requires Pillow (pip install Pillow)")
+        return
+    renderer = find_renderer()
+    if renderer is None:
+        print("  [SKIP] No SVG renderer available for proofs "
+              "(pip install cairosvg or pymupdf, or install rsvg-convert)")
+        return
+
+    os.makedirs(PROOF_DIR, exist_ok=True)
+    print(f"  Exporting {dpi} DPI proofs with {renderer} "
+          f"({PROOF_STRIP_ROWS}-row strips)...")
+    for scheme in MOCKUPS:
+        out_stem = os.path.join(PROOF_DIR, f"{scheme['filename']}-{dpi}dpi")
+        proof, preview, w, h = export_proof(
+            optimize_svg(generate_cover_mockup(scheme)), out_stem, dpi, fmt, workers, renderer)
+        print(f"  [{scheme['name']}] Created: {os.path.relpath(proof, REPO_ROOT)} "
+              f"({w}×{h}px, {os.path.getsize(proof) / 1e6:.1f} MB)")
+        print(f"  [{scheme['name']}] Created: {os.path.relpath(preview, REPO_ROOT)} (preview)")
+
+
+def find_cmyk_profile(path=None):
+    """Return the path of a CMYK ICC profile, or None.
+
+    Tries path, then $VERSE_ICC_PROFILE, then every .icc/.icm in ICC_DIRS.
+    """
+    from PIL import ImageCms
+
+    candidates = [p for p in (path, os.environ.get("VERSE_ICC_PROFILE")) if p]
+    for folder in ICC_DIRS:
+        for ext in ("*.icc", "*.icm", "*.ICC", "*.ICM"):
+            candidates.extend(sorted(glob.glob(os.path.join(folder, "**", ext),
+                                               recursive=True)))
+    for candidate in candidates:
+        try:
+            profile = ImageCms.getOpenProfile(candidate)
+        except (OSError, ImageCms.PyCMSError):
+            continue
+        if profile.profile.xcolor_space.strip() == "CMYK":
+            return candidate
+    if path:
+        print(f"  WARNING: {path} is not a readable CMYK ICC profile")
+    return None
+
+
+_CMYK_TRANSFORMS = {}
+
+
+def to_cmyk(image, icc=None):
+    """Separate an RGB Pillow image to a (h, w, 4) uint8 CMYK array.
+
+    With an ICC profile the sRGB → CMYK transform is built once per worker
+    process. Without one, a plain separation with UNCALIBRATED_UCR is used
+    (black prints as 67/67/67/100): a rough estimate, not a proof.
+    """
+    import numpy as np
+    if icc:
+        from PIL import ImageCms
+        if icc not in _CMYK_TRANSFORMS:
+            _CMYK_TRANSFORMS[icc] = ImageCms.buildTransform(
+                ImageCms.createProfile("sRGB"), icc, "RGB", "CMYK",
+                ImageCms.Intent.PERCEPTUAL)
+        return np.asarray(ImageCms.applyTransform(image, _CMYK_TRANSFORMS[icc]))
+    cmy = 255 - np.asarray(image, dtype=np.int16)
+    k = cmy.min(axis=2)
+    cmy -= np.round(k * UNCALIBRATED_UCR).astype(np.int16)[:, :, None]
+    return np.dstack([cmy, k]).astype(np.uint8)
+
+
+def _preflight_strip(job):
+    """Worker: rasterise one band, separate it to CMYK and measure its ink."""
+    import numpy as np
+    from PIL import Image
+
+    svg, top, rows, scale, width_px, renderer, tmp_dir, icc, limit, factor = job
+    strip_path = _render_strip((svg, top, rows, scale, width_px, renderer, tmp_dir))
+    with Image.open(strip_path) as strip:
+        strip = strip.convert("RGB")
+    os.remove(strip_path)
+
+    # Ink in 0..255 units per channel; percentages are converted once
+    cmyk = to_cmyk(strip, icc)
+    tac = cmyk.sum(axis=2, dtype=np.int16)
+    k = cmyk[:, :, 3]
+    black = k >= RICH_BLACK_K * 2.55
+    rich = black & (tac - k >= RICH_BLACK_CMY * 2.55)
+    over = tac > limit * 2.55
+
+    # Over-limit cells at preview resolution, for the map
+    h, w = over.shape
+    cells = np.zeros((-(-h // factor), -(-w // factor)), bool)
+    ys, xs = np.nonzero(over)
+    cells[ys // factor, xs // factor] = True
+    return {"max_tac": float(tac.max()) / 2.55, "over": int(over.sum()),
+            "rich": int(rich.sum()), "black": int(black.sum()),
+            "cells": cells, "preview": strip.reduce(factor)}
+
+
+def _svg_size(svg, units_per_inch=None):
+    """(width, height) in inches and the viewBox width of an SVG.
+
+    With units_per_inch (the spreads generated here: DPI user units per
+    inch) the size comes from the viewBox. Otherwise width and height are
+    read with their units, unitless ones as CSS px (96 per inch, as in
+    svg_to_pdf.py), falling back to the viewBox in CSS px.
+    """
+    root = re.search(r"<svg\b[^>]*>", svg).group(0)
+    vb = re.search(r'viewBox="([^"]*)"', root)
+    vb = [float(v) for v in re.split(r"[\s,]+", vb.group(1).strip())] if vb else None
+    if units_per_inch and vb:
+        return vb[2] / units_per_inch, vb[3] / units_per_inch, vb[2]
+
+    def inches(attr, fallback):
+        m = re.search(rf'\s{attr}="\s*([\d.]+)\s*([a-z]*)\s*"', root)
+        if m and m.group(2) in LENGTH_UNITS:
+            return float(m.group(1)) * LENGTH_UNITS[m.group(2)] / 72
+        return fallback * LENGTH_UNITS["px"] / 72
+
+    if vb is None:
+        vb = [0, 0] + [float(re.search(rf'\s{attr}="\s*([\d.]+)', root).group(1))
+                       for attr in ("width", "height")]
+    return inches("width", vb[2]), inches("height", vb[3]), vb[2]
+
+
+def preflight_spread(svg, name, dpi=PREFLIGHT_DPI, limit=TAC_LIMIT, icc=None,
+                     pool=None, renderer=None, out_dir=PREFLIGHT_DIR, units_per_inch=None):
+    """CMYK ink check of one artwork SVG, rasterised in parallel strips.
+
+    The print size comes from the SVG's own units (see _svg_size), or from
+    units_per_inch for artwork drawn at a known scale.
+    Strips run on pool (a ProcessPoolExecutor; one is created if None).
+    Returns a report dict; an over-limit map (preview with offending areas
+    in magenta) is written to out_dir when any pixel exceeds limit.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import numpy as np
+    from PIL import Image
+
+    renderer = renderer or find_renderer()
+    w_in, h_in, vb_w = _svg_size(svg, units_per_inch)
+    scale = dpi * w_in / vb_w             # px per SVG user unit
+    width_px, height_px = round(w_in * dpi), round(h_in * dpi)
+    factor = max(1, round(dpi / PREVIEW_DPI))
+    rows = max(factor, PROOF_STRIP_ROWS - PROOF_STRIP_ROWS % factor)
+
+    totals = {"max_tac": 0.0, "over": 0, "rich": 0, "black": 0}
+    cells, previews = [], []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        jobs = [(svg, top, min(rows, height_px - top), scale, width_px, renderer,
+                 tmp_dir, icc, limit, factor) for top in range(0, height_px, rows)]
+        executor = pool or ProcessPoolExecutor()
+        try:
+            for strip in executor.map(_preflight_strip, jobs):
+                totals["max_tac"] = max(totals["max_tac"], strip["max_tac"])
+                for key in ("over", "rich", "black"):
+                    totals[key] += strip[key]
+                cells.append(strip["cells"])
+                previews.append(strip["preview"])
+        finally:
+            if pool is None:
+                executor.shutdown()
+
+    area = width_px * height_px
+    report = {
+        "name": name, "dpi": dpi, "size_px": [width_px, height_px],
+        "max_tac": round(totals["max_tac"], 1), "tac_limit": limit,
+        "over_limit_pct": round(100 * totals["over"] / area, 3),
+        "over_limit_sq_in": round(totals["over"] / dpi ** 2, 3),
+        "rich_black_pct": round(100 * totals["rich"] / area, 2),
+        "black_pct": round(100 * totals["black"] / area, 2),
+        "ok": totals["over"] == 0, "map": None,
+    }
+    if totals["over"]:
+        cells = np.vstack(cells)
+        ys, xs = np.nonzero(cells)
+        report["over_limit_bbox_in"] = [round(float(v) * factor / dpi, 2) for v in
+                                        (xs.min(), ys.min(), xs.max() + 1, ys.max() + 1)]
+        preview = Image.new("RGB", (cells.shape[1], cells.shape[0]))
+        top = 0
+        for strip in previews:
+            preview.paste(strip, (0, top))
+            top += strip.height
+        pixels = np.array(preview)
+        pixels[cells] = (pixels[cells] // 3) + np.array([170, 0, 170], np.uint8)
+        os.makedirs(out_dir, exist_ok=True)
+        report["map"] = os.path.join(out_dir, f"{name}-tac.png")
+        Image.fromarray(pixels).save(report["map"])
+    return report
+
+
+def preflight_covers(dpi=PREFLIGHT_DPI, limit=TAC_LIMIT, icc=None, workers=None):
+    """CMYK preflight of every spread and the printer bundles' cover artwork."""
+    from concurrent.futures import ProcessPoolExecutor
+    try:
+        import numpy  # noqa: F401
+        from PIL import ImageCms  # noqa: F401
+    except ImportError:
+        print("  [SKIP] Preflight requires Pillow and NumPy (pip install Pillow numpy)")
+        return None
+    renderer = find_renderer()
+    if renderer is None:
+        print("  [SKIP] No SVG renderer available for preflight "
+              "(pip install cairosvg or pymupdf, or install rsvg-convert)")
+        return None
+
+    profile = find_cmyk_profile(icc)
+    # Spreads are drawn at DPI user units per inch; bundle files by their units
+    artwork = [(scheme["filename"], optimize_svg(generate_cover_mockup(scheme)), DPI)
+               for scheme in MOCKUPS]
+    for path in sorted(glob.glob(os.path.join(REPO_ROOT, "print-bundle-*", "cover-artwork",
+                                              "*.svg"))):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if stem.startswith("die-") or "foil" in stem:
+            continue  # foil masks are stamped, not printed in CMYK
+        bundle = os.path.basename(os.path.dirname(os.path.dirname(path)))
+        with open(path, encoding="utf-8") as f:
+            artwork.append((f"{bundle}-{stem}", f.read(), None))
+
+    print(f"  Preflighting {len(artwork)} artworks at {dpi} DPI, TAC limit {limit}%")
+    if profile:
+        print(f"  Profile: {profile}\n")
+    else:
+        print("  Profile: no CMYK ICC profile found — uncalibrated separation "
+              "(use --icc FILE for real numbers)\n")
+    reports = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for name, svg, units_per_inch in artwork:
+            reports.append(preflight_spread(svg, name, dpi, limit, profile, pool, renderer,
+                                            units_per_inch=units_per_inch))
+    for report in reports:
+        name = report["name"]
+        state = "PASS" if report["ok"] else (f"FAIL — {report['over_limit_pct']}% "
+                                             f"({report['over_limit_sq_in']} sq in) over")
+        print(f"  {name:40s} max TAC {report['max_tac']:5.1f}%  {state}; "
+              f"rich black {report['rich_black_pct']}%, black {report['black_pct']}%")
+        if report["map"]:
+            print(f"  {'':40s} map: {os.path.relpath(report['map'], REPO_ROOT)}")
+
+    os.makedirs(PREFLIGHT_DIR, exist_ok=True)
+    out_path = os.path.join(PREFLIGHT_DIR, "cover-preflight.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"profile": profile, "calibrated": bool(profile), "dpi": dpi,
+                   "tac_limit": limit, "artwork": reports}, f, indent=2)
+    print(f"\n  Created: {os.path.relpath(out_path, REPO_ROOT)}")
+    return all(r["ok"] for r in reports)
+
+
+def generate_matrix(editions=EDITIONS, schemes=MOCKUPS, spine_widths=None,
+                    out_dir=MATRIX_DIR):
+    """Generate every spread and slipcase for editions × schemes × spine widths.
+
+    spine_widths overrides each edition's spine width (computed from its page
+    count). Layouts, emblem paths and band positions are memoised, so variants
+    that share a spec reuse them. Writes a combined compare-mockups.html to
+    out_dir and returns the SVG paths written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    sections, specs, svg_paths = [], [], []
+
+    def write(filename, svg):
+        path = os.path.join(out_dir, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(optimize_svg(svg))
+        svg_paths.append(path)
+        return filename
+
+    for edition in editions:
+        for spine in spine_widths or [spine_width(edition["pages"])]:
+            g = spread_geometry(spine_w=spine)
+            variant = f"{edition['label']}, {_inches(spine)} spine"
+            stem = f"{edition['name']}-{spine:g}in"
+            spreads, slipcases = [], []
+            for scheme in schemes:
+                name = write(f"{stem}-{scheme['filename']}.svg",
+                             generate_cover_mockup(scheme, g, edition["bands"],
+                                                   f"{edition['label']} Edition"))
+                spreads.append(_spread_card(name, scheme))
+                if edition["slipcase"]:
+                    name = write(f"{stem}-{scheme['filename']}-slipcase.svg",
+                                 generate_slipcase_mockup(scheme, g, edition["label"]))
+                    slipcases.append(_slipcase_card(name, scheme))
+            sections.append((f"{edition['label']} Edition — {_inches(spine)} spine", spreads))
+            if slipcases:
+                sections.append((f"{edition['label']} Edition — {_inches(spine)} spine, slipcase",
+                                 slipcases))
+            specs.append((variant,
+                           f"{edition['pages']} pages, {edition['bands']} bands; spread "
+                           f"{2 * g['cover_w'] + spine:g}\" &times; {_inches(g['height'])} "
+                           f"+ {_inches(g['bleed'])} bleed"))
+            print(f"  Created: {stem}-* ({len(schemes)} schemes)")
+
+    generate_comparison_html(
+        sections,
+        f"{len(editions)} editions &times; {len(schemes)} color schemes for side-by-side review",
+        specs, out_dir)
+    return svg_paths
 
 
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate cover colour scheme mockups.")
+    parser.add_argument("--scale", type=float, default=2,
+                        help="PNG render scale relative to 72 DPI (default: 2)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for PNG rendering (default: CPU count)")
+    parser.add_argument("--proof-dpi", type=int, default=None,
+                        help="also export tiled print proofs of each spread at this DPI")
+    parser.add_argument("--proof-format", choices=("tiff", "png"), default="tiff",
+                        help="print proof file format (default: tiff)")
+    parser.add_argument("--matrix", action="store_true",
+                        help="generate every edition × colour scheme × spine width "
+                             "variant into cover-design/mockups/matrix/")
+    parser.add_argument("--spine", type=float, nargs="+", metavar="INCHES",
+                        help="spine widths for --matrix (default: from each "
+                             "edition's page count)")
+    parser.add_argument("--preflight", action="store_true",
+                        help="CMYK ink-coverage preflight of every spread and the "
+                             "printer bundles' cover artwork")
+    parser.add_argument("--preflight-dpi", type=int, default=PREFLIGHT_DPI,
+                        help=f"preflight resolution (default: {PREFLIGHT_DPI})")
+    parser.add_argument("--tac-limit", type=float, default=TAC_LIMIT,
+                        help=f"maximum total area coverage in %% (default: {TAC_LIMIT})")
+    parser.add_argument("--icc", metavar="FILE",
+                        help="CMYK output ICC profile (default: $VERSE_ICC_PROFILE or "
+                             "the first CMYK profile in the system colour folders)")
+    args = parser.parse_args()
+
+    if args.matrix:
+        print("Generating mockup matrix...\n")
+        print(f"  Output: {MATRIX_DIR}\n")
+        with span("generate_matrix", "cover"):
+            svg_paths = generate_matrix(spine_widths=args.spine)
+        print()
+        with span("render_pngs", "render", outputs=[MATRIX_DIR]):
+            render_pngs(svg_paths, args.scale, args.workers)
+        info = emblem_path.cache_info()
+        print(f"\n  {len(svg_paths)} SVGs; emblem paths reused {info.hits}×, "
+              f"built {info.misses}×")
+        print("\nDone! Open cover-design/mockups/matrix/compare-mockups.html in a browser.")
+        return
+
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     print("Generating Book of Verse cover mockups...\n")
-    print(f"  Spine width: {SPINE_W}\" (469 pages × 0.0025\" + 0.16\" boards)")
+    print(f"  Spine width: {SPINE_W}\" (print-bundle-ultra/specs.md)")
     print(f"  Output: {OUTPUT_DIR}\n")
 
+    svg_paths = []
     for scheme in MOCKUPS:
-        # Cover spread mockup
-        svg_content = generate_cover_mockup(scheme)
-        svg_path = os.path.join(OUTPUT_DIR, f"{scheme['filename']}.svg")
-        with open(svg_path, "w", encoding="utf-8") as f:
-            f.write(svg_content)
-        print(f"  [{scheme['name']}] Created: {svg_path}")
-        render_png(svg_path)
-
-        # Slipcase mockup (ultra-premium)
-        sc_content = generate_slipcase_mockup(scheme)
-        sc_path = os.path.join(OUTPUT_DIR, f"{scheme['filename']}-slipcase.svg")
-        with open(sc_path, "w", encoding="utf-8") as f:
-            f.write(sc_content)
-        print(f"  [{scheme['name']}] Created: {sc_path} (slipcase)")
-        render_png(sc_path)
+        with span(scheme["filename"], "cover") as scheme_span:
+            # Cover spread mockup
+            svg_content = optimize_svg(generate_cover_mockup(scheme))
+            svg_path = os.path.join(OUTPUT_DIR, f"{scheme['filename']}.svg")
+            with open(svg_path, "w", encoding="utf-8") as f:
+                f.write(svg_content)
+            print(f"  [{scheme['name']}] Created: {svg_path}")
+            svg_paths.append(svg_path)
+
+            # Slipcase mockup (ultra-premium)
+            sc_content = optimize_svg(generate_slipcase_mockup(scheme))
+            sc_path = os.path.join(OUTPUT_DIR, f"{scheme['filename']}-slipcase.svg")
+            with open(sc_path, "w", encoding="utf-8") as f:
+                f.write(sc_content)
+            print(f"  [{scheme['name']}] Created: {sc_path} (slipcase)")
+            svg_paths.append(sc_path)
+            scheme_span.outputs += [svg_path, sc_path]
+
+    print()
+    with span("render_pngs", "render"):
+        render_pngs(svg_paths, args.scale, args.workers)
+    print()
+
+    if args.proof_dpi:
+        with span("export_proofs", "render", dpi=args.proof_dpi):
+            export_proofs(args.proof_dpi, args.proof_format, args.workers)
+        print()
 
+    if args.preflight:
+        with span("preflight_covers", "preflight", dpi=args.preflight_dpi):
+            preflight_covers(args.preflight_dpi, args.tac_limit, args.icc, args.workers)
         print()
 
     # Generate comparison HTML
-    generate_comparison_html()
+    with span("compare-mockups.html", "cover"):
+        generate_comparison_html()
 
     print("Done! Open cover-design/mockups/compare-mockups.html in a browser.")
 
 
-def generate_comparison_html():
-    """Generate an HTML page showing all mockups side by side."""
-    cards = ""
-    for s in MOCKUPS:
-        cards += f'''
+def _spread_card(src, s, title=None):
+    return f'''
     <div class="card">
-      <img src="{s['filename']}.svg" alt="Mockup {s['name']}">
-      <h3>Mockup {s['name']}: {s['label']}</h3>
+      <img src="{src}" alt="Mockup {s['name']}">
+      <h3>{title or f"Mockup {s['name']}: {s['label']}"}</h3>
       <div class="swatches">
         <span class="swatch" style="background:{s['cover_color']}"></span> Cover
         <span class="swatch" style="background:{s['foil_color']}"></span> Foil
       </div>
     </div>'''
 
-    slipcase_cards = ""
-    for s in MOCKUPS:
-        slipcase_cards += f'''
+
+def _slipcase_card(src, s, title=None):
+    return f'''
     <div class="card">
-      <img src="{s['filename']}-slipcase.svg" alt="Slipcase {s['name']}">
-      <h3>Slipcase {s['name']}: {s['label']}</h3>
+      <img src="{src}" alt="Slipcase {s['name']}">
+      <h3>{title or f"Slipcase {s['name']}: {s['label']}"}</h3>
     </div>'''
 
+
+DEFAULT_SPECS = [
+    ("Trim Size", '7" &times; 10"'),
+    ("Page Count", f"{EDITIONS[0]['pages']} pages"),
+    ("Spine Width", f'{SPINE_W}" (print-bundle-ultra/specs.md)'),
+    ("Full Spread", '15.33" &times; 10"'),
+    ("Bleed", '0.3125" all sides'),
+    ("Front Emblem", '2.5" wide V logo'),
+    ("Spine Emblem", '0.7" wide V logo'),
+]
+
+
+def generate_comparison_html(sections=None, subtitle=None, specs=None, out_dir=OUTPUT_DIR):
+    """Generate an HTML page showing mockups side by side.
+
+    sections is a list of (heading, [card html]); by default the four colour
+    schemes' spreads and slipcases. specs is a list of (label, value) rows.
+    """
+    if sections is None:
+        sections = [
+            ("Full Cover Spreads",
+             [_spread_card(f"{s['filename']}.svg", s) for s in MOCKUPS]),
+            ("Slipcase Mockups (Ultra-Premium Edition)",
+             [_slipcase_card(f"{s['filename']}-slipcase.svg", s) for s in MOCKUPS]),
+        ]
+    subtitle = subtitle or f"{len(MOCKUPS)} color schemes for side-by-side review"
+    grids = "".join(f'''
+<h2>{heading}</h2>
+<div class="grid">{"".join(cards)}
+</div>
+''' for heading, cards in sections)
+    rows = "".join(f"\n    <tr><th>{label}</th><td>{value}</td></tr>"
+                   for label, value in (specs or DEFAULT_SPECS))
+
     html = f'''<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -426,32 +1153,17 @@ def generate_comparison_html():
 <body>
 
 <h1>Book of Verse — Cover Mockup Comparison</h1>
-<p class="subtitle">4 color schemes for side-by-side review</p>
-
-<h2>Full Cover Spreads</h2>
-<div class="grid">{cards}
-</div>
-
-<h2>Slipcase Mockups (Ultra-Premium Edition)</h2>
-<div class="grid">{slipcase_cards}
-</div>
-
+<p class="subtitle">{subtitle}</p>
+{grids}
 <div class="specs">
   <h3>Cover Specifications</h3>
-  <table>
-    <tr><th>Trim Size</th><td>7" &times; 10"</td></tr>
-    <tr><th>Page Count</th><td>469 pages</td></tr>
-    <tr><th>Spine Width</th><td>1.33" (469 &times; 0.0025" + 0.16" boards)</td></tr>
-    <tr><th>Full Spread</th><td>15.33" &times; 10"</td></tr>
-    <tr><th>Bleed</th><td>0.3125" all sides</td></tr>
-    <tr><th>Front Emblem</th><td>2.5" wide V logo</td></tr>
-    <tr><th>Spine Emblem</th><td>0.7" wide V logo</td></tr>
+  <table>{rows}
   </table>
 </div>
 
 </body>
 </html>'''
-    filepath = os.path.join(OUTPUT_DIR, "compare-mockups.html")
+    filepath = os.path.join(out_dir, "compare-mockups.html")
     with open(filepath, "w", encoding="utf-8") as f:
         f.write(html)
     print(f"  Created: {filepath}")
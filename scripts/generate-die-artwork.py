@@ -5,37 +5,62 @@ generate-die-artwork.py
 Generates foil stamping die artwork files for the Book of Verse.
 All output is solid black on white, with text converted to outlined paths.
 
-Produces files in cover-design/production/:
-  die-front-emblem.svg   — V logo at 2.5" wide
-  die-front-title.svg    — "BOOK OF VERSE" title text, outlined
-  die-front-subtitle.svg — Subtitle text, outlined
-  die-spine-title.svg    — Spine title (rotated), outlined
-  die-spine-emblem.svg   — V logo at 0.7" wide
+Produces files in cover-design/production/ (each as .svg and .pdf):
+  die-front-emblem       — V logo at 2.5" wide
+  die-front-title        — "BOOK OF VERSE" title text, outlined
+  die-front-subtitle     — Subtitle text, outlined
+  die-spine-title        — Spine title (rotated), outlined
+  die-spine-emblem       — V logo at 0.7" wide
+and mirrors them into print-bundle-ultra/cover-artwork/.
+
+With --names FILE, instead writes per-copy recipient artwork for the Team
+Edition to cover-design/production/personalised/:
+  die-name-NNN.svg/.pdf  — recipient name die, outlined
+  bookplate-NNN.svg/.pdf — printed bookplate with the recipient name
+  die-names-sheet.svg    — every name die ganged on one sheet
+Batch mode needs a real font: names are outlined from DIE_FONT (Source Sans 3
+Bold, as the interior headings) unless --font names another, since the
+built-in GLYPHS cover only the capitals of the fixed cover text. A name whose
+die measures below the foil minimums (see below) is rejected and its artwork
+not written.
 
 All text is rendered as SVG path data (no live fonts) for production use.
-For PDF conversion, use Inkscape or Illustrator to export as PDF.
-
-Run from repo root:  python scripts/generate-die-artwork.py
+Output is compacted by svg_optimize.py (relative path commands at --precision
+decimal places, merged same-fill paths, repeated letters shared via <use>).
+The cover dies use the built-in GLYPHS letterforms by default; pass --font
+to outline them from a real font file (requires fontTools). Font outlines are cached in
+build/glyph-cache/ so later runs never re-parse the font.
+PDFs are written directly from the same path data by svg_to_pdf.py (solid
+black vector fills, no Inkscape round trip).
+Every run measures the thinnest stroke and narrowest gap of each die with
+die_features.py (requires opencv-python, numpy and pymupdf) before any is
+written; failure maps go to build/die-check/, and with --strict a failure
+writes nothing and exits non-zero (build.sh and build.ps1 pass it).
+
+Run from repo root:  python scripts/generate-die-artwork.py [--font [FILE]]
+                     python scripts/generate-die-artwork.py --names recipients.txt
+                     python scripts/generate-die-artwork.py --strict
 """
 
 import os
+import re
+import shutil
+
+from build_trace import span
+from die_features import MAP_DIR, MIN_GAP_MM, analyse_die, format_result
+from svg_optimize import optimize_svg
+from svg_to_pdf import svg_to_pdf
+from v_outline import load_v_outline
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 REPO_ROOT = os.path.dirname(SCRIPT_DIR)
 OUTPUT_DIR = os.path.join(REPO_ROOT, "cover-design", "production")
+BUNDLE_DIR = os.path.join(REPO_ROOT, "print-bundle-ultra", "cover-artwork")
 
 # ---------------------------------------------------------------------------
-# V Logo geometry (from generate-verse-logo.py)
+# V Logo geometry (cover-design/assets/v-outline.json, see v_outline.py)
 # ---------------------------------------------------------------------------
-V_OUTLINE = [
-    (0, 0),     # top-left outer
-    (22, 0),    # inner top-left
-    (53, 62),   # inner bottom
-    (78, 14),   # right arm inner angle
-    (60, 0),    # right arm inner top
-    (100, 0),   # top-right outer
-    (50, 100),  # outer bottom point
-]
+V_OUTLINE = load_v_outline()
 
 # ---------------------------------------------------------------------------
 # Letter outlines as SVG paths (simplified geometric letterforms)
@@ -46,36 +71,38 @@ V_OUTLINE = [
 # Geometric sans-serif letterforms optimized for foil stamping
 # Each glyph is a list of SVG path commands in a normalized coordinate space
 GLYPHS = {
-    'B': "M 0,0 L 0,80 L 35,80 Q 55,80 55,65 Q 55,50 38,48 L 38,47 Q 52,45 52,32 Q 52,15 35,15 L 35,0 Z "
-         "M 12,12 L 12,36 L 32,36 Q 40,36 40,24 Q 40,12 32,12 Z "
-         "M 12,48 L 12,68 L 33,68 Q 43,68 43,58 Q 43,48 33,48 Z",
+    'B': "M 0,0 L 0,80 L 36,80 Q 56,80 56,60 Q 56,46 50,40 Q 52,34 52,20 Q 52,0 32,0 Z "
+         "M 12,12 L 30,12 Q 40,12 40,23 Q 40,34 30,34 L 12,34 Z "
+         "M 12,46 L 34,46 Q 44,46 44,57 Q 44,68 34,68 L 12,68 Z",
     'O': "M 30,0 Q 0,0 0,40 Q 0,80 30,80 Q 60,80 60,40 Q 60,0 30,0 Z "
          "M 30,12 Q 48,12 48,40 Q 48,68 30,68 Q 12,68 12,40 Q 12,12 30,12 Z",
     'K': "M 0,0 L 0,80 L 12,80 L 12,48 L 38,80 L 54,80 L 25,44 L 52,0 L 36,0 L 12,36 L 12,0 Z",
     'F': "M 0,0 L 0,80 L 12,80 L 12,44 L 40,44 L 40,32 L 12,32 L 12,12 L 48,12 L 48,0 Z",
     'V': "M 0,0 L 22,80 L 38,80 L 60,0 L 47,0 L 30,68 L 13,0 Z",
     'E': "M 0,0 L 0,80 L 48,80 L 48,68 L 12,68 L 12,44 L 40,44 L 40,32 L 12,32 L 12,12 L 48,12 L 48,0 Z",
-    'R': "M 0,0 L 0,80 L 12,80 L 12,48 L 28,48 L 44,80 L 58,80 L 40,46 Q 55,42 55,24 Q 55,0 35,0 Z "
-         "M 12,12 L 12,36 L 33,36 Q 43,36 43,24 Q 43,12 33,12 Z",
-    'S': "M 48,12 L 48,0 L 15,0 Q 0,0 0,18 Q 0,36 15,36 L 36,36 Q 42,36 42,46 Q 42,56 36,56 L 36,68 L 0,68 L 0,80 L 38,80 Q 54,80 54,62 Q 54,44 38,44 L 15,44 Q 6,44 6,32 L 6,20 Q 6,12 15,12 Z",
+    'R': "M 0,0 L 0,80 L 12,80 L 12,50 L 26,50 L 42,80 L 56,80 L 39,49 Q 55,43 55,25 Q 55,0 34,0 Z "
+         "M 12,12 L 32,12 Q 43,12 43,25 Q 43,38 32,38 L 12,38 Z",
+    'S': "M 54,0 L 18,0 Q 0,0 0,18 L 0,28 Q 0,46 18,46 L 36,46 Q 42,46 42,52 L 42,62 Q 42,68 36,68 "
+         "L 0,68 L 0,80 L 36,80 Q 54,80 54,62 L 54,52 Q 54,34 36,34 L 18,34 Q 12,34 12,28 "
+         "L 12,18 Q 12,12 18,12 L 54,12 Z",
     ' ': "",
     'T': "M 0,0 L 0,12 L 21,12 L 21,80 L 33,80 L 33,12 L 54,12 L 54,0 Z",
     'H': "M 0,0 L 0,80 L 12,80 L 12,44 L 40,44 L 40,80 L 52,80 L 52,0 L 40,0 L 40,32 L 12,32 L 12,0 Z",
-    'P': "M 0,0 L 0,80 L 12,80 L 12,48 L 35,48 Q 55,48 55,24 Q 55,0 35,0 Z "
-         "M 12,12 L 12,36 L 33,36 Q 43,36 43,24 Q 43,12 33,12 Z",
+    'P': "M 0,0 L 0,80 L 12,80 L 12,50 L 34,50 Q 55,50 55,25 Q 55,0 34,0 Z "
+         "M 12,12 L 32,12 Q 43,12 43,25 Q 43,38 32,38 L 12,38 Z",
     'L': "M 0,0 L 0,80 L 48,80 L 48,68 L 12,68 L 12,0 Z",
     'A': "M 0,80 L 22,0 L 38,0 L 60,80 L 47,80 L 42,62 L 18,62 L 13,80 Z "
          "M 21,50 L 39,50 L 30,16 Z",
-    'N': "M 0,0 L 0,80 L 12,80 L 12,22 L 42,80 L 54,80 L 54,0 L 42,0 L 42,58 L 12,0 Z",
+    'N': "M 0,0 L 0,80 L 12,80 L 12,26 L 42,80 L 54,80 L 54,0 L 42,0 L 42,54 L 12,0 Z",
     'G': "M 30,0 Q 0,0 0,40 Q 0,80 30,80 Q 60,80 60,50 L 60,36 L 32,36 L 32,48 L 48,48 L 48,58 Q 48,68 30,68 Q 12,68 12,40 Q 12,12 30,12 Q 42,12 46,20 L 56,14 Q 50,0 30,0 Z",
     'U': "M 0,0 L 0,60 Q 0,80 26,80 Q 52,80 52,60 L 52,0 L 40,0 L 40,58 Q 40,68 26,68 Q 12,68 12,58 L 12,0 Z",
     'I': "M 0,0 L 0,12 L 15,12 L 15,68 L 0,68 L 0,80 L 42,80 L 42,68 L 27,68 L 27,12 L 42,12 L 42,0 Z",
     'J': "M 20,0 L 20,12 L 36,12 L 36,58 Q 36,68 24,68 Q 12,68 12,58 L 12,50 L 0,50 L 0,60 Q 0,80 24,80 Q 48,80 48,60 L 48,0 Z",
-    'M': "M 0,0 L 0,80 L 12,80 L 12,24 L 28,60 L 36,60 L 52,24 L 52,80 L 64,80 L 64,0 L 52,0 L 32,44 L 12,0 Z",
-    'D': "M 0,0 L 0,80 L 30,80 Q 58,80 58,40 Q 58,0 30,0 Z "
-         "M 12,12 L 12,68 L 28,68 Q 46,68 46,40 Q 46,12 28,12 Z",
-    'W': "M 0,0 L 12,80 L 24,80 L 32,28 L 40,80 L 52,80 L 64,0 L 52,0 L 44,54 L 36,4 L 28,4 L 20,54 L 12,0 Z",
-    'Y': "M 0,0 L 24,40 L 24,80 L 36,80 L 36,40 L 60,0 L 46,0 L 30,30 L 14,0 Z",
+    'M': "M 0,0 L 0,80 L 12,80 L 12,30 L 27,64 L 37,64 L 52,30 L 52,80 L 64,80 L 64,0 L 52,0 L 32,44 L 12,0 Z",
+    'D': "M 0,0 L 0,80 L 28,80 Q 58,80 58,40 Q 58,0 28,0 Z "
+         "M 12,12 L 28,12 Q 46,12 46,40 Q 46,68 28,68 L 12,68 Z",
+    'W': "M 0,0 L 0,80 L 64,80 L 64,0 L 52,0 L 52,68 L 38,68 L 38,24 L 26,24 L 26,68 L 12,68 L 12,0 Z",
+    'Y': "M 0,0 L 24,40 L 24,80 L 36,80 L 36,40 L 60,0 L 46,0 L 30,27 L 14,0 Z",
     'C': "M 30,0 Q 0,0 0,40 Q 0,80 30,80 Q 50,80 56,64 L 46,56 Q 42,68 30,68 Q 12,68 12,40 Q 12,12 30,12 Q 42,12 46,24 L 56,16 Q 50,0 30,0 Z",
     'X': "M 0,0 L 20,40 L 0,80 L 14,80 L 30,48 L 46,80 L 60,80 L 40,40 L 60,0 L 46,0 L 30,32 L 14,0 Z",
     '.': "M 0,68 L 0,80 L 12,80 L 12,68 Z",
@@ -94,58 +121,297 @@ GLYPH_WIDTHS = {
 
 LETTER_SPACING = 6  # units between letters
 
+# Optional kerning adjustments (in glyph units) applied between letter pairs.
+# Pass to text_to_paths / measure_text_width as `kerning=KERNING_PAIRS`.
+KERNING_PAIRS = {
+    ('A', 'V'): -8, ('V', 'A'): -8, ('A', 'W'): -6, ('W', 'A'): -6,
+    ('A', 'Y'): -8, ('Y', 'A'): -8, ('A', 'T'): -6, ('T', 'A'): -6,
+    ('L', 'T'): -8, ('L', 'V'): -8, ('L', 'Y'): -8, ('F', 'A'): -4,
+    ('P', 'A'): -4, ('L', 'W'): -6,
+}
 
-def text_to_paths(text, x_offset=0, y_offset=0, scale=1.0):
-    """Convert a text string to SVG path elements using outlined glyphs."""
-    paths = []
-    cursor_x = x_offset
-    for ch in text.upper():
-        if ch not in GLYPHS:
-            cursor_x += 30 * scale  # unknown character gap
-            continue
-        glyph_d = GLYPHS[ch]
-        if glyph_d:  # skip spaces
-            # Transform the path data
-            transformed = transform_path_data(glyph_d, cursor_x, y_offset, scale)
-            paths.append(transformed)
-        cursor_x += (GLYPH_WIDTHS.get(ch, 60) + LETTER_SPACING) * scale
-    return paths, cursor_x - x_offset - LETTER_SPACING * scale
+_PATH_TOKEN_RE = re.compile(r'[MLQZ]|[-+]?\d*\.?\d+')
+_COMMAND_ARITY = {'M': 2, 'L': 2, 'Q': 4, 'Z': 0}
 
+# Compiled path data, keyed by the raw SVG path string. Each entry is a
+# (template, coords) pair: `template` is a format string with one slot per
+# coordinate, and `coords` is the flat tuple of (x, y, x, y, ...) floats.
+_COMPILED_PATHS = {}
 
-def transform_path_data(d, tx, ty, scale):
-    """Transform SVG path data by translating and scaling."""
-    import re
-    result = []
-    tokens = re.findall(r'[MLQZ]|[-+]?\d*\.?\d+', d)
+
+def compile_path_data(d):
+    """Parse SVG path data (M/L/Q/Z) once into a format template and coords.
+
+    Results are cached, so repeated glyphs are tokenised only the first time.
+    """
+    compiled = _COMPILED_PATHS.get(d)
+    if compiled is not None:
+        return compiled
+    tokens = _PATH_TOKEN_RE.findall(d)
+    parts = []
+    coords = []
     i = 0
     while i < len(tokens):
         t = tokens[i]
-        if t in ('M', 'L'):
-            x = float(tokens[i + 1]) * scale + tx
-            y = float(tokens[i + 2]) * scale + ty
-            result.append(f"{t} {x:.1f},{y:.1f}")
-            i += 3
-        elif t == 'Q':
-            cx = float(tokens[i + 1]) * scale + tx
-            cy = float(tokens[i + 2]) * scale + ty
-            x = float(tokens[i + 3]) * scale + tx
-            y = float(tokens[i + 4]) * scale + ty
-            result.append(f"Q {cx:.1f},{cy:.1f} {x:.1f},{y:.1f}")
-            i += 5
-        elif t == 'Z':
-            result.append("Z")
-            i += 1
-        else:
+        arity = _COMMAND_ARITY.get(t)
+        if arity is None:
             i += 1
-    return " ".join(result)
+            continue
+        values = [float(v) for v in tokens[i + 1:i + 1 + arity]]
+        coords.extend(values)
+        pairs = " ".join("{:.1f},{:.1f}" for _ in range(arity // 2))
+        parts.append(f"{t} {pairs}" if pairs else t)
+        i += 1 + arity
+    compiled = (" ".join(parts), tuple(coords))
+    _COMPILED_PATHS[d] = compiled
+    return compiled
+
+
+def compiled_glyph(ch, font=None):
+    """Return (template, coords, width) for a glyph, or None if undefined.
+
+    With `font` (a font file path) the glyph is outlined from the real font
+    via the on-disk outline cache; otherwise the built-in GLYPHS are used.
+    """
+    if font is not None:
+        return font_glyph(font, ch)
+    if ch not in GLYPHS:
+        return None
+    template, coords = compile_path_data(GLYPHS[ch])
+    return template, coords, GLYPH_WIDTHS.get(ch, 60)
+
+
+def layout_text(text, scale=1.0, kerning=None, font=None):
+    """Lay out text as a list of (char, x) advances in output units.
+
+    Returns (placements, width). Unknown characters advance by a 30-unit gap
+    and produce no placement; `kerning` maps (left, right) pairs to unit
+    adjustments. Built-in GLYPHS are capitals only, so text is upper-cased
+    unless a real `font` is given.
+    """
+    placements = []
+    cursor = 0.0
+    prev = None
+    if font is None:
+        text = text.upper()
+    for ch in text:
+        glyph = compiled_glyph(ch, font)
+        if glyph is None:
+            cursor += 30
+            prev = None
+            continue
+        if kerning and prev is not None:
+            cursor += kerning.get((prev, ch), 0)
+        if glyph[1]:  # skip spaces
+            placements.append((ch, cursor * scale))
+        cursor += glyph[2] + LETTER_SPACING
+        prev = ch
+    if font is not None:
+        save_font_cache(font)
+    return placements, (cursor - LETTER_SPACING) * scale
+
+
+def transform_coords(coords, tx, ty, scale):
+    """Scale a flat (x, y, ...) coordinate tuple and translate it by (tx, ty)."""
+    xs = [x * scale + tx for x in coords[0::2]]
+    ys = [y * scale + ty for y in coords[1::2]]
+    out = [0.0] * len(coords)
+    out[0::2] = xs
+    out[1::2] = ys
+    return out
+
+
+def text_to_paths(text, x_offset=0, y_offset=0, scale=1.0, kerning=None, font=None):
+    """Convert a text string to SVG path elements using outlined glyphs."""
+    placements, width = layout_text(text, scale, kerning, font)
+    paths = []
+    for ch, x in placements:
+        template, coords, _ = compiled_glyph(ch, font)
+        paths.append(template.format(*transform_coords(coords, x_offset + x, y_offset, scale)))
+    return paths, width
+
+
+def transform_path_data(d, tx, ty, scale):
+    """Transform SVG path data by translating and scaling."""
+    template, coords = compile_path_data(d)
+    return template.format(*transform_coords(coords, tx, ty, scale))
 
 
-def measure_text_width(text, scale=1.0):
+def measure_text_width(text, scale=1.0, kerning=None, font=None):
     """Measure the width of outlined text."""
+    if font is not None:
+        return layout_text(text, scale, kerning, font)[1]
     width = 0
+    prev = None
     for ch in text.upper():
-        width += (GLYPH_WIDTHS.get(ch, 60) + LETTER_SPACING) * scale
-    return width - LETTER_SPACING * scale
+        if kerning and prev is not None:
+            width += kerning.get((prev, ch), 0)
+        width += GLYPH_WIDTHS.get(ch, 60) + LETTER_SPACING
+        prev = ch if ch in GLYPHS else None
+    return (width - LETTER_SPACING) * scale
+
+
+# ---------------------------------------------------------------------------
+# Real-font outlining
+# Die text can be outlined from an installed font instead of GLYPHS. Outlines
+# are normalised so the font's cap height spans GLYPH_CELL units (the same
+# 80-unit cell the built-in glyphs use), converted to M/L/Q/Z, and cached on
+# disk per font file, character and size so the font is parsed only once.
+# ---------------------------------------------------------------------------
+GLYPH_CELL = 80
+DIE_FONT = "SourceSans3-Bold.otf"  # heading font used by the interior
+GLYPH_CACHE_DIR = os.path.join(REPO_ROOT, "build", "glyph-cache")
+
+FONT_DIRS = [
+    os.environ.get("VERSE_FONT_DIR", ""),
+    os.path.join(REPO_ROOT, "fonts"),
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"),
+    os.path.expanduser("~/Library/Fonts"),
+    "/Library/Fonts",
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts"),
+    "C:/Windows/Fonts",
+]
+
+# Per-font outline caches loaded from disk, keyed by font path.
+# Each value is {"file": cache_path, "dirty": bool, "glyphs": {key: entry}}.
+_FONT_CACHES = {}
+_TTFONTS = {}
+
+
+def find_font(name):
+    """Resolve a font file name (or path) against FONT_DIRS."""
+    if os.path.isfile(name):
+        return os.path.abspath(name)
+    for font_dir in FONT_DIRS:
+        if not font_dir or not os.path.isdir(font_dir):
+            continue
+        for root, _, files in os.walk(font_dir):
+            if name in files:
+                return os.path.join(root, name)
+    return None
+
+
+def _font_cache(font):
+    """Load (or create) the on-disk outline cache for a font file."""
+    cache = _FONT_CACHES.get(font)
+    if cache is not None:
+        return cache
+    import hashlib
+    import json
+    with open(font, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(font))[0]
+    cache_file = os.path.join(GLYPH_CACHE_DIR, f"{stem}-{digest}.json")
+    glyphs = {}
+    if os.path.exists(cache_file):
+        with open(cache_file, encoding="utf-8") as f:
+            glyphs = json.load(f)
+    cache = {"file": cache_file, "dirty": False, "glyphs": glyphs}
+    _FONT_CACHES[font] = cache
+    return cache
+
+
+def save_font_cache(font):
+    """Write newly outlined glyphs for `font` back to the on-disk cache."""
+    cache = _FONT_CACHES.get(font)
+    if not cache or not cache["dirty"]:
+        return
+    import json
+    os.makedirs(GLYPH_CACHE_DIR, exist_ok=True)
+    tmp = cache["file"] + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache["glyphs"], f, separators=(",", ":"))
+    os.replace(tmp, cache["file"])
+    cache["dirty"] = False
+
+
+def _outline_glyph(font, ch, size):
+    """Outline one character from the font file as a (template, coords, width)."""
+    try:
+        from fontTools.cu2qu import curve_to_quadratic
+        from fontTools.pens.basePen import BasePen
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        raise SystemExit("fontTools is required for --font — run: pip install fonttools")
+
+    tt = _TTFONTS.get(font)
+    if tt is None:
+        tt = _TTFONTS[font] = TTFont(font, lazy=True)
+    glyph_name = tt.getBestCmap().get(ord(ch))
+    if glyph_name is None:
+        return None
+
+    os2 = tt["OS/2"] if "OS/2" in tt else None
+    cap_height = getattr(os2, "sCapHeight", 0) or 0.7 * tt["head"].unitsPerEm
+    k = size / cap_height
+
+    parts = []
+    coords = []
+
+    def point(x, y):
+        coords.extend((round(x * k, 3), round((cap_height - y) * k, 3)))
+
+    class DiePen(BasePen):
+        def _moveTo(self, pt):
+            parts.append("M {:.1f},{:.1f}")
+            point(*pt)
+
+        def _lineTo(self, pt):
+            parts.append("L {:.1f},{:.1f}")
+            point(*pt)
+
+        def _qCurveToOne(self, pt1, pt2):
+            parts.append("Q {:.1f},{:.1f} {:.1f},{:.1f}")
+            point(*pt1)
+            point(*pt2)
+
+        def _curveToOne(self, pt1, pt2, pt3):
+            # Dies are M/L/Q/Z only: approximate cubics with quadratic splines.
+            spline = curve_to_quadratic(
+                [self._getCurrentPoint(), pt1, pt2, pt3], 0.5 / k)
+            self.qCurveTo(*spline[1:])
+
+        def _closePath(self):
+            parts.append("Z")
+
+    glyph_set = tt.getGlyphSet()
+    glyph_set[glyph_name].draw(DiePen(glyph_set))
+    advance = tt["hmtx"][glyph_name][0] * k
+    return " ".join(parts), coords, round(advance, 3)
+
+
+def font_glyph(font, ch, size=GLYPH_CELL):
+    """Return a cached (template, coords, width) outline from a real font."""
+    cache = _font_cache(font)
+    key = f"{ord(ch):x}@{size}"
+    entry = cache["glyphs"].get(key)
+    if entry is None:
+        outline = _outline_glyph(font, ch, size)
+        entry = list(outline) if outline else []
+        cache["glyphs"][key] = entry
+        cache["dirty"] = True
+    if not entry:
+        return None
+    template, coords, width = entry
+    return template, tuple(coords), width
+
+
+def text_bounds(text, scale=1.0, font=None):
+    """Return the (top, bottom) extent of outlined text below its y offset.
+
+    Built-in glyphs always occupy the 0..GLYPH_CELL cell; real-font text is
+    measured from its outlines so descenders and accents are included.
+    """
+    if font is None:
+        return 0, GLYPH_CELL * scale
+    ys = [y for ch, _ in layout_text(text, 1.0, font=font)[0]
+          for y in compiled_glyph(ch, font)[1][1::2]]
+    if not ys:
+        return 0, GLYPH_CELL * scale
+    return min(0, min(ys)) * scale, max(GLYPH_CELL, max(ys)) * scale
 
 
 def v_path_d(x=0, y=0, size=100):
@@ -160,14 +426,14 @@ def v_path_d(x=0, y=0, size=100):
     return " ".join(parts)
 
 
-def svg_die(width_in, height_in, content, label=""):
+def svg_die(width_in, height_in, content, label="", kind="Foil Stamping Die"):
     """Wrap content in a production die SVG with white background."""
     w = round(width_in * 72)
     h = round(height_in * 72)
     return f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {w} {h}"
-     width="{w}" height="{h}">
-  <!-- Foil Stamping Die — {label}
+     width="{w}pt" height="{h}pt">
+  <!-- {kind} — {label}
        Solid black on white. All text outlined (no live fonts).
        Book of Verse — Production Artwork -->
   <rect x="0" y="0" width="{w}" height="{h}" fill="white"/>
@@ -187,31 +453,33 @@ def generate_front_emblem():
     return svg
 
 
-def generate_front_title():
+def generate_front_title(font=None):
     """'BOOK OF VERSE' title text, outlined paths."""
     text = "BOOK OF VERSE"
     scale = 0.6  # ~36pt equivalent
-    tw = measure_text_width(text, scale)
+    tw = measure_text_width(text, scale, font=font)
+    top, bottom = text_bounds(text, scale, font)
     margin = 20
     w = tw + 2 * margin
-    h = 80 * scale + 2 * margin
-    paths, _ = text_to_paths(text, margin, margin, scale)
+    h = bottom - top + 2 * margin
+    paths, _ = text_to_paths(text, margin, margin - top, scale, font=font)
     content = "\n".join(f'  <path d="{p}" fill="black"/>' for p in paths)
     svg = svg_die(w / 72, h / 72, content, "Front Cover Title — BOOK OF VERSE")
     return svg
 
 
-def generate_front_subtitle():
+def generate_front_subtitle(font=None):
     """Subtitle text, outlined paths."""
     sub_text = "THE VERSE PROGRAMMING LANGUAGE"
     scale_sub = 0.28
 
-    tw_sub = measure_text_width(sub_text, scale_sub)
+    tw_sub = measure_text_width(sub_text, scale_sub, font=font)
+    top, bottom = text_bounds(sub_text, scale_sub, font)
     margin = 16
     w = tw_sub + 2 * margin
-    h_sub = 80 * scale_sub
+    h_sub = bottom - top
 
-    paths_sub, _ = text_to_paths(sub_text, margin, margin, scale_sub)
+    paths_sub, _ = text_to_paths(sub_text, margin, margin - top, scale_sub, font=font)
 
     content = "\n".join(f'  <path d="{p}" fill="black"/>' for p in paths_sub)
     total_h = margin * 2 + h_sub
@@ -219,20 +487,19 @@ def generate_front_subtitle():
     return svg
 
 
-def generate_spine_title():
+def generate_spine_title(font=None):
     """Spine title 'BOOK OF VERSE' rotated for spine reading."""
     text = "BOOK OF VERSE"
     scale = 0.3  # ~18pt equivalent for spine
-    tw = measure_text_width(text, scale)
+    tw = measure_text_width(text, scale, font=font)
+    top, bottom = text_bounds(text, scale, font)
     margin = 12
     # Spine title is rotated 90° — so SVG width = text height, height = text width
-    text_h = 80 * scale
+    text_h = bottom - top
     w = text_h + 2 * margin
     h = tw + 2 * margin
-    paths, _ = text_to_paths(text, margin, margin, scale)
-    # Apply rotation: rotate 90° around center
-    cx = w / 2
-    cy = h / 2
+    paths, _ = text_to_paths(text, margin, margin - top, scale, font=font)
+    # Rotate 90° into the spine: the text runs top to bottom
     content = f'  <g transform="translate({w}, 0) rotate(90)">\n'
     content += "\n".join(f'    <path d="{p}" fill="black"/>' for p in paths)
     content += "\n  </g>"
@@ -252,26 +519,374 @@ def generate_spine_emblem():
     return svg
 
 
+# ---------------------------------------------------------------------------
+# Personalised copies (Team Edition)
+# Each recipient name is laid out as its own die plus a printed bookplate.
+# Names are sized to fit NAME_MAX_WIDTH_IN; whether the letters still hold
+# the foil minimums at that size is measured on the outlined die itself by
+# die_features.py, so thin spines and tight counters of the actual
+# letterforms (built-in or --font) reject a name, not a nominal stem width.
+# ---------------------------------------------------------------------------
+PERSONALISED_DIR = os.path.join(OUTPUT_DIR, "personalised")
+NAME_MAX_WIDTH_IN = 4.0   # widest name the die / bookplate can carry
+NAME_SCALE = 0.4          # preferred size (~24pt caps)
+MIN_FEATURE_MM = 1.0      # foil stamping minimum line width
+BOOKPLATE_W_IN = 4.5
+BOOKPLATE_H_IN = 3.0
+
+
+def fit_name(name, font=None):
+    """Choose a scale for a recipient name: NAME_SCALE, or less to fit the die.
+
+    Returns (scale, width) where width is in points.
+    """
+    width1 = measure_text_width(name, 1.0, font=font)
+    scale = NAME_SCALE
+    if width1 > 0:
+        scale = min(NAME_SCALE, NAME_MAX_WIDTH_IN * 72 / width1)
+    return scale, width1 * scale
+
+
+def name_paths(name, scale, x, y, font=None, indent="  "):
+    """Outlined path elements for a name with its top edge at y."""
+    top, _ = text_bounds(name, scale, font)
+    paths, _ = text_to_paths(name, x, y - top, scale, font=font)
+    return "\n".join(f'{indent}<path d="{p}" fill="black"/>' for p in paths)
+
+
+def name_die_size(name, scale, font=None, margin=16):
+    """Return the (width, height) in points of a recipient name die."""
+    top, bottom = text_bounds(name, scale, font)
+    return (measure_text_width(name, scale, font=font) + 2 * margin,
+            bottom - top + 2 * margin)
+
+
+def generate_name_die(name, font=None):
+    """Recipient name die, outlined paths."""
+    scale, _ = fit_name(name, font)
+    margin = 16
+    w, h = name_die_size(name, scale, font, margin)
+    content = name_paths(name, scale, margin, margin, font)
+    return svg_die(w / 72, h / 72, content, f"Recipient Name — {name}")
+
+
+def generate_bookplate(name, font=None):
+    """Printed bookplate: V emblem, caption and the recipient's name."""
+    w = BOOKPLATE_W_IN * 72
+    h = BOOKPLATE_H_IN * 72
+    cx = w / 2
+    emblem = 50
+    caption = "THIS BOOK BELONGS TO"
+    cap_scale = 0.14
+    cap_w = measure_text_width(caption, cap_scale)
+    scale, name_w = fit_name(name, font)
+    top, bottom = text_bounds(name, scale, font)
+    name_y = 140 - (bottom - top) / 2
+
+    content = (
+        f'  <rect x="9" y="9" width="{w - 18:.1f}" height="{h - 18:.1f}" '
+        f'fill="none" stroke="black" stroke-width="1.5"/>\n'
+        f'  <path d="{v_path_d(cx - emblem / 2, 24, emblem)}" fill="black"/>\n'
+        + name_paths(caption, cap_scale, cx - cap_w / 2, 90) + "\n"
+        + name_paths(name, scale, cx - name_w / 2, name_y, font)
+    )
+    return svg_die(BOOKPLATE_W_IN, BOOKPLATE_H_IN, content, name, kind="Bookplate")
+
+
+def read_recipients(path):
+    """Read recipient names, one per line; blank lines and #comments skipped."""
+    names = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                names.append(line)
+    return names
+
+
+def render_artwork(svg, title, precision=1):
+    """Optimized SVG text and native vector PDF bytes of one artwork."""
+    svg = optimize_svg(svg, precision)
+    return svg, svg_to_pdf(svg, title)
+
+
+def save_artwork(path_stem, svg, pdf):
+    """Write a rendered artwork as path_stem.svg and path_stem.pdf."""
+    with open(path_stem + ".svg", "w", encoding="utf-8") as f:
+        f.write(svg)
+    with open(path_stem + ".pdf", "wb") as f:
+        f.write(pdf)
+
+
+def write_artwork(path_stem, svg, title, precision=1):
+    """Write optimized SVG and native vector PDF versions of one artwork.
+
+    Returns the PDF bytes.
+    """
+    svg, pdf = render_artwork(svg, title, precision)
+    save_artwork(path_stem, svg, pdf)
+    return pdf
+
+
+def feature_check_available():
+    """True if the die feature check's dependencies are installed."""
+    try:
+        import cv2  # noqa: F401
+        import numpy  # noqa: F401
+        import pymupdf  # noqa: F401
+    except ImportError:
+        print("\n  [SKIP] Minimum feature check — run: pip install opencv-python numpy pymupdf")
+        return False
+    return True
+
+
+def check_features(pdfs, map_dir=MAP_DIR):
+    """Measure every die's thinnest stroke and narrowest gap and print a report.
+
+    pdfs maps die names to PDF bytes. Returns True if all dies pass.
+    """
+    print(f"\n--- Minimum Feature Check (stroke {MIN_FEATURE_MM} mm, gap {MIN_GAP_MM} mm) ---\n")
+    all_pass = True
+    for stem, pdf in pdfs.items():
+        result = analyse_die(pdf, min_stroke=MIN_FEATURE_MM,
+                             map_path=os.path.join(map_dir, f"{stem}.png"))
+        print(f"  {stem:24s} {format_result(result, MIN_FEATURE_MM)}")
+        if result["map"]:
+            print(f"  {'':24s} map: {os.path.relpath(result['map'], REPO_ROOT)}")
+        all_pass &= result["ok"]
+    print(f"\n  Overall: {'ALL PASS' if all_pass else 'SOME FEATURES BELOW MINIMUM'}")
+    return all_pass
+
+
+def _render_copy(job):
+    """Worker: measure one copy's name die, then write it and the bookplate.
+
+    Returns (copy_no, result) with the die's feature check (None if it could
+    not run). A die below the minimums is rejected: neither file is written
+    and any left from an earlier run is removed.
+    """
+    copy_no, name, font, out_dir, precision, check = job
+    die_stem = f"die-name-{copy_no:03d}"
+    plate_stem = f"bookplate-{copy_no:03d}"
+    with span(f"copy {copy_no:03d}", "cover", copy=copy_no):
+        svg, pdf = render_artwork(generate_name_die(name, font), f"Name die: {name}", precision)
+        result = None
+        if check:
+            result = analyse_die(pdf, min_stroke=MIN_FEATURE_MM,
+                                 map_path=os.path.join(MAP_DIR, "personalised",
+                                                       f"{die_stem}.png"))
+        if result is None or result["ok"]:
+            save_artwork(os.path.join(out_dir, die_stem), svg, pdf)
+            write_artwork(os.path.join(out_dir, plate_stem),
+                          generate_bookplate(name, font), f"Bookplate: {name}", precision)
+        else:
+            for stem in (die_stem, plate_stem):
+                for ext in (".svg", ".pdf"):
+                    if os.path.exists(os.path.join(out_dir, stem + ext)):
+                        os.remove(os.path.join(out_dir, stem + ext))
+    return copy_no, result
+
+
+def generate_names_sheet(names, font=None, columns=2):
+    """Combined sheet with every recipient name die ganged on one page."""
+    gutter = 18
+    fitted = [(name, fit_name(name, font)[0]) for name in names]
+    sizes = [name_die_size(name, scale, font) for name, scale in fitted]
+    cell_w = max((s[0] for s in sizes), default=0)
+    cell_h = max((s[1] for s in sizes), default=0)
+    rows = -(-len(names) // columns)
+    w = columns * cell_w + (columns + 1) * gutter
+    h = rows * cell_h + (rows + 1) * gutter
+
+    groups = []
+    for i, (name, scale) in enumerate(fitted):
+        x = gutter + (i % columns) * (cell_w + gutter)
+        y = gutter + (i // columns) * (cell_h + gutter)
+        groups.append(f'  <!-- {i + 1:03d} {name} -->\n'
+                      + name_paths(name, scale, x + 16, y + 16, font))
+    return svg_die(w / 72, h / 72, "\n".join(groups),
+                   f"Recipient Names Sheet ({len(names)} copies)")
+
+
+def generate_personalised(names_file, font=None, workers=None, precision=1):
+    """Batch-generate per-copy name dies and bookplates from a recipient list.
+
+    Copies whose name, font and generator code are unchanged since the last
+    run (per personalised/manifest.json) are skipped; the rest are rendered
+    in parallel and their name dies checked for minimum stroke and gap
+    widths (results are kept in the manifest for unchanged copies). Copies
+    whose die fails are rejected and left off the names sheet.
+
+    Returns True if no copy was rejected.
+    """
+    import hashlib
+    import json
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    start = time.perf_counter()
+    names = read_recipients(names_file)
+    os.makedirs(PERSONALISED_DIR, exist_ok=True)
+    print(f"Generating personalised artwork for {len(names)} copies...\n")
+    print(f"  Output: {PERSONALISED_DIR}\n")
+
+    # Lay out every name once up front: this warms the glyph cache on disk
+    # so worker processes never parse the font.
+    unknown = set()
+    for name in names:
+        fit_name(name, font)
+        if font is None:
+            unknown.update(ch for ch in name.upper() if ch not in GLYPHS)
+
+    with open(os.path.abspath(__file__), "rb") as f:
+        code_digest = hashlib.sha1(f.read()).hexdigest()
+    font_key = os.path.basename(_font_cache(font)["file"]) if font else "GLYPHS"
+
+    manifest_path = os.path.join(PERSONALISED_DIR, "manifest.json")
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    check = feature_check_available()
+    new_manifest = {}
+    jobs = []
+    for copy_no, name in enumerate(names, 1):
+        key = f"{copy_no:03d}"
+        digest = hashlib.sha1(
+            f"{name}|{font_key}|{precision}|{code_digest}".encode("utf-8")).hexdigest()
+        new_manifest[key] = {"name": name, "digest": digest}
+        previous = manifest.get(key, {})
+        # A rejected copy has no artwork; it stays rejected until it changes
+        exists = (os.path.exists(os.path.join(PERSONALISED_DIR, f"die-name-{key}.pdf"))
+                  or previous.get("features", {}).get("ok") is False)
+        if (not exists or previous.get("digest") != digest
+                or (check and "features" not in previous)):
+            jobs.append((copy_no, name, font, PERSONALISED_DIR, precision, check))
+        elif "features" in previous:
+            new_manifest[key]["features"] = previous["features"]
+
+    # Remove artwork for copies that are no longer on the list.
+    for key in set(manifest) - set(new_manifest):
+        for prefix in ("die-name", "bookplate"):
+            for ext in (".svg", ".pdf"):
+                stale = os.path.join(PERSONALISED_DIR, f"{prefix}-{key}{ext}")
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for copy_no, result in pool.map(_render_copy, jobs, chunksize=8):
+                if result is None or result["ok"]:
+                    print(f"  Created: die-name-{copy_no:03d}, bookplate-{copy_no:03d} "
+                          "(.svg/.pdf)")
+                else:
+                    print(f"  Rejected: die-name-{copy_no:03d} (below foil minimums)")
+                if result:
+                    new_manifest[f"{copy_no:03d}"]["features"] = {
+                        "stroke_mm": result["stroke_mm"] and round(result["stroke_mm"], 3),
+                        "gap_mm": result["gap_mm"] and round(result["gap_mm"], 3),
+                        "ok": result["ok"]}
+
+    rejected = [(key, entry) for key, entry in sorted(new_manifest.items())
+                if not entry.get("features", {}).get("ok", True)]
+    failed = {key for key, _ in rejected}
+    sheet_names = [name for copy_no, name in enumerate(names, 1)
+                   if f"{copy_no:03d}" not in failed]
+    write_artwork(os.path.join(PERSONALISED_DIR, "die-names-sheet"),
+                  generate_names_sheet(sheet_names, font), "Name dies sheet", precision)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(new_manifest, f, indent=2)
+
+    print(f"\n  Rendered {len(jobs)} copies, {len(new_manifest) - len(jobs)} unchanged")
+    print("  Created: die-names-sheet.svg, die-names-sheet.pdf")
+    if unknown:
+        print(f"\n  WARNING: no built-in glyph for {''.join(sorted(unknown))!r} "
+              f"(left as gaps) — use --font")
+    for key, entry in rejected:
+        print(f"  FAIL: copy {key} {entry['name']!r} — {format_result(entry['features'])}, "
+              f"not generated; "
+              f"map: build/die-check/personalised/die-name-{key}.png")
+    print(f"\nDone in {time.perf_counter() - start:.2f}s.")
+    return not rejected
+
+
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate foil stamping die artwork.")
+    parser.add_argument("--font", nargs="?", const=DIE_FONT, default=None,
+                        help="outline die text from a real font file instead of "
+                             f"the built-in glyphs (default: {DIE_FONT})")
+    parser.add_argument("--names", metavar="FILE",
+                        help="batch mode: per-copy name dies and bookplates for "
+                             "each recipient listed in FILE (one per line); needs "
+                             f"a real font, --font or {DIE_FONT} by default")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --names (default: CPU count)")
+    parser.add_argument("--precision", type=int, default=1,
+                        help="decimal places kept in path coordinates (default: 1)")
+    parser.add_argument("--strict", action="store_true",
+                        help="exit non-zero if any die fails the minimum feature check")
+    args = parser.parse_args()
+
+    # Recipient names need a real font; the built-in glyphs are capitals only
+    font_name = args.font or (DIE_FONT if args.names else None)
+    font = None
+    if font_name:
+        font = find_font(font_name)
+        if font is None:
+            print(f"Error: font {font_name} not found (set VERSE_FONT_DIR)")
+            if args.names:
+                print("  --names needs a real font: install Source Sans 3 or pass --font FILE")
+            raise SystemExit(1)
+
+    if args.names:
+        ok = generate_personalised(args.names, font, args.workers, args.precision)
+        raise SystemExit(0 if ok else 1)
+
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     print("Generating foil stamping die artwork...\n")
-    print(f"  Output: {OUTPUT_DIR}\n")
+    print(f"  Output: {OUTPUT_DIR}")
+    print(f"  Text:   {font or 'built-in glyphs'}\n")
 
     dies = [
-        ("die-front-emblem.svg", generate_front_emblem, "Front V emblem (2.5\" wide)"),
-        ("die-front-title.svg", generate_front_title, "Front title: BOOK OF VERSE"),
-        ("die-front-subtitle.svg", generate_front_subtitle, "Front subtitle"),
-        ("die-spine-title.svg", generate_spine_title, "Spine title (rotated)"),
-        ("die-spine-emblem.svg", generate_spine_emblem, "Spine V emblem (0.7\" wide)"),
+        ("die-front-emblem", generate_front_emblem, "Front V emblem (2.5\" wide)"),
+        ("die-front-title", generate_front_title, "Front title: BOOK OF VERSE"),
+        ("die-front-subtitle", generate_front_subtitle, "Front subtitle"),
+        ("die-spine-title", generate_spine_title, "Spine title (rotated)"),
+        ("die-spine-emblem", generate_spine_emblem, "Spine V emblem (0.7\" wide)"),
     ]
-
-    for filename, generator, description in dies:
-        svg = generator()
-        filepath = os.path.join(OUTPUT_DIR, filename)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(svg)
-        print(f"  Created: {filename:30s} — {description}")
+    text_dies = {generate_front_title, generate_front_subtitle, generate_spine_title}
+
+    # Render and measure every die before writing any, so a --strict run that
+    # fails leaves the production files and the printer bundle untouched
+    rendered = {}
+    for stem, generator, description in dies:
+        with span(stem, "cover") as die_span:
+            svg = generator(font) if generator in text_dies else generator()
+            rendered[stem] = render_artwork(svg, description, args.precision)
+            die_span.bytes_out = len(rendered[stem][0].encode("utf-8")) + len(rendered[stem][1])
+    pdfs = {stem: pdf for stem, (_, pdf) in rendered.items()}
+    with span("check_features", "preflight"):
+        features_ok = check_features(pdfs) if feature_check_available() else True
+    if not features_ok and args.strict:
+        print("\nNo artwork written: some dies are below the foil minimums "
+              "— see the maps above.")
+        raise SystemExit(1)
+    print()
+
+    for stem, _, description in dies:
+        save_artwork(os.path.join(OUTPUT_DIR, stem), *rendered[stem])
+        print(f"  Created: {stem + '.svg/.pdf':30s} — {description}")
+
+    # Keep the printer bundle's copies in step with the production files
+    if os.path.isdir(BUNDLE_DIR):
+        for stem, _, _ in dies:
+            for ext in (".svg", ".pdf"):
+                shutil.copyfile(os.path.join(OUTPUT_DIR, stem + ext),
+                                os.path.join(BUNDLE_DIR, stem + ext))
+        print(f"\n  Updated: {os.path.relpath(BUNDLE_DIR, REPO_ROOT)}/")
 
     # Generate a README for the production directory
     readme = """# Foil Stamping Die Artwork
@@ -282,35 +897,40 @@ Production-ready vector artwork for foil stamping dies.
 
 | File | Content | Size |
 |------|---------|------|
-| `die-front-emblem.svg` | V logo for front cover | 2.5" wide |
-| `die-front-title.svg` | "BOOK OF VERSE" title | Outlined text |
-| `die-front-subtitle.svg` | Subtitle text | Outlined text |
-| `die-spine-title.svg` | Spine title (rotated) | Outlined text |
-| `die-spine-emblem.svg` | V logo for spine | 0.7" wide |
+| `die-front-emblem.svg/.pdf` | V logo for front cover | 2.5" wide |
+| `die-front-title.svg/.pdf` | "BOOK OF VERSE" title | Outlined text |
+| `die-front-subtitle.svg/.pdf` | Subtitle text | Outlined text |
+| `die-spine-title.svg/.pdf` | Spine title (rotated) | Outlined text |
+| `die-spine-emblem.svg/.pdf` | V logo for spine | 0.7" wide |
 
 ## Specifications
 
-- **Format:** SVG (convert to PDF for submission using Inkscape or Illustrator)
+- **Format:** PDF for submission, SVG for editing — both generated together
 - **Color:** Solid black on white background
 - **Text:** All text converted to outlined paths (no live fonts)
 - **No gradients:** Foil stamping requires solid areas only
-- **Minimum feature:** 1mm line width verified
+- **Minimum feature:** 1 mm stroke and 0.5 mm gap, measured on every
+  generation by `scripts/die_features.py` (failure maps in `build/die-check/`)
 
-## Converting to PDF
+## Regenerating
 
-Using Inkscape (command line):
+The PDFs are vector files written directly from the die path data (solid
+black fills, one page sized to the die), so no Inkscape or Illustrator
+conversion step is needed. Rebuild both formats with:
 ```bash
-inkscape die-front-emblem.svg --export-type=pdf --export-filename=die-front-emblem.pdf
+python scripts/generate-die-artwork.py
 ```
-
-Or open in Adobe Illustrator and export as PDF with "Preserve Illustrator Editing" unchecked.
 """
     readme_path = os.path.join(OUTPUT_DIR, "README.md")
     with open(readme_path, "w", encoding="utf-8") as f:
         f.write(readme)
-    print(f"\n  Created: README.md")
+    print("\n  Created: README.md")
+
+    if not features_ok:
+        print("\nDone, but some dies are below the foil minimums — see the maps above.")
+        return
 
-    print("\nDone! Convert SVGs to PDF using Inkscape or Illustrator for printer submission.")
+    print("\nDone! PDFs are ready for printer submission.")
 
 
 if __name__ == "__main__":
@@ -14,9 +14,15 @@ Run from repo root:  python scripts/generate-verse-logo.py
 
 import os
 
+from build_trace import span
+from source_image import load_image
+from svg_optimize import optimize_svg
+from v_outline import load_v_outline
+
 # ---------------------------------------------------------------------------
 # Geometry: all coordinates in a 100×100 viewBox
-# Measured via OpenCV contour detection from verselanguageimage.jpeg.
+# Measured via OpenCV contour detection (scripts/extract-v-from-2d.py) and
+# stored in cover-design/assets/v-outline.json, shared by all generators.
 #
 # The V is a single 7-vertex concave polygon. The "notch" in the
 # upper-right is not a separate cutout — it's the angular shape of
@@ -41,15 +47,7 @@ import os
 #   │        ╱             ╲   │
 #   └──────╱       7        ╲──┘
 #
-V_OUTLINE = [
-    (0, 0),     # 1 — top-left outer
-    (22, 0),    # 2 — inner top-left (left arm inner edge, top)
-    (53, 62),   # 3 — inner bottom (where inner edges meet)
-    (78, 14),   # 4 — right arm inner angle (the "notch apex")
-    (60, 0),    # 5 — right arm inner top (the "notch left")
-    (100, 0),   # 6 — top-right outer
-    (50, 100),  # 7 — outer bottom point
-]
+V_OUTLINE = load_v_outline()
 
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -113,8 +111,9 @@ def generate_detailed_svg(path_d, filepath):
   <!-- Edge highlight stroke -->
   <path d="{path_d}" fill="none" stroke="url(#edgeHighlight)" stroke-width="0.7"/>
 </svg>'''
+    # The three layers share one path: optimize_svg stores it once in <defs>
     with open(filepath, "w", encoding="utf-8") as f:
-        f.write(svg)
+        f.write(optimize_svg(svg))
     print(f"  Created: {filepath}")
 
 
@@ -127,7 +126,7 @@ def generate_foil_svg(path_d, filepath):
   <path d="{path_d}" fill="black"/>
 </svg>'''
     with open(filepath, "w", encoding="utf-8") as f:
-        f.write(svg)
+        f.write(optimize_svg(svg))
     print(f"  Created: {filepath}")
 
 
@@ -213,8 +212,8 @@ def generate_compare_html(filepath, jpeg_relpath):
 </div>
 
 <div class="notes">
-  <strong>Refinement:</strong> Edit the <code>V_OUTLINE</code> coordinate array
-  in <code>scripts/generate-verse-logo.py</code>,
+  <strong>Refinement:</strong> Re-measure with <code>scripts/extract-v-from-2d.py --accept</code>
+  (or edit <code>cover-design/assets/v-outline.json</code>),
   then re-run the script to regenerate. Use the overlay slider above to compare alignment.
 </div>
 
@@ -233,24 +232,17 @@ def generate_debug_overlay():
         print("  [SKIP] Pillow not installed — run: pip install Pillow")
         return
 
-    import cv2
-    import numpy as np
-
     jpeg_path = os.path.join(REPO_ROOT, "verselanguageimage.jpeg")
     if not os.path.exists(jpeg_path):
         print(f"  [SKIP] Source JPEG not found: {jpeg_path}")
         return
 
-    # Use OpenCV to find the V's bounding box for precise crop
-    img_cv = cv2.imread(jpeg_path)
-    gray = cv2.cvtColor(img_cv, cv2.COLOR_BGR2GRAY)
-    _, thresh = cv2.threshold(gray, 55, 255, cv2.THRESH_BINARY)
-    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    contours = sorted(contours, key=cv2.contourArea, reverse=True)
-    bx, by, bw, bh = cv2.boundingRect(contours[0])
-
-    # Open with Pillow for the overlay
-    img = Image.open(jpeg_path).convert("RGBA")
+    # Decoded once and shared: OpenCV finds the V's bounding box for a
+    # precise crop (cached on disk by image hash), Pillow draws the overlay
+    # on a zero-copy view of the same pixels.
+    src = load_image(jpeg_path)
+    bx, by, bw, bh = src.bbox(55)
+    img = src.pil()
 
     # Crop to the V bounding box with some padding
     pad_px = 20
@@ -364,17 +356,24 @@ def main():
     path_d = v_path_d()
 
     print("Generating Verse V logo SVGs...\n")
-    generate_detailed_svg(path_d, os.path.join(OUTPUT_DIR, "verse-v-logo.svg"))
-    generate_foil_svg(path_d, os.path.join(OUTPUT_DIR, "verse-v-logo-foil.svg"))
+    for filename, generate in (("verse-v-logo.svg", generate_detailed_svg),
+                               ("verse-v-logo-foil.svg", generate_foil_svg)):
+        path = os.path.join(OUTPUT_DIR, filename)
+        with span(filename, "cover", outputs=[path]):
+            generate(path_d, path)
 
     # Relative path from compare.html (in cover-design/assets/) to the JPEG (in repo root)
     jpeg_relpath = "../../verselanguageimage.jpeg"
-    generate_compare_html(os.path.join(OUTPUT_DIR, "compare.html"), jpeg_relpath)
+    compare_path = os.path.join(OUTPUT_DIR, "compare.html")
+    with span("compare.html", "cover", outputs=[compare_path]):
+        generate_compare_html(compare_path, jpeg_relpath)
 
     # Generate debug overlay for visual comparison
-    generate_debug_overlay()
+    with span("debug-overlay.png", "cover"):
+        generate_debug_overlay()
 
-    verify_feature_sizes()
+    with span("verify_feature_sizes", "preflight"):
+        verify_feature_sizes()
 
     print("\nDone! Open cover-design/assets/compare.html in a browser to compare.")
 
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+html_chapters.py
+
+The chapters of build/combined.md as HTML fragments, shared by the HTML
+(build-html.py) and EPUB (build-epub.py) editions so both reuse what
+preprocess.py already produced for the PDF — admonition boxes, Verse code
+blocks, the Concept Index — instead of running a Pandoc pipeline each.
+
+  - Chapters are cut from build/combined.md at the source map's line ranges
+    and named and numbered after build_filename_anchor_map().
+  - Each chapter is converted by Pandoc (tango highlighting, the PDF's
+    section numbers) across a process pool, one chapter per worker.
+  - Fragments are cached in build/html-cache/<sha256>.json, keyed by the
+    chapter markdown, its number, the Pandoc version and CACHE_VERSION, so a
+    chapter is converted once per content and every later build — of either
+    edition — reads it back. Entries no chapter uses any more are pruned.
+  - Local images are renamed to a hash of their content (images/<sha>.png),
+    so an unchanged image keeps its name from build to build and is copied
+    at most once.
+
+Usage (requires Pandoc):
+    from html_chapters import load_chapters, convert_chapters, link_pages, hashed_images
+    chapters = load_chapters("build/combined.md")
+    for chapter, result in zip(chapters, convert_chapters(chapters)):
+        result["fragment"], result["ids"], result["cached"]
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+from build_trace import span
+from preprocess import CHAPTERS, build_filename_anchor_map
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+CACHE_DIR = os.path.join(REPO_ROOT, "build", "html-cache")
+CACHE_VERSION = 2         # bump when the conversion below changes its output
+
+PANDOC_ARGS = ["--from=markdown", "--to=html5", "--highlight-style=tango"]
+
+# Raw LaTeX from preprocess.py's Concept Index, rewritten for HTML
+LABEL_RE = re.compile(r"`\\label\{([^}]+)\}`\{=latex\}")
+PAGEREF_RE = re.compile(
+    r"(^[-*]\s+|[:;]\s+|^)([^:;\n]+?) \(p\.\\ `\\pageref\{([^}]+)\}`\{=latex\}\)",
+    re.MULTILINE)
+# preprocess.py fences admonitions as `::: {notebox}`, which Pandoc reads as
+# the literal class "{notebox}"; the LaTeX build ignores div classes, the
+# HTML needs the bare box class for the stylesheets
+ADMONITION_RE = re.compile(r"^(:{3,}) \{(\w+box)\}[ \t]*$", re.MULTILINE)
+IMAGE_SRC_RE = re.compile(r'(<img\b[^>]*\bsrc=")([^"]+)(")')
+NUMBERED_BLOCK_RE = re.compile(
+    r'(<pre class="[^"]*\bnumberLines\b[^"]*"[^>]*><code[^>]*>)(.*?)(</code></pre>)', re.S)
+
+
+def load_chapters(markdown_path):
+    """Chapters of the combined markdown, in source map order.
+
+    Each is a dict: file, title, number (None if unnumbered), anchor (from
+    build_filename_anchor_map), label ("5. Functions"), markdown, docs_dir.
+    """
+    map_path = os.path.splitext(markdown_path)[0] + ".map.json"
+    with open(markdown_path, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    with open(map_path, encoding="utf-8") as f:
+        source_map = json.load(f)
+
+    anchor_map = build_filename_anchor_map()
+    titles = {filename: (title, is_numbered) for filename, title, is_numbered in CHAPTERS}
+    chapters = []
+    for entry in source_map["chapters"]:
+        filename = entry["file"]
+        stem = os.path.splitext(filename)[0]
+        title, is_numbered = titles.get(filename, (stem, False))
+        anchor = anchor_map.get(filename, stem)
+        number = int(anchor.rsplit("-", 1)[1]) if is_numbered else None
+        chapters.append({"file": filename, "title": title, "number": number,
+                         "anchor": anchor, "label": f"{number}. {title}" if number else title,
+                         "markdown": "\n".join(lines[entry["start"] - 1:entry["end"]]),
+                         "docs_dir": source_map.get("docs_dir", "")})
+    return chapters
+
+
+def pandoc_version():
+    """First line of `pandoc --version`; part of every cache key."""
+    result = subprocess.run(["pandoc", "--version"], capture_output=True, text=True)
+    return result.stdout.split("\n", 1)[0]
+
+
+def number_lines(fragment):
+    """Wrap each line of {.numberLines} blocks in a span for the CSS counter.
+
+    Pandoc only numbers blocks in languages it can highlight; Verse blocks
+    come out as plain <pre><code>.
+    """
+    def wrap(m):
+        if "<span id=" in m.group(2):
+            return m.group(0)
+        lines = m.group(2).strip("\n").split("\n")
+        return m.group(1) + "\n".join(f'<span class="line">{line}</span>'
+                                      for line in lines) + m.group(3)
+    return NUMBERED_BLOCK_RE.sub(wrap, fragment)
+
+
+def cache_key(chapter, version):
+    """Content hash of everything that determines a chapter's fragment."""
+    h = hashlib.sha256()
+    for part in (str(CACHE_VERSION), version, " ".join(PANDOC_ARGS),
+                 str(chapter["number"]), chapter["markdown"]):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def convert_chapter(job):
+    """Pool worker: one chapter -> {fragment, ids, cached}, via the cache."""
+    filename, markdown, number, key, cache_dir = job
+    cache_path = os.path.join(cache_dir, f"{key}.json")
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            result = json.load(f)
+        result["cached"] = True
+        return result
+
+    with span(filename, "html") as chapter_span:
+        markdown = PAGEREF_RE.sub(r"\1[\2](#\3)", markdown)
+        markdown = LABEL_RE.sub(r"[]{#\1}", markdown)
+        markdown = ADMONITION_RE.sub(r"\1 {.\2}", markdown)
+        command = ["pandoc"] + PANDOC_ARGS
+        if number:
+            command += ["--number-sections", f"--number-offset={number - 1}"]
+        proc = subprocess.run(command, input=markdown, capture_output=True,
+                              text=True, encoding="utf-8")
+        if proc.returncode != 0:
+            raise RuntimeError(f"pandoc failed on {filename}: {proc.stderr.strip()}")
+        fragment = number_lines(proc.stdout)
+        chapter_span.bytes_out = len(fragment.encode("utf-8"))
+
+    result = {"fragment": fragment, "ids": re.findall(r'\sid="([^"]+)"', fragment)}
+    # Write then rename, so a concurrent build never reads half an entry
+    with open(cache_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False)
+    os.replace(cache_path + ".tmp", cache_path)
+    result["cached"] = False
+    return result
+
+
+def convert_chapters(chapters, workers=None, cache_dir=CACHE_DIR):
+    """Fragments for every chapter, in order; raises RuntimeError on Pandoc errors."""
+    os.makedirs(cache_dir, exist_ok=True)
+    version = pandoc_version()
+    keys = [cache_key(chapter, version) for chapter in chapters]
+    jobs = [(chapter["file"], chapter["markdown"], chapter["number"], key, cache_dir)
+            for chapter, key in zip(chapters, keys)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(convert_chapter, jobs))
+
+    used = {f"{key}.json" for key in keys}
+    for name in os.listdir(cache_dir):
+        if name.endswith(".json") and name not in used:
+            os.remove(os.path.join(cache_dir, name))
+    return results
+
+
+def link_pages(fragment, own_ids, owner):
+    """Point #anchor links at the page that has the anchor (owner: id -> page)."""
+    def relink(m):
+        anchor = m.group(1)
+        if anchor in own_ids or anchor not in owner:
+            return m.group(0)
+        return f'href="{owner[anchor]}#{anchor}"'
+    return re.sub(r'href="#([^"]+)"', relink, fragment)
+
+
+def hashed_images(fragment, docs_dir, prefix="images/"):
+    """Point local <img> sources at content-hashed names.
+
+    Returns the fragment and {name: source path} for the images it uses;
+    sources are resolved against the docs directory, as in the docs site.
+    Remote and missing images are left as they are.
+    """
+    images = {}
+
+    def rename(m):
+        src = m.group(2)
+        if re.match(r"^[a-z][a-z0-9+.-]*:", src):
+            return m.group(0)
+        path = os.path.normpath(os.path.join(docs_dir, src))
+        if not os.path.isfile(path):
+            return m.group(0)
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        name = digest + os.path.splitext(path)[1].lower()
+        images[name] = path
+        return m.group(1) + prefix + name + m.group(3)
+
+    return IMAGE_SRC_RE.sub(rename, fragment), images
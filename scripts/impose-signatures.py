@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+impose-signatures.py
+
+Imposes the interior PDF into 16-page signatures for sheet-fed offset
+printing and Smyth-sewn binding (O'Neill Printing, Team Edition specs).
+
+  1. The book is padded with blank pages to a multiple of 16.
+  2. Each signature is laid out on one press sheet, 4 × 2 pages per side,
+     in the standard 16-page sheetwise scheme (head-to-head, top row turned
+     180°): three right-angle folds bring the pages into order 1–16.
+  3. Conjugate pages butt at the spine folds; every other edge keeps its
+     bleed, with a 2 × bleed gutter between heads and across the first fold.
+  4. Creep compensation: pages nested deeper in the folded signature are
+     shifted towards the spine by one paper caliper per leaf, so the
+     fore-edge margin is even after trimming.
+  5. Marks in black only: crop marks at every trim line, dashed fold marks
+     in the sheet margin, and a collation mark on the spine fold, stepped
+     down one position per signature so a misgathered book is visible.
+
+Pages are placed as form XObjects copied by reference (pikepdf / qpdf), so
+nothing is re-rendered: the source is opened memory-mapped and each
+signature's pages, fonts and images are streamed into its own file. Blank
+padding pages place nothing.
+
+Writes output/imposed/<edition>/sig-NN.pdf (front and back of the sheet)
+and imposition.json describing every signature.
+
+Requires pikepdf (pip install pikepdf).
+
+Run from repo root:
+  python scripts/impose-signatures.py                                # Team interior
+  python scripts/impose-signatures.py output/BookOfVerse-print.pdf --caliper 0.1
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_INTERIOR = os.path.join(REPO_ROOT, "print-bundle-team", "interior.pdf")
+OUTPUT_DIR = os.path.join(REPO_ROOT, "output", "imposed")
+
+SIGNATURE = 16
+CALIPER_MM = 0.1         # 70-80 gsm uncoated book stock
+MARGIN_IN = 0.5          # sheet margin around the imposed pages, for marks
+MARK_LENGTH = 18         # pt
+MARK_OFFSET = 3          # pt beyond the bleed before a mark starts
+MARK_WIDTH = 0.25        # pt
+COLLATION_MARK = (6, 18) # pt, width × height of the spine collation mark
+
+# Page numbers within a signature, [row][column]; row 0 is the top row
+# (turned 180°), row 1 the bottom row (upright). Fold order: across the
+# middle (between columns 1 and 2), then between the rows, then the spine
+# folds between columns 0|1 and 2|3.
+FRONT = ((5, 12, 9, 8), (4, 13, 16, 1))
+BACK = ((7, 10, 11, 6), (2, 15, 14, 3))
+SPINE_AFTER = {0, 2}     # a spine fold follows these columns; a gutter follows 1
+
+
+def leaf_depth(n):
+    """How many leaves are wrapped around page n (1–16) once folded."""
+    return (min(n, SIGNATURE + 1 - n) - 1) // 2
+
+
+class Layout:
+    """Press sheet geometry, in points, for pages of one trim size."""
+
+    def __init__(self, trim_w, trim_h, bleed, margin):
+        self.w, self.h, self.bleed, self.margin = trim_w, trim_h, bleed, margin
+        # Trim lower-left corner of each column and row on the sheet
+        self.xs = []
+        x = margin + bleed
+        for col in range(4):
+            self.xs.append(x)
+            x += trim_w + (0 if col in SPINE_AFTER else 2 * bleed)
+        self.ys = [margin + bleed + trim_h + 2 * bleed, margin + bleed]   # top, bottom
+        self.sheet_w = self.xs[-1] + trim_w + bleed + margin
+        self.sheet_h = self.ys[0] + trim_h + bleed + margin
+
+    def clip(self, row, col):
+        """Visible area of a cell: trim plus bleed on all but the spine edge."""
+        b = self.bleed
+        left = 0 if col - 1 in SPINE_AFTER else b
+        right = 0 if col in SPINE_AFTER else b
+        x, y = self.xs[col], self.ys[row]
+        return x - left, y - b, self.w + left + right, self.h + 2 * b
+
+    def folds(self):
+        """(x positions of vertical folds, y of the horizontal fold), in fold order."""
+        middle = self.xs[1] + self.w + self.bleed
+        spines = [self.xs[c] + self.w for c in sorted(SPINE_AFTER)]
+        return [middle] + spines, self.ys[1] + self.h + self.bleed
+
+
+def placement(row, col, n, trim, layout, creep):
+    """Content-stream cm matrix placing page n's trim box in its cell.
+
+    creep (pt) moves the content towards the spine: left for odd (recto)
+    pages, right for even (verso) pages, in page coordinates.
+    """
+    tx0, ty0, tx1, ty1 = trim
+    shift = -creep if n % 2 else creep
+    x, y = layout.xs[col], layout.ys[row]
+    if row == 0:   # turned 180°, heads meet in the middle of the sheet
+        return (-1, 0, 0, -1, x + tx1 - shift, y + ty1)
+    return (1, 0, 0, 1, x - tx0 + shift, y - ty0)
+
+
+def _fmt(*values):
+    return " ".join(f"{v:.4f}".rstrip("0").rstrip(".") for v in values)
+
+
+def marks(layout, side, index):
+    """Content stream operators for crop, fold and collation marks."""
+    ops = [f"q 0 G 0 g {_fmt(MARK_WIDTH)} w"]
+    b, m, off, length = layout.bleed, layout.margin, MARK_OFFSET, MARK_LENGTH
+    top = layout.ys[0] + layout.h + b
+    bottom = layout.ys[1] - b
+    left = layout.xs[0] - b
+    right = layout.xs[-1] + layout.w + b
+
+    # Crop marks at every trim line, outside the bleed
+    trim_xs = sorted({x for x in layout.xs} | {x + layout.w for x in layout.xs})
+    trim_ys = sorted({y for y in layout.ys} | {y + layout.h for y in layout.ys})
+    for x in trim_xs:
+        ops.append(f"{_fmt(x, top + off)} m {_fmt(x, top + off + length)} l S")
+        ops.append(f"{_fmt(x, bottom - off)} m {_fmt(x, bottom - off - length)} l S")
+    for y in trim_ys:
+        ops.append(f"{_fmt(left - off, y)} m {_fmt(left - off - length, y)} l S")
+        ops.append(f"{_fmt(right + off, y)} m {_fmt(right + off + length, y)} l S")
+
+    # Fold marks, dashed, in the margin
+    fold_xs, fold_y = layout.folds()
+    ops.append("[3 2] 0 d")
+    for x in fold_xs:
+        ops.append(f"{_fmt(x, top + off)} m {_fmt(x, layout.sheet_h - m / 4)} l S")
+        ops.append(f"{_fmt(x, bottom - off)} m {_fmt(x, m / 4)} l S")
+    ops.append(f"{_fmt(left - off, fold_y)} m {_fmt(m / 4, fold_y)} l S")
+    ops.append(f"{_fmt(right + off, fold_y)} m {_fmt(layout.sheet_w - m / 4, fold_y)} l S")
+    ops.append("[] 0 d")
+
+    # Collation mark on the outer spine fold (between pages 16 and 1), one
+    # step lower for each signature
+    if side == "front":
+        cw, ch = COLLATION_MARK
+        steps = int((layout.h - 2 * ch) // ch)
+        x = layout.xs[3] - cw / 2
+        y = layout.ys[1] + layout.h - ch * (1 + index % steps)
+        ops.append(f"{_fmt(x, y, cw, ch)} re f")
+    ops.append("Q")
+    return "\n".join(ops)
+
+
+def impose_signature(src, index, first, count, layout, caliper_pt, out_path):
+    """Write one signature (front and back of its sheet) to out_path.
+
+    first is the 0-based source index of the signature's page 1; positions
+    beyond count (the book's length) are blank padding.
+    """
+    import pikepdf
+
+    out = pikepdf.new()
+    for side, scheme in (("front", FRONT), ("back", BACK)):
+        resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary())
+        ops = []
+        for row, columns in enumerate(scheme):
+            for col, n in enumerate(columns):
+                number = first + n - 1
+                if number >= count:
+                    continue
+                page = src.pages[number]
+                trim = [float(v) for v in page.trimbox]
+                form = out.copy_foreign(page.as_form_xobject())
+                name = f"/P{n}"
+                resources.XObject[name] = form
+                cm = placement(row, col, n, trim, layout, leaf_depth(n) * caliper_pt)
+                ops.append(f"q {_fmt(*layout.clip(row, col))} re W n "
+                           f"{_fmt(*cm)} cm {name} Do Q")
+        ops.append(marks(layout, side, index))
+        sheet = pikepdf.Dictionary(
+            Type=pikepdf.Name.Page,
+            MediaBox=[0, 0, layout.sheet_w, layout.sheet_h],
+            Resources=resources,
+            Contents=out.make_stream("\n".join(ops).encode()),
+        )
+        out.pages.append(pikepdf.Page(sheet))
+    out.save(out_path)
+
+
+def edition_name(path):
+    """Output folder name: the bundle's edition for print-bundle-*/interior.pdf."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    if stem == "interior" and parent.startswith("print-bundle-"):
+        return parent[len("print-bundle-"):]
+    return stem
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Impose the interior into 16-page signatures.")
+    parser.add_argument("interior", nargs="?", default=DEFAULT_INTERIOR,
+                        help="interior PDF (default: print-bundle-team/interior.pdf)")
+    parser.add_argument("--caliper", type=float, default=CALIPER_MM,
+                        help=f"paper thickness in mm for creep compensation; 0 disables "
+                             f"(default: {CALIPER_MM})")
+    parser.add_argument("--margin", type=float, default=MARGIN_IN,
+                        help=f"sheet margin for marks, inches (default: {MARGIN_IN})")
+    parser.add_argument("--out-dir", help="output folder (default: output/imposed/<edition>)")
+    args = parser.parse_args()
+
+    try:
+        import pikepdf
+    except ImportError:
+        print("Error: pikepdf is required — run: pip install pikepdf")
+        sys.exit(1)
+
+    if not os.path.exists(args.interior):
+        print(f"Error: interior {args.interior} not found")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    out_dir = args.out_dir or os.path.join(OUTPUT_DIR, edition_name(args.interior))
+    os.makedirs(out_dir, exist_ok=True)
+    caliper_pt = args.caliper / 25.4 * 72
+
+    with pikepdf.open(args.interior, access_mode=pikepdf.AccessMode.mmap) as src:
+        count = len(src.pages)
+        padded = -(-count // SIGNATURE) * SIGNATURE
+        first = src.pages[0]
+        tx0, ty0, tx1, ty1 = (float(v) for v in first.trimbox)
+        mx0, my0, mx1, my1 = (float(v) for v in first.mediabox)
+        bleed = max(tx0 - mx0, ty0 - my0, mx1 - tx1, my1 - ty1, 0)
+        layout = Layout(tx1 - tx0, ty1 - ty0, bleed, args.margin * 72)
+
+        print(f"Imposing {os.path.relpath(os.path.abspath(args.interior), REPO_ROOT)}: "
+              f"{count} pages + {padded - count} blank = {padded // SIGNATURE} "
+              f"signatures of {SIGNATURE}")
+        print(f"  Sheet {layout.sheet_w / 72:.2f}\" × {layout.sheet_h / 72:.2f}\", "
+              f"trim {layout.w / 72:.2f}\" × {layout.h / 72:.2f}\", "
+              f"bleed {bleed / 72:.3f}\", creep {args.caliper:g} mm per leaf\n")
+
+        signatures = []
+        for index in range(padded // SIGNATURE):
+            path = os.path.join(out_dir, f"sig-{index + 1:02d}.pdf")
+            base = index * SIGNATURE
+            impose_signature(src, index, base, count, layout, caliper_pt, path)
+            signatures.append({
+                "signature": index + 1,
+                "file": os.path.basename(path),
+                "pages": [base + 1, base + SIGNATURE],
+                "blank": max(0, base + SIGNATURE - max(count, base)),
+                "front": [[base + n for n in row] for row in FRONT],
+                "back": [[base + n for n in row] for row in BACK],
+            })
+            print(f"  Created: {os.path.relpath(path, REPO_ROOT)}  "
+                  f"(pages {base + 1}–{base + SIGNATURE})")
+
+    manifest = {
+        "source": os.path.relpath(os.path.abspath(args.interior), REPO_ROOT),
+        "pages": count,
+        "padded_pages": padded,
+        "signature": SIGNATURE,
+        "sheet_in": [round(layout.sheet_w / 72, 3), round(layout.sheet_h / 72, 3)],
+        "trim_in": [round(layout.w / 72, 3), round(layout.h / 72, 3)],
+        "bleed_in": round(bleed / 72, 3),
+        "caliper_mm": args.caliper,
+        "creep_mm": {str(n): round(leaf_depth(n) * args.caliper, 3)
+                     for n in range(1, SIGNATURE + 1)},
+        "fold_order": ["middle (between columns 2 and 3)", "head (between rows)",
+                       "spine (between columns 1|2 and 3|4)"],
+        "signatures": signatures,
+    }
+    manifest_path = os.path.join(out_dir, "imposition.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"  Created: {os.path.relpath(manifest_path, REPO_ROOT)}")
+    print(f"\nDone! {len(signatures)} signatures in {time.perf_counter() - start:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
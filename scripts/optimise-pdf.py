@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+optimise-pdf.py
+
+Post-build size optimisation of the interior PDF, verified by rendering.
+
+  1. Font subsets: fonts embedded more than once as different subsets of the
+     same face (e.g. one per chapter shard or spliced-in page) are merged
+     into one subset holding the union of their glyphs (pdf_fonts.py, for
+     the CID-keyed CFF and TrueType fonts xdvipdfmx writes). Groups that
+     differ in anything else (font matrix, private dict, default width,
+     glyph count) are left alone.
+  2. Deduplication: identical streams (images, form XObjects, font files,
+     page content fragments), arrays (widths, descendant fonts) and identical
+     font, descriptor, graphics state, pattern, shading and resource
+     dictionaries are collapsed to one
+     object, repeated until nothing changes (merging one level can make its
+     parents identical).
+  3. Streams are recompressed (Flate, level 9) and packed into object
+     streams; unreferenced objects are dropped.
+  4. Every page of the result is rendered (PyMuPDF, VERIFY_DPI) and compared
+     with the original pixel for pixel. The original is replaced only if all pages
+     match; otherwise it is kept (copied to -o if given) with a warning, and
+     the build carries on with the unoptimised PDF (--strict exits non-zero).
+
+Run by build.sh / build.ps1 after typesetting. Requires pikepdf, fontTools
+and pymupdf (pip install pikepdf fonttools pymupdf).
+
+Standalone:
+  python scripts/optimise-pdf.py output/BookOfVerse-print.pdf              # in place
+  python scripts/optimise-pdf.py in.pdf -o out.pdf [--verify-dpi 300]
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf_fonts import merge_font_subsets, replace_refs
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+
+FLATE_LEVEL = 9
+VERIFY_DPI = 150        # fine enough to catch a substituted glyph
+VERIFY_CHUNK = 32         # pages per render job
+DEDUPE_ROUNDS = 8
+
+# Dictionaries safe to share by value; pages, annotations, outline items and
+# the like have identity (parents, links) and are never merged
+SHAREABLE_TYPES = {"/Font", "/FontDescriptor", "/ExtGState", "/Pattern", "/Shading"}
+UNSHAREABLE_STREAMS = {"/ObjStm", "/XRef"}
+
+
+# ---------------------------------------------------------------------------
+# Object deduplication
+# ---------------------------------------------------------------------------
+
+def _resource_dicts(pdf):
+    """objgens of indirect /Resources dictionaries (pages and form XObjects)."""
+    import pikepdf
+    found = set()
+    for obj in pdf.objects:
+        if isinstance(obj, (pikepdf.Dictionary, pikepdf.Stream)):
+            resources = obj.get("/Resources")
+            if resources is not None and resources.is_indirect:
+                found.add(resources.objgen)
+    return found
+
+
+def _canonical(obj, resources):
+    """Hashable value of a shareable object, or None if it has identity."""
+    import pikepdf
+    if isinstance(obj, pikepdf.Stream):
+        if obj.get("/Type") in UNSHAREABLE_STREAMS:
+            return None
+        head = pikepdf.Dictionary({k: v for k, v in obj.stream_dict.items() if k != "/Length"})
+        return b"S" + head.unparse() + hashlib.sha1(obj.read_raw_bytes()).digest()
+    if isinstance(obj, pikepdf.Dictionary):
+        if obj.get("/Type") in SHAREABLE_TYPES or obj.objgen in resources:
+            return b"D" + obj.unparse(resolved=True)
+    elif isinstance(obj, pikepdf.Array):
+        return b"A" + obj.unparse(resolved=True)    # arrays carry no back-references
+    return None
+
+
+def dedupe_objects(pdf):
+    """Collapse identical shareable objects; returns how many were merged."""
+    total = 0
+    for _ in range(DEDUPE_ROUNDS):
+        resources = _resource_dicts(pdf)
+        first = {}
+        remap = {}
+        for obj in pdf.objects:
+            key = _canonical(obj, resources)
+            if key is None:
+                continue
+            if key in first:
+                remap[obj.objgen] = first[key]
+            else:
+                first[key] = obj.objgen
+        if not remap:
+            break
+        replace_refs(pdf, remap)
+        total += len(remap)
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Verification
+# ---------------------------------------------------------------------------
+
+def _render_hashes(job):
+    """Worker: sha1 of each rendered page in [start, stop)."""
+    import pymupdf
+    path, start, stop, dpi = job
+    hashes = []
+    with pymupdf.open(path) as doc:
+        for i in range(start, stop):
+            pix = doc[i].get_pixmap(dpi=dpi, alpha=False)
+            hashes.append(hashlib.sha1(pix.samples).hexdigest())
+    return hashes
+
+
+def render_mismatches(original, optimised, dpi=VERIFY_DPI, workers=None):
+    """1-based page numbers that render differently (or a page-count mismatch)."""
+    import pymupdf
+    with pymupdf.open(original) as a, pymupdf.open(optimised) as b:
+        count = len(a)
+        if len(b) != count:
+            return list(range(min(count, len(b)) + 1, max(count, len(b)) + 1))
+    chunks = [(start, min(start + VERIFY_CHUNK, count))
+              for start in range(0, count, VERIFY_CHUNK)]
+    jobs = [(path, start, stop, dpi) for path in (original, optimised)
+            for start, stop in chunks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_render_hashes, jobs))
+    before = [h for r in results[:len(chunks)] for h in r]
+    after = [h for r in results[len(chunks):] for h in r]
+    return [i + 1 for i, (x, y) in enumerate(zip(before, after)) if x != y]
+
+
+# ---------------------------------------------------------------------------
+
+def optimise(src, dst):
+    """Write an optimised copy of src to dst; returns a stats dict."""
+    import pikepdf
+
+    pikepdf.settings.set_flate_compression_level(FLATE_LEVEL)
+    with pikepdf.open(src) as pdf:
+        merged = merge_font_subsets(pdf)
+        deduped = dedupe_objects(pdf)
+        pdf.remove_unreferenced_resources()
+        pdf.save(dst, compress_streams=True, recompress_flate=True,
+                 stream_decode_level=pikepdf.StreamDecodeLevel.generalized,
+                 object_stream_mode=pikepdf.ObjectStreamMode.generate)
+    return {"fonts_merged": merged, "objects_deduped": deduped}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicate, merge font subsets and "
+                                                 "recompress a PDF, verified by rendering.")
+    parser.add_argument("pdf", help="PDF to optimise")
+    parser.add_argument("-o", "--output", help="write here instead of replacing the input")
+    parser.add_argument("--verify-dpi", type=int, default=VERIFY_DPI,
+                        help=f"render resolution for the page-by-page check "
+                             f"(default: {VERIFY_DPI}; lower only for quick local runs)")
+    parser.add_argument("--no-verify", action="store_true", help="skip the render check")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="render processes (default: CPU count)")
+    parser.add_argument("--strict", action="store_true",
+                        help="exit non-zero if the render check fails")
+    args = parser.parse_args()
+
+    try:
+        import fontTools  # noqa: F401
+        import pikepdf  # noqa: F401
+        import pymupdf  # noqa: F401
+    except ImportError:
+        print("  [SKIP] PDF optimisation needs pikepdf, fonttools and pymupdf — "
+              "run: pip install pikepdf fonttools pymupdf")
+        return
+
+    if not os.path.exists(args.pdf):
+        print(f"Error: {args.pdf} not found")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    dst = args.output or args.pdf
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    size_before = os.path.getsize(args.pdf)
+    stats = optimise(args.pdf, tmp)
+    size_after = os.path.getsize(tmp)
+
+    for name, subsets in stats["fonts_merged"].items():
+        print(f"  Merged {subsets} subsets of {name}")
+    print(f"  Deduplicated {stats['objects_deduped']} objects")
+    print(f"  Size {size_before / 1024:.0f} KB -> {size_after / 1024:.0f} KB "
+          f"({100 * (size_after - size_before) / size_before:+.1f}%)")
+
+    if not args.no_verify:
+        mismatched = render_mismatches(args.pdf, tmp, args.verify_dpi, args.workers)
+        if mismatched:
+            os.remove(tmp)
+            if os.path.abspath(dst) != os.path.abspath(args.pdf):
+                shutil.copyfile(args.pdf, dst)
+            pages = ", ".join(str(p) for p in mismatched[:20])
+            print(f"  Warning: optimised PDF renders differently on pages {pages} — "
+                  f"keeping the unoptimised {os.path.relpath(os.path.abspath(dst), REPO_ROOT)}")
+            sys.exit(1 if args.strict else 0)
+        print(f"  Verified: all pages render identically at {args.verify_dpi} dpi")
+
+    os.replace(tmp, dst)
+    print(f"  Created: {os.path.relpath(os.path.abspath(dst), REPO_ROOT)}")
+    print(f"\nDone in {time.perf_counter() - start:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+pdf_fonts.py
+
+Merging of embedded font subsets, shared by optimise-pdf.py (every subset
+of a face in the interior merged into one) and personalise-interior.py
+(the dedication page's fonts merged into the base interior's).
+
+Handles the CID-keyed fonts xdvipdfmx writes: CFF (CIDFontType0, glyphs
+keyed by CID) and TrueType with an identity CIDToGIDMap. Glyph codes are
+the same in every subset of a face, so the union of the font programs
+serves every page that used any of them; widths (W), CIDSet and ToUnicode
+maps are merged too. Subsets that differ in anything else (font matrix,
+private dict, default width, glyph count) are left alone.
+
+Requires pikepdf and fontTools:
+    from pdf_fonts import font_key, merge_fonts, merge_font_subsets, replace_refs
+"""
+
+import hashlib
+import io
+import re
+from collections import defaultdict
+
+SUBSET_TAG = re.compile(r"^/?[A-Z]{6}\+")
+
+
+def font_key(font):
+    """Grouping key for Type0 fonts that are subsets of the same face, or None."""
+    if font.get("/Subtype") != "/Type0" or len(font.get("/DescendantFonts", [])) != 1:
+        return None
+    cid = font.DescendantFonts[0]
+    descriptor = cid.get("/FontDescriptor")
+    if descriptor is None:
+        return None
+    if cid.Subtype == "/CIDFontType0" and "/FontFile3" in descriptor:
+        kind = "cff"
+    elif (cid.Subtype == "/CIDFontType2" and "/FontFile2" in descriptor
+          and str(cid.get("/CIDToGIDMap", "/Identity")) == "/Identity"):
+        kind = "truetype"
+    else:
+        return None
+    return (SUBSET_TAG.sub("", str(font.BaseFont)), str(font.get("/Encoding")), kind,
+            str(cid.get("/DW", 1000)))
+
+
+def _parse_widths(array):
+    """CID -> width from a CIDFont /W array."""
+    widths = {}
+    items = list(array) if array is not None else []
+    i = 0
+    while i < len(items):
+        first = int(items[i])
+        if hasattr(items[i + 1], "__len__"):
+            for offset, w in enumerate(items[i + 1]):
+                widths[first + offset] = float(w)
+            i += 2
+        else:
+            for cid in range(first, int(items[i + 1]) + 1):
+                widths[cid] = float(items[i + 2])
+            i += 3
+    return widths
+
+
+def _format_widths(widths):
+    """Compact /W array: one [first [w w ...]] run per consecutive CID range."""
+    import pikepdf
+    out = []
+    run = []
+    for cid in sorted(widths):
+        if run and cid != run[0] + len(run[1]):
+            out += [run[0], pikepdf.Array(run[1])]
+            run = []
+        if not run:
+            run = [cid, []]
+        w = widths[cid]
+        run[1].append(int(w) if w == int(w) else w)
+    if run:
+        out += [run[0], pikepdf.Array(run[1])]
+    return pikepdf.Array(out)
+
+
+def _parse_tounicode(data):
+    """Code (hex string) -> Unicode (hex string) from a ToUnicode CMap."""
+    text = data.decode("latin-1")
+    mapping = {}
+    for block in re.findall(r"beginbfchar(.*?)endbfchar", text, re.S):
+        for src, dst in re.findall(r"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>", block):
+            mapping[src.upper()] = dst.upper()
+    for block in re.findall(r"beginbfrange(.*?)endbfrange", text, re.S):
+        for lo, hi, dst in re.findall(
+                r"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*(<[0-9A-Fa-f]+>|\[[^\]]*\])", block):
+            width = len(lo)
+            targets = re.findall(r"<([0-9A-Fa-f]+)>", dst)
+            for offset, code in enumerate(range(int(lo, 16), int(hi, 16) + 1)):
+                if dst.startswith("["):
+                    value = targets[offset].upper()
+                else:
+                    base = targets[0]
+                    value = f"{int(base, 16) + offset:0{len(base)}X}"
+                mapping[f"{code:0{width}X}"] = value
+    return mapping
+
+
+def _format_tounicode(mapping):
+    """A minimal Identity-H ToUnicode CMap for mapping."""
+    lines = ["/CIDInit /ProcSet findresource begin", "12 dict begin", "begincmap",
+             "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+             "/CMapName /Adobe-Identity-UCS def", "/CMapType 2 def",
+             "1 begincodespacerange", "<0000> <FFFF>", "endcodespacerange"]
+    items = sorted(mapping.items())
+    for start in range(0, len(items), 100):
+        chunk = items[start:start + 100]
+        lines.append(f"{len(chunk)} beginbfchar")
+        lines += [f"<{src}> <{dst}>" for src, dst in chunk]
+        lines.append("endbfchar")
+    lines += ["endcmap", "CMapName currentdict /CMap defineresource pop", "end", "end"]
+    return "\n".join(lines).encode("latin-1")
+
+
+def _merge_cidset(streams):
+    """Bitwise OR of CIDSet bitmaps."""
+    data = [s.read_bytes() for s in streams]
+    merged = bytearray(max(len(d) for d in data))
+    for d in data:
+        for i, byte in enumerate(d):
+            merged[i] |= byte
+    return bytes(merged)
+
+
+def _merge_cff(datas):
+    """Union of CID-keyed CFF subsets (glyphs keyed by CID); None if incompatible."""
+    from fontTools.cffLib import CFFFontSet, CharStrings, FDSelect
+    from fontTools.ttLib import TTFont
+
+    fonts = []
+    for data in datas:
+        cff = CFFFontSet()
+        cff.decompile(io.BytesIO(data), None)
+        cff.desubroutinize()
+        fonts.append(cff)
+    base = fonts[0]
+    top = base.topDictIndex[0]
+    if not hasattr(top, "ROS"):
+        return None
+    privates = [fd.Private.rawDict for fd in top.FDArray]
+    for cff in fonts[1:]:
+        other = cff.topDictIndex[0]
+        if (getattr(other, "ROS", None) != top.ROS or other.FontMatrix != top.FontMatrix
+                or [fd.Private.rawDict for fd in other.FDArray] != privates):
+            return None
+
+    glyphs = {}          # glyph name -> (charstring, FD index)
+    for cff in fonts:
+        other = cff.topDictIndex[0]
+        for gid, name in enumerate(other.charset):
+            if name not in glyphs:
+                glyphs[name] = (other.CharStrings[name], other.FDSelect[gid])
+
+    def cid(name):
+        return 0 if name == ".notdef" else int(name[3:])
+
+    names = sorted(glyphs, key=cid)
+    select = FDSelect()
+    select.format = 3
+    select.gidArray = [glyphs[name][1] for name in names]
+    charstrings = CharStrings(None, names, base.GlobalSubrs, None, select, top.FDArray)
+    for name in names:
+        charstring, fd = glyphs[name]
+        charstring.private = top.FDArray[fd].Private
+        charstring.globalSubrs = base.GlobalSubrs
+        charstrings[name] = charstring
+    top.charset = names
+    top.CharStrings = charstrings
+    top.FDSelect = select
+    top.CIDCount = max(getattr(top, "CIDCount", 0), cid(names[-1]) + 1)
+    out = io.BytesIO()
+    base.compile(out, TTFont(recalcBBoxes=False))
+    return out.getvalue()
+
+
+def _merge_truetype(datas):
+    """Union of glyph-id-preserving TrueType subsets; None if incompatible."""
+    from fontTools.ttLib import TTFont
+
+    fonts = [TTFont(io.BytesIO(data)) for data in datas]
+    base = fonts[0]
+    order = base.getGlyphOrder()
+    if any(f.getGlyphOrder() != order or "glyf" not in f for f in fonts):
+        return None
+    glyf, hmtx = base["glyf"], base["hmtx"]
+    for other in fonts[1:]:
+        for name in order:
+            ours, theirs = glyf[name], other["glyf"][name]
+            if ours.numberOfContours == 0 and theirs.numberOfContours != 0:
+                glyf[name] = theirs
+                hmtx[name] = other["hmtx"][name]
+    out = io.BytesIO()
+    base.save(out)
+    return out.getvalue()
+
+
+def merge_fonts(pdf, fonts):
+    """Merge Type0 subsets of one face (equal font_key) into fonts[0].
+
+    fonts[0] gets the union of their glyphs, widths, CIDSet and ToUnicode;
+    pointing references to the others at it is left to the caller. Returns
+    how many distinct font programs there were (1: nothing to merge), or 0
+    if they could not be merged.
+    """
+    import pikepdf
+
+    kind = font_key(fonts[0])[2]
+    files = {}
+    for font in fonts:
+        descriptor = font.DescendantFonts[0].FontDescriptor
+        stream = descriptor.FontFile3 if kind == "cff" else descriptor.FontFile2
+        files.setdefault(hashlib.sha1(stream.read_raw_bytes()).digest(), stream)
+    if len(files) < 2:
+        return len(files)
+    datas = [s.read_bytes() for s in files.values()]
+    data = _merge_cff(datas) if kind == "cff" else _merge_truetype(datas)
+    if data is None:
+        return 0
+
+    keep = fonts[0]
+    cid = keep.DescendantFonts[0]
+    descriptor = cid.FontDescriptor
+    stream = pikepdf.Stream(pdf, data)
+    if kind == "cff":
+        stream.Subtype = pikepdf.Name.CIDFontType0C
+        descriptor.FontFile3 = pdf.make_indirect(stream)
+    else:
+        stream.Length1 = len(data)
+        descriptor.FontFile2 = pdf.make_indirect(stream)
+
+    widths = {}
+    for font in fonts:
+        widths.update(_parse_widths(font.DescendantFonts[0].get("/W")))
+    cid.W = pdf.make_indirect(_format_widths(widths))
+    cidsets = [f.DescendantFonts[0].FontDescriptor.get("/CIDSet") for f in fonts]
+    if all(s is not None for s in cidsets):
+        descriptor.CIDSet = pdf.make_indirect(pikepdf.Stream(pdf, _merge_cidset(cidsets)))
+    elif "/CIDSet" in descriptor:
+        del descriptor.CIDSet
+    if any("/ToUnicode" in f for f in fonts):
+        mapping = {}
+        for font in fonts:
+            if "/ToUnicode" in font:
+                mapping.update(_parse_tounicode(font.ToUnicode.read_bytes()))
+        keep.ToUnicode = pdf.make_indirect(pikepdf.Stream(pdf, _format_tounicode(mapping)))
+    return len(files)
+
+
+def merge_font_subsets(pdf):
+    """Merge subsets of the same font; returns {merged font name: subsets}."""
+    import pikepdf
+
+    groups = defaultdict(list)
+    for obj in pdf.objects:
+        if isinstance(obj, pikepdf.Dictionary) and obj.get("/Type") == "/Font":
+            key = font_key(obj)
+            if key:
+                groups[key].append(obj)
+
+    merged = {}
+    remap = {}
+    for (name, _, _, _), fonts in groups.items():
+        subsets = merge_fonts(pdf, fonts)
+        if subsets < 2:
+            continue      # identical copies are left to dedupe_objects
+        for font in fonts[1:]:
+            remap[font.objgen] = fonts[0].objgen
+        merged[name.lstrip("/")] = subsets
+    if remap:
+        replace_refs(pdf, remap)
+    return merged
+
+
+def replace_refs(pdf, remap):
+    """Point every reference to a key of remap (objgen -> objgen) at its value."""
+    import pikepdf
+
+    def fix(container):
+        if isinstance(container, pikepdf.Array):
+            items = enumerate(list(container))
+        else:
+            items = list(container.items())
+        for key, value in items:
+            if not isinstance(value, pikepdf.Object):
+                continue
+            if value.is_indirect:
+                if value.objgen in remap:
+                    container[key] = pdf.get_object(remap[value.objgen])
+            elif isinstance(value, (pikepdf.Dictionary, pikepdf.Array)):
+                fix(value)
+
+    for obj in pdf.objects:
+        if isinstance(obj, pikepdf.Stream):
+            fix(obj.stream_dict)
+        elif isinstance(obj, (pikepdf.Dictionary, pikepdf.Array)):
+            fix(obj)
+    fix(pdf.trailer)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+personalise-interior.py
+
+Produces one personalised interior PDF per Team Edition recipient without
+recompiling the book. The base interior must be built with a reserved
+dedication page (build.sh --personalise / build.ps1 -Personalise, which pass
+pandoc -V dedication-page=true).
+
+Steps:
+  1. Compile every recipient's one-page dedication in a single xelatex run,
+     using the preamble of the same template as the base build, so page
+     size, fonts and colours match exactly.
+  2. For each recipient, copy the base interior and swap the content of the
+     reserved page for that recipient's dedication. Everything else in the
+     base (fonts, images, outlines, links) is carried over by reference.
+     The dedication's fonts are merged into the base's embedded subsets of
+     the same faces (pdf_fonts.py), so the page uses the base's font
+     objects and a copy only adds the glyphs of the name it lacked.
+  3. Copies are written in parallel to output/personalised/.
+
+Requires pikepdf and fontTools (pip install pikepdf fonttools) and xelatex.
+
+Run from repo root:
+  python scripts/personalise-interior.py recipients.txt
+  python scripts/personalise-interior.py recipients.txt --print-ready
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf_fonts import font_key, merge_fonts
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+TEMPLATE_DIR = os.path.join(REPO_ROOT, "templates")
+BUILD_DIR = os.path.join(REPO_ROOT, "build", "personalise")
+OUTPUT_DIR = os.path.join(REPO_ROOT, "output", "personalised")
+
+# Named destination placed on the reserved page by the templates
+DEDICATION_DEST = "personal-dedication"
+
+# The dedication page itself. Uses the template's fonts and colours.
+DEDICATION_MACRO = r"""
+\newcommand{\dedicationpage}[1]{%
+    \thispagestyle{empty}%
+    \vspace*{2.5in}%
+    \begin{center}
+    {\large\itshape This copy of}\\[0.75em]
+    {\LARGE\sffamily\bfseries\color{versegray} Book of Verse}\\[0.75em]
+    {\large\itshape is presented to}\\[2.5em]
+    {\Huge\sffamily\bfseries #1}\\[2.5em]
+    {\normalsize with thanks from the Verse Team}
+    \end{center}
+    \clearpage
+}
+"""
+
+LATEX_SPECIALS = {
+    '\\': r'\textbackslash{}', '&': r'\&', '%': r'\%', '$': r'\$',
+    '#': r'\#', '_': r'\_', '{': r'\{', '}': r'\}',
+    '~': r'\textasciitilde{}', '^': r'\textasciicircum{}',
+}
+
+
+def read_recipients(path):
+    """Read recipient names, one per line; blank lines and #comments skipped."""
+    names = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                names.append(line)
+    return names
+
+
+def latex_escape(text):
+    """Escape LaTeX special characters in a recipient name."""
+    return "".join(LATEX_SPECIALS.get(ch, ch) for ch in text)
+
+
+def template_preamble(template_path):
+    """Return the template preamble with Pandoc template directives removed."""
+    with open(template_path, encoding="utf-8") as f:
+        text = f.read()
+    preamble = text.split("\\begin{document}", 1)[0]
+    # Drop $if(...)$ ... $endif$ blocks and any remaining $variables$
+    preamble = re.sub(r"\$if\(.*?\)\$.*?\$endif\$", "", preamble, flags=re.DOTALL)
+    preamble = re.sub(r"\$[a-z-]+\$", "", preamble)
+    return preamble
+
+
+def compile_dedications(names, template_path):
+    """Compile all dedication pages into one PDF, one page per recipient."""
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    tex_path = os.path.join(BUILD_DIR, "dedications.tex")
+    body = "\n".join(f"\\dedicationpage{{{latex_escape(n)}}}" for n in names)
+    with open(tex_path, "w", encoding="utf-8") as f:
+        f.write(template_preamble(template_path))
+        f.write(DEDICATION_MACRO)
+        f.write("\\begin{document}\n")
+        f.write(body)
+        f.write("\n\\end{document}\n")
+
+    result = subprocess.run(
+        ["xelatex", "-interaction=nonstopmode", "-halt-on-error",
+         "-output-directory", BUILD_DIR, tex_path],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        encoding="utf-8", errors="replace",
+    )
+    pdf_path = os.path.join(BUILD_DIR, "dedications.pdf")
+    if result.returncode != 0 or not os.path.exists(pdf_path):
+        print(result.stdout[-2000:])
+        print(f"Error: xelatex failed — see {BUILD_DIR}/dedications.log")
+        sys.exit(1)
+    return pdf_path
+
+
+def find_dedication_page(pdf):
+    """Return the 0-based index of the reserved dedication page, or None."""
+    import pikepdf
+
+    # Named destinations live in the /Names tree (PDF 1.2+) or the older
+    # /Dests dictionary; a file can have either or both
+    dest = None
+    root = pdf.Root
+    if "/Names" in root and "/Dests" in root.Names:
+        tree = pikepdf.NameTree(root.Names.Dests)
+        if DEDICATION_DEST in tree:
+            dest = tree[DEDICATION_DEST]
+    if dest is None and "/Dests" in root and f"/{DEDICATION_DEST}" in root.Dests:
+        dest = root.Dests[f"/{DEDICATION_DEST}"]
+    if dest is None:
+        return None
+    if isinstance(dest, pikepdf.Dictionary):
+        dest = dest.D
+    target = dest[0].objgen
+    for i, page in enumerate(pdf.pages):
+        if page.obj.objgen == target:
+            return i
+    return None
+
+
+def base_fonts(pdf):
+    """font_key -> objgen of the first embedded subset of each face in pdf."""
+    import pikepdf
+    fonts = {}
+    for obj in pdf.objects:
+        if isinstance(obj, pikepdf.Dictionary) and obj.get("/Type") == "/Font":
+            key = font_key(obj)
+            if key:
+                fonts.setdefault(key, obj.objgen)
+    return fonts
+
+
+def share_fonts(pdf, resources, fonts):
+    """Point a spliced page's fonts at the base's subsets of the same faces.
+
+    fonts is base_fonts() of the base interior. Each base subset is merged
+    with the page's so it also holds the glyphs of the name; fonts with no
+    counterpart in the base, or that cannot be merged, stay the page's own.
+    Returns how many were shared.
+    """
+    page_fonts = resources.get("/Font") or {}
+    shared = 0
+    for name, font in list(page_fonts.items()):
+        key = font_key(font)
+        if key not in fonts:
+            continue
+        base = pdf.get_object(fonts[key])
+        if merge_fonts(pdf, [base, font]):
+            page_fonts[name] = base
+            shared += 1
+    return shared
+
+
+def _write_copy(job):
+    """Worker: write one personalised interior; returns (path, fonts shared)."""
+    import pikepdf
+
+    base_path, dedications_path, page_index, copy_index, fonts, out_path = job
+    with pikepdf.open(base_path) as pdf, pikepdf.open(dedications_path) as ded:
+        # Import the dedication page, then move its content and resources onto
+        # the reserved page so existing links and outline entries stay valid.
+        pdf.pages.append(ded.pages[copy_index])
+        imported = pdf.pages[-1].obj
+        reserved = pdf.pages[page_index].obj
+        reserved.Contents = imported.Contents
+        reserved.Resources = imported.Resources
+        del pdf.pages[-1]
+        shared = share_fonts(pdf, reserved.Resources, fonts)
+        pdf.save(out_path)
+    return out_path, shared
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write one personalised interior PDF per recipient.")
+    parser.add_argument("names", help="recipient list, one name per line")
+    parser.add_argument("--print-ready", action="store_true",
+                        help="use the print-ready template and interior")
+    parser.add_argument("--base", help="base interior PDF (default: from the build)")
+    parser.add_argument("--page", type=int,
+                        help="1-based reserved page number (default: find the "
+                             f"'{DEDICATION_DEST}' destination)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    try:
+        import fontTools  # noqa: F401
+        import pikepdf
+    except ImportError:
+        print("Error: pikepdf and fontTools are required — run: pip install pikepdf fonttools")
+        sys.exit(1)
+
+    if args.print_ready:
+        template = os.path.join(TEMPLATE_DIR, "print-ready.tex")
+        base = args.base or os.path.join(REPO_ROOT, "output", "BookOfVerse-print.pdf")
+    else:
+        template = os.path.join(TEMPLATE_DIR, "pandoc-template.tex")
+        base = args.base or os.path.join(REPO_ROOT, "output", "BookOfVerse.pdf")
+
+    if not os.path.exists(base):
+        print(f"Error: base interior {base} not found")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    names = read_recipients(args.names)
+    print(f"Personalising {len(names)} copies of {base}\n")
+
+    with pikepdf.open(base) as pdf:
+        page_index = args.page - 1 if args.page else find_dedication_page(pdf)
+        fonts = base_fonts(pdf)
+    if page_index is None:
+        print(f"Error: no reserved dedication page in {base}.")
+        print("Rebuild with build.sh --personalise (pandoc -V dedication-page=true).")
+        sys.exit(1)
+    print(f"  Reserved page: {page_index + 1}")
+
+    dedications = compile_dedications(names, template)
+    print(f"  Compiled {len(names)} dedication pages: {dedications}")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(base))[0]
+    jobs = [
+        (base, dedications, page_index, i, fonts,
+         os.path.join(OUTPUT_DIR, f"{stem}-{i + 1:03d}.pdf"))
+        for i in range(len(names))
+    ]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for out_path, shared in pool.map(_write_copy, jobs):
+            print(f"  Created: {os.path.relpath(out_path, REPO_ROOT)} "
+                  f"({shared} fonts shared with the base)")
+
+    print(f"\nDone! {len(names)} interiors in {time.perf_counter() - start:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
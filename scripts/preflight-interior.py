@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+preflight-interior.py
+
+Structural preflight of the interior PDF before it goes to the printer,
+without rendering anything. Checks, page by page:
+  - fonts:      every font used is embedded (FontFile/FontFile2/FontFile3,
+                descendant fonts of Type0, Type3 glyph procedures)
+  - page boxes: MediaBox is PAGE_SIZE_IN (7.25" × 10.25": 7" × 10" trim plus
+                bleed) and TrimBox, if present, is TRIM_SIZE_IN
+  - signatures: the page count fills whole SIGNATURE-page signatures
+  - colour:     no RGB link borders and no non-neutral colour in the page
+                content (the interior is black ink only); grey RGB is fine
+
+The file is opened memory-mapped with pikepdf; objects are resolved lazily
+as each page's resources and content are visited, and shared fonts and form
+XObjects are checked once, so a 500-page book takes a few seconds.
+
+Writes a JSON report (default output/preflight/interior-preflight.json) and
+exits non-zero if any check fails.
+
+Requires pikepdf (pip install pikepdf).
+
+Run from repo root:
+  python scripts/preflight-interior.py                     # print-bundle-*/interior.pdf
+  python scripts/preflight-interior.py output/BookOfVerse-print.pdf --report -
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+REPORT_PATH = os.path.join(REPO_ROOT, "output", "preflight", "interior-preflight.json")
+
+PAGE_SIZE_IN = (7.25, 10.25)   # MediaBox: 7" × 10" trim + 0.125" bleed each side
+TRIM_SIZE_IN = (7.0, 10.0)
+SIZE_TOLERANCE_PT = 0.5
+SIGNATURE = 16                 # pages per signature (Smyth-sewn)
+NEUTRAL_TOLERANCE = 0.01       # RGB components this close count as grey
+
+COLOR_OPERATORS = {"rg", "RG", "k", "K", "sc", "SC", "scn", "SCN"}
+FONT_FILES = ("/FontFile", "/FontFile2", "/FontFile3")
+
+
+def box_size(box):
+    """(width, height) in points of a PDF rectangle."""
+    x0, y0, x1, y1 = (float(v) for v in box)
+    return abs(x1 - x0), abs(y1 - y0)
+
+
+def size_matches(size, inches):
+    return all(abs(a - b * 72) <= SIZE_TOLERANCE_PT for a, b in zip(size, inches))
+
+
+def font_embedded(font):
+    """True if a font dictionary carries its glyph data."""
+    subtype = str(font.get("/Subtype", ""))
+    if subtype == "/Type3":
+        return True
+    if subtype == "/Type0":
+        return all(font_embedded(d) for d in font.get("/DescendantFonts", []))
+    descriptor = font.get("/FontDescriptor")
+    return descriptor is not None and any(k in descriptor for k in FONT_FILES)
+
+
+def is_neutral(operands):
+    """True for greys and pure black: equal RGB, or CMYK with no C, M or Y."""
+    values = [float(v) for v in operands if not hasattr(v, "startswith")]
+    if len(values) == 3:
+        return max(values) - min(values) <= NEUTRAL_TOLERANCE
+    if len(values) == 4:
+        return max(values[:3]) <= NEUTRAL_TOLERANCE
+    return True
+
+
+class InteriorChecker:
+    """Walks pages and their resources once, caching shared objects."""
+
+    def __init__(self):
+        self.fonts = {}     # _key -> (name, embedded)
+        self.colours = {}   # _key of content/XObject -> set of colours
+
+    def _key(self, obj):
+        """objgen of an indirect object; a direct one by its serialised form.
+
+        pikepdf wrappers are transient, so id() of a direct object can be
+        reused by the next one and cannot identify it.
+        """
+        return obj.objgen if obj.is_indirect else obj.unparse()
+
+    def page_fonts(self, resources, seen=None):
+        """(name, embedded) for every font reachable from resources."""
+        seen = seen if seen is not None else set()
+        found = []
+        if resources is None or self._key(resources) in seen:
+            return found
+        seen.add(self._key(resources))
+        for font in (resources.get("/Font") or {}).values():
+            key = self._key(font)
+            if key not in self.fonts:
+                self.fonts[key] = (str(font.get("/BaseFont", font.get("/Name", "?")))
+                                   .lstrip("/"), font_embedded(font))
+                if str(font.get("/Subtype", "")) == "/Type3":
+                    found += self.page_fonts(font.get("/Resources"), seen)
+            found.append(self.fonts[key])
+        for xobject in (resources.get("/XObject") or {}).values():
+            if str(xobject.get("/Subtype", "")) == "/Form":
+                found += self.page_fonts(xobject.get("/Resources"), seen)
+        return found
+
+    def content_colours(self, owner, resources):
+        """Non-neutral colours set in a page's or form's content streams."""
+        import pikepdf
+        key = self._key(owner)
+        if key in self.colours:
+            return self.colours[key]
+        colours = set()
+        self.colours[key] = colours   # guards against self-referencing forms
+        for operands, operator in pikepdf.parse_content_stream(owner):
+            if str(operator) in COLOR_OPERATORS and not is_neutral(operands):
+                colours.add(" ".join(f"{float(v):g}" for v in operands
+                                     if not hasattr(v, "startswith")) + " " + str(operator))
+        for xobject in ((resources or {}).get("/XObject") or {}).values():
+            if str(xobject.get("/Subtype", "")) == "/Form":
+                colours |= self.content_colours(xobject, xobject.get("/Resources"))
+        return colours
+
+    def check_page(self, page):
+        """Problems found on one page (list of strings)."""
+        problems = []
+        media = box_size(page.mediabox)
+        if not size_matches(media, PAGE_SIZE_IN):
+            problems.append(f"MediaBox {media[0] / 72:.3f}\"×{media[1] / 72:.3f}\"")
+        trim = page.obj.get("/TrimBox")
+        if trim is not None and not size_matches(box_size(trim), TRIM_SIZE_IN):
+            size = box_size(trim)
+            problems.append(f"TrimBox {size[0] / 72:.3f}\"×{size[1] / 72:.3f}\"")
+
+        resources = page.obj.get("/Resources")
+        for name, embedded in self.page_fonts(resources):
+            if not embedded:
+                problems.append(f"font not embedded: {name}")
+
+        for annot in page.obj.get("/Annots") or []:
+            if str(annot.get("/Subtype", "")) != "/Link":
+                continue
+            colour = annot.get("/C")
+            border = annot.get("/Border")
+            width = float(border[2]) if border is not None and len(border) > 2 else 1.0
+            if "/BS" in annot:
+                width = float(annot.BS.get("/W", width))
+            if colour is not None and len(colour) == 3 and width > 0 and not is_neutral(colour):
+                problems.append("RGB link border " + " ".join(f"{float(v):g}" for v in colour))
+
+        for colour in sorted(self.content_colours(page.obj, resources)):
+            problems.append(f"colour {colour}")
+        return problems
+
+
+def preflight(path):
+    """Check one interior PDF; returns the report dict."""
+    import pikepdf
+
+    start = time.perf_counter()
+    with pikepdf.open(path, access_mode=pikepdf.AccessMode.mmap) as pdf:
+        checker = InteriorChecker()
+        pages = {}
+        for number, page in enumerate(pdf.pages, 1):
+            problems = checker.check_page(page)
+            if problems:
+                pages[number] = problems
+        count = len(pdf.pages)
+        fonts = sorted({name for name, _ in checker.fonts.values()})
+        unembedded = sorted({name for name, ok in checker.fonts.values() if not ok})
+
+    def pages_with(prefix):
+        return [n for n, problems in pages.items() if any(p.startswith(prefix) for p in problems)]
+
+    blanks = -count % SIGNATURE
+    checks = {
+        "fonts": {"ok": not unembedded, "fonts": fonts, "not_embedded": unembedded},
+        "page_boxes": {"ok": not pages_with("MediaBox") and not pages_with("TrimBox"),
+                       "expected_in": list(PAGE_SIZE_IN), "trim_in": list(TRIM_SIZE_IN),
+                       "pages": sorted(set(pages_with("MediaBox") + pages_with("TrimBox")))},
+        "signatures": {"ok": blanks == 0, "pages": count, "signature": SIGNATURE,
+                       "signatures": count // SIGNATURE, "blank_pages_needed": blanks},
+        "link_colours": {"ok": not pages_with("RGB link"), "pages": pages_with("RGB link")},
+        "colour": {"ok": not pages_with("colour"), "pages": pages_with("colour"),
+                   "colours": sorted({p[len("colour "):] for problems in pages.values()
+                                      for p in problems if p.startswith("colour ")})},
+    }
+    return {
+        "file": os.path.relpath(os.path.abspath(path), REPO_ROOT),
+        "ok": all(c["ok"] for c in checks.values()),
+        "seconds": round(time.perf_counter() - start, 2),
+        "checks": checks,
+        "pages": {str(n): problems for n, problems in pages.items()},
+    }
+
+
+def _page_list(numbers, limit=12):
+    text = ", ".join(str(n) for n in numbers[:limit])
+    return text + (f" … (+{len(numbers) - limit})" if len(numbers) > limit else "")
+
+
+def print_report(report):
+    checks = report["checks"]
+    print(f"  {report['file']} ({checks['signatures']['pages']} pages, "
+          f"{report['seconds']}s)")
+
+    fonts = checks["fonts"]
+    print(f"    Fonts embedded   {'PASS' if fonts['ok'] else 'FAIL'}  "
+          f"{len(fonts['fonts'])} fonts"
+          + (f"; not embedded: {', '.join(fonts['not_embedded'])}" if not fonts["ok"] else ""))
+    boxes = checks["page_boxes"]
+    w, h = PAGE_SIZE_IN
+    print(f"    Page boxes       {'PASS' if boxes['ok'] else 'FAIL'}  {w}\"×{h}\""
+          + (f"; wrong on pages {_page_list(boxes['pages'])}" if not boxes["ok"] else ""))
+    sig = checks["signatures"]
+    print(f"    Signatures       {'PASS' if sig['ok'] else 'FAIL'}  "
+          f"{sig['signatures']} × {SIGNATURE}"
+          + (f" + {sig['pages'] % SIGNATURE}; add {sig['blank_pages_needed']} blank pages"
+             if not sig["ok"] else ""))
+    links = checks["link_colours"]
+    print(f"    Link colours     {'PASS' if links['ok'] else 'FAIL'}"
+          + (f"  RGB link borders on pages {_page_list(links['pages'])}"
+             if not links["ok"] else ""))
+    colour = checks["colour"]
+    print(f"    Black ink only   {'PASS' if colour['ok'] else 'FAIL'}"
+          + (f"  {len(colour['colours'])} colours on pages {_page_list(colour['pages'])}"
+             if not colour["ok"] else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Structural preflight of interior PDFs.")
+    parser.add_argument("files", nargs="*",
+                        help="interior PDFs (default: print-bundle-*/interior.pdf)")
+    parser.add_argument("--report", default=REPORT_PATH,
+                        help="JSON report path, or - for stdout "
+                             f"(default: {os.path.relpath(REPORT_PATH, REPO_ROOT)})")
+    args = parser.parse_args()
+
+    try:
+        import pikepdf  # noqa: F401
+    except ImportError:
+        print("Error: pikepdf is required — run: pip install pikepdf")
+        sys.exit(1)
+
+    files = args.files or sorted(glob.glob(os.path.join(REPO_ROOT, "print-bundle-*",
+                                                        "interior.pdf")))
+    if not files:
+        print("No interior PDFs found.")
+        sys.exit(1)
+
+    reports = [preflight(path) for path in files]
+    if args.report == "-":
+        json.dump(reports, sys.stdout, indent=2)
+        print()
+    else:
+        print("Preflighting interior PDFs...\n")
+        for report in reports:
+            print_report(report)
+            print()
+        os.makedirs(os.path.dirname(args.report), exist_ok=True)
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+        print(f"  Created: {os.path.relpath(args.report, REPO_ROOT)}")
+    sys.exit(0 if all(r["ok"] for r in reports) else 1)
+
+
+if __name__ == "__main__":
+    main()
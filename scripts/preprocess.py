@@ -7,13 +7,27 @@ Handles:
 - Cross-reference link conversion
 - Code block cleanup (remove versetest comments)
 - Chapter numbering and ordering
+
+Alongside the output file it writes a source map (<output>.map.json) giving
+the combined-file line range of every chapter and the docs file it came
+from, so LaTeX warnings can be traced back to the original source.
+
+The Concept Index chapter is generated in the same pass from the terms the
+chapters define (see ConceptIndex); --manual-index uses the hand-written
+concept_index.md instead.
+
+Usage: preprocess.py <docs_directory> [output_file] [--manual-index]
 """
 
+import argparse
+import json
 import re
 import sys
 from pathlib import Path
 from typing import List, Tuple
 
+from build_trace import span
+
 # Chapter order and titles
 CHAPTERS = [
     ("index.md", "Preface", False),  # Not numbered
@@ -264,6 +278,296 @@ def convert_links_to_pagerefs(content: str) -> str:
     return re.sub(r'\[([^\]]+)\]\(#([a-z0-9_-]+)\)', replace_with_pageref, content)
 
 
+# Generated Concept Index (see ConceptIndex)
+INDEX_FILE = 'concept_index.md'
+INDEX_MAX_LOCATIONS = 6        # page references listed per term
+INDEX_MAX_WORDS = 5            # longer headings/bold phrases are sentences, not terms
+INDEX_SKIP_TERMS = {
+    'overview', 'introduction', 'summary', 'example', 'examples', 'syntax',
+    'usage', 'basic usage', 'common pattern', 'common patterns', 'best practice',
+    'best practices', 'limitation', 'limitations', 'note', 'notes', 'see also',
+    'key point', 'key points', 'conclusion', 'getting started', 'important',
+    'warning', 'tip', 'info', 'danger', 'why', 'output', 'result', 'results',
+}
+# Bold words that are emphasis, never a term being defined
+INDEX_STOP_WORDS = frozenset("""
+    a all also always an and any are as at be both but by can cannot different do
+    does each every exactly first for from has have if in into is it its just last
+    may might more most must never no none not of on one only or same should so
+    some than that the their then there these this three to two very was were
+    when which while will with without you your
+""".split())
+
+INDEX_FENCE_RE = re.compile(r'^(\s*)(`{3,}|~{3,})')
+INDEX_HEADING_RE = re.compile(r'^(#{2,3})\s+(.+?)\s*(\{[^}]*\})?\s*$')
+INDEX_BOLD_RE = re.compile(r'\*\*([^*\n]+?)\*\*')
+# Bold spans separated only by spaces: one emphasised phrase, not a term
+INDEX_BOLD_RUN_RE = re.compile(r'\*\*[^*\n]+?\*\*(?:[ \t]+\*\*[^*\n]+?\*\*)+')
+INDEX_INLINE_CODE_RE = re.compile(r'`([^`\n]+)`')
+INDEX_RAW_LATEX_RE = re.compile(r'`[^`\n]*`\{=latex\}')
+INDEX_SPECIFIER_RE = re.compile(r'<([a-z_]+)>')
+INDEX_TYPE_DEF_RE = re.compile(
+    r'\b([A-Za-z_]\w*)(?:<[a-z_]+>)*\s*:=\s*(?:class|struct|interface|enum|module)\b')
+INDEX_CALL_RE = re.compile(r'\b([A-Z]\w*)(?:<[a-z_]+>)*\(')
+INDEX_PROSE_START_RE = re.compile(r'^[\w*_`"\'(\[]')
+INDEX_LIST_ITEM_RE = re.compile(r'^(\s*(?:[-*+]|\d+\.)\s+)')
+
+
+def index_key(term: str) -> str:
+    """Normalise a term so headings, bold text and code spellings merge.
+
+    Case, formatting and call parentheses are ignored: "Array", "**array**"
+    and `array()` share one key. Plurals are merged later, by
+    singular_keys(), and only into a singular the chapters also use.
+    """
+    key = re.sub(r'\(.*\)$', '', term.replace('`', '').replace('*', '')).lower()
+    key = re.sub(r'[^\w<>\s-]', '', key).strip()
+    return re.sub(r'\s+', ' ', key)
+
+
+def singular_keys(key: str) -> List[str]:
+    """Keys a plural key could be the plural of, most specific first.
+
+    "arrays" -> "array"; "classes" -> "class", "classe"; "entries" ->
+    "entry", ... These are only candidates ("alias" gives "alia"), so a
+    plural is merged only into a key that already exists.
+    """
+    candidates = []
+    if key.endswith('ies'):
+        candidates.append(key[:-3] + 'y')
+    if key.endswith('es'):
+        candidates.append(key[:-2])
+    if key.endswith('s') and not key.endswith('ss'):
+        candidates.append(key[:-1])
+    return candidates
+
+
+class ConceptIndex:
+    """Inverted index of defined terms, built as the chapters stream past.
+
+    scan() is applied to every chapter in turn, in the same single pass that
+    combines them: it records the terms each chapter defines — ## and ###
+    headings, the first **bold** use of a term, and from Verse code blocks
+    the specifiers (<decides>), the types defined (name := class) and the
+    functions called or defined (Name()) — and marks the first use of each term per chapter with
+    a raw LaTeX \\label{idx-N}. render() then writes the Concept Index chapter
+    with a \\pageref to each label, so the index follows the text on every
+    build instead of going stale like the hand-written concept_index.md.
+
+    Code identifiers are only indexed when the prose also mentions them as
+    inline code, which keeps example names (Foo, MyFunction) out. Bold is
+    read as a definition only where it looks like one: not stop words
+    (INDEX_STOP_WORDS), not a run of bold words, and not a term already
+    indexed, so later bold uses of a term are emphasis.
+    """
+
+    def __init__(self):
+        # key -> {'display', 'rank', 'code_only', 'locations': [(chapter, section, label)]}
+        self.terms = {}
+        self.prose_code = set()
+        self.labels = 0
+
+    def _add(self, term: str, rank: int, chapter: str, section: str,
+             label: str = None) -> str:
+        """Record one use of a term; returns the label if it is the chapter's first.
+
+        rank orders the competing spellings of a term for display: code (0)
+        over bold (1) over heading (2). label is shared by several terms
+        found in the same code block.
+        """
+        key = index_key(term)
+        if not key or key in INDEX_SKIP_TERMS or len(key.split()) > INDEX_MAX_WORDS:
+            return None
+        if rank == 1 and not self._defines(key):
+            return None
+        entry = self.terms.setdefault(key, {'display': term, 'rank': rank,
+                                            'code_only': rank == 0, 'locations': []})
+        if rank < entry['rank']:
+            entry['display'], entry['rank'] = term, rank
+        entry['code_only'] = entry['code_only'] and rank == 0
+        if any(loc[0] == chapter for loc in entry['locations']):
+            return None
+        if label is None:
+            self.labels += 1
+            label = f'idx-{self.labels}'
+        entry['locations'].append((chapter, section, label))
+        return label
+
+    def _defines(self, key: str) -> bool:
+        """Whether a bold key reads as a new term rather than emphasis."""
+        words = key.split()
+        if len(key) < 3 or not re.search(r'[a-z]', key) or \
+                all(word in INDEX_STOP_WORDS for word in words):
+            return False
+        forms = [key, *singular_keys(key), key + 's', key + 'es']
+        if key.endswith('y'):
+            forms.append(key[:-1] + 'ies')
+        return not any(form in self.terms for form in forms)
+
+    def _code_terms(self, line: str) -> List[str]:
+        """Specifiers, defined types and called functions in a Verse code line."""
+        code = re.sub(r'#.*$', '', line)
+        terms = [f'`<{name}>`' for name in INDEX_SPECIFIER_RE.findall(code)]
+        terms += [f'`{name}`' for name in INDEX_TYPE_DEF_RE.findall(code)]
+        terms += [f'`{name}()`' for name in INDEX_CALL_RE.findall(code)]
+        return terms
+
+    def scan(self, content: str, chapter: str) -> str:
+        """Index one processed chapter; returns it with the labels inserted.
+
+        A heading's label goes at the start of the paragraph (or list item)
+        that follows it, so no break can fall between the two; a code block's
+        label goes at the end of the paragraph introducing it.
+        """
+        out = []
+        section = chapter
+        fence = None            # (indent, marker, is_verse, line index of fence)
+        pending = None          # heading label waiting for the next paragraph
+        block_terms = []
+
+        def raw(label):
+            return f'`\\label{{{label}}}`{{=latex}}'
+
+        for line in content.split('\n'):
+            m = INDEX_FENCE_RE.match(line)
+            if fence:
+                out.append(line)
+                if m and m.group(2)[0] == fence[1][0] and len(m.group(2)) >= len(fence[1]):
+                    label = None
+                    for term in block_terms:
+                        label = self._add(term, 0, chapter, section, label) or label
+                    if label:
+                        self._place_block_label(out, fence[3], fence[0], raw(label))
+                    fence = None
+                elif fence[2]:
+                    block_terms.extend(self._code_terms(line))
+                continue
+
+            heading = INDEX_HEADING_RE.match(line)
+            if pending and line.strip() and not heading:
+                item = INDEX_LIST_ITEM_RE.match(line)
+                if item:
+                    line = item.group(1) + raw(pending) + line[item.end():]
+                elif INDEX_PROSE_START_RE.match(line) and not m:
+                    line = raw(pending) + line
+                else:
+                    out.extend([raw(pending), ''])
+                pending = None
+
+            if m:
+                fence = (m.group(1), m.group(2), 'verse' in line[m.end():], len(out))
+                block_terms = []
+                out.append(line)
+                continue
+
+            if heading:
+                title = heading.group(2)
+                section = f'{chapter} - {title}'
+                out.append(line)
+                pending = self._add(title, 2, chapter, section)
+                continue
+
+            for code in INDEX_INLINE_CODE_RE.findall(INDEX_RAW_LATEX_RE.sub('', line)):
+                self.prose_code.add(index_key(code))
+
+            # Whole-line bold is an admonition title, not a term
+            if not re.fullmatch(r'\s*\*\*[^*]+\*\*:?\s*', line):
+                runs = [run.span() for run in INDEX_BOLD_RUN_RE.finditer(line)]
+
+                def label_bold(match):
+                    if any(start <= match.start() < end for start, end in runs):
+                        return match.group(0)
+                    term = match.group(1).strip().rstrip(':.,;')
+                    label = self._add(term, 1, chapter, section)
+                    return match.group(0) + raw(label) if label else match.group(0)
+                line = INDEX_BOLD_RE.sub(label_bold, line)
+            out.append(line)
+
+        if pending:
+            out.extend(['', raw(pending)])
+        return '\n'.join(out)
+
+    @staticmethod
+    def _place_block_label(out: List[str], fence_at: int, indent: str, label: str):
+        """Attach a code block's label to the paragraph before its fence.
+
+        Falls back to a paragraph of its own just before the fence when the
+        block follows a heading, list marker or another block.
+        """
+        before = fence_at - 1
+        while before >= 0 and not out[before].strip():
+            before -= 1
+        previous = out[before] if before >= 0 else ''
+        if INDEX_PROSE_START_RE.match(previous.strip()) and \
+                not INDEX_FENCE_RE.match(previous) and not INDEX_HEADING_RE.match(previous):
+            out[before] = previous + label
+        else:
+            out[fence_at:fence_at] = [indent + label, '']
+
+    def _merged_terms(self) -> dict:
+        """Entries with each plural folded into its singular, if both are used.
+
+        Keys are taken shortest first, so a singular is in place before its
+        plurals; a merged entry keeps the first location per chapter.
+        """
+        merged = {}
+        for key in sorted(self.terms, key=len):
+            entry = self.terms[key]
+            target = next((k for k in singular_keys(key) if k in merged), None)
+            if target is None:
+                merged[key] = dict(entry, keys={key}, locations=list(entry['locations']))
+                continue
+            into = merged[target]
+            into['keys'].add(key)
+            # The singular names the entry unless the plural is its code spelling
+            if entry['rank'] == 0 < into['rank']:
+                into['display'], into['rank'] = entry['display'], entry['rank']
+            into['code_only'] = into['code_only'] and entry['code_only']
+            chapters, locations = set(), []
+            for loc in sorted(into['locations'] + entry['locations'],
+                              key=lambda loc: int(loc[2].split('-')[1])):
+                if loc[0] not in chapters:
+                    chapters.add(loc[0])
+                    locations.append(loc)
+            into['locations'] = locations
+        return merged
+
+    def render(self, title: str) -> str:
+        """The Concept Index chapter: terms A–Z with chapter, section and page."""
+        entries = []
+        for key, entry in self._merged_terms().items():
+            if entry['code_only'] and not entry['keys'] & self.prose_code:
+                continue
+            sort_key = re.sub(r'[^a-z0-9 ]', '', key).strip()
+            if sort_key:
+                entries.append((sort_key, entry))
+        entries.sort(key=lambda item: item[0])
+
+        lines = [f'# {title} {{.unnumbered}}', '',
+                 'Generated from the chapters on every build: each term is listed '
+                 'where a chapter introduces it — in a section heading, in **bold**, '
+                 'or in the Verse examples — with the chapter, section and page.', '',
+                 '`\\begin{multicols}{2}`{=latex}', '']
+        letter = None
+        for sort_key, entry in entries:
+            first = sort_key[0].upper() if sort_key[0].isalpha() else '#'
+            if first != letter:
+                letter = first
+                if lines[-1]:
+                    lines.append('')
+                lines += [f'## {"Symbols" if letter == "#" else letter} '
+                          '{.unnumbered .unlisted}', '']
+            display = entry['display']
+            if not display.startswith('`'):
+                display = f'**{display}**'
+            refs = '; '.join(f'{section} (p.\\ `\\pageref{{{label}}}`{{=latex}})'
+                             for _, section, label
+                             in entry['locations'][:INDEX_MAX_LOCATIONS])
+            lines.append(f'- {display}: {refs}')
+        lines += ['', '`\\end{multicols}`{=latex}', '']
+        return '\n'.join(lines)
+
+
 def make_subheadings_unnumbered(content: str) -> str:
     """Make all ## and ### headings unnumbered for appendix/unnumbered chapters.
 
@@ -460,13 +764,44 @@ def fix_print_overflows(content: str) -> str:
     return content
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: preprocess.py <docs_directory> [output_file]")
-        sys.exit(1)
+def build_source_map(content: str, docs_dir: Path, headers: List[Tuple[str, str]]) -> dict:
+    """Map each chapter to its line range in the combined markdown.
+
+    headers holds (filename, chapter heading line) in output order; the
+    heading lines are located in the final content, after print fixes that
+    may have changed line counts. Line numbers are 1-based and inclusive.
+    """
+    lines = content.split('\n')
+    chapters = []
+    pos = 0
+    for filename, header in headers:
+        while pos < len(lines) and lines[pos] != header:
+            pos += 1
+        if pos == len(lines):
+            break
+        if chapters:
+            chapters[-1]['end'] = pos
+        chapters.append({'file': filename, 'heading': header, 'start': pos + 1})
+        pos += 1
+    if chapters:
+        chapters[-1]['end'] = len(lines)
+    return {'docs_dir': str(docs_dir.resolve()), 'chapters': chapters}
+
 
-    docs_dir = Path(sys.argv[1])
-    output_file = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+def main():
+    parser = argparse.ArgumentParser(
+        description="Combine the Verse docs into one markdown file for Pandoc/LaTeX.")
+    parser.add_argument("docs_dir", type=Path, help="Verse documentation directory")
+    parser.add_argument("output_file", type=Path, nargs="?",
+                        help="combined markdown to write (default: stdout)")
+    parser.add_argument("--manual-index", action="store_true",
+                        help="use the hand-written concept_index.md instead of "
+                             "generating the Concept Index")
+    args = parser.parse_args()
+
+    docs_dir = args.docs_dir
+    output_file = args.output_file
+    concept_index = None if args.manual_index else ConceptIndex()
 
     if not docs_dir.exists():
         print(f"Error: Directory {docs_dir} does not exist")
@@ -476,11 +811,22 @@ def main():
     anchor_map = build_filename_anchor_map()
 
     combined_content = []
+    headers = []
     chapter_num = 1
+    index_slot = None
 
     for filename, title, is_numbered in CHAPTERS:
         filepath = docs_dir / filename
 
+        # The generated index is filled in once every chapter has been scanned
+        if concept_index and filename == INDEX_FILE:
+            print(f"Generating: {filename} -> {title}")
+            index_slot = (len(combined_content), title)
+            combined_content.append(None)
+            combined_content.append('\n\n\\newpage\n\n')
+            headers.append((filename, f'# {title} {{.unnumbered}}'))
+            continue
+
         if not filepath.exists():
             print(f"Warning: {filepath} not found, skipping")
             continue
@@ -492,30 +838,49 @@ def main():
 
         print(f"Processing: {filename} -> {title}")
 
-        content = process_file(
-            filepath,
-            title,
-            is_numbered,
-            chapter_num if is_numbered else None,
-            anchor_map
-        )
+        with span(filename, "preprocess", inputs=[filepath]) as chapter_span:
+            content = process_file(
+                filepath,
+                title,
+                is_numbered,
+                chapter_num if is_numbered else None,
+                anchor_map
+            )
+            if concept_index:
+                content = concept_index.scan(content, title)
+            chapter_span.bytes_out = len(content.encode('utf-8'))
 
         combined_content.append(content)
         combined_content.append('\n\n\\newpage\n\n')
+        headers.append((filename, content.split('\n', 1)[0]))
 
         if is_numbered:
             chapter_num += 1
 
+    if index_slot:
+        position, title = index_slot
+        with span(INDEX_FILE, "preprocess") as index_span:
+            content = concept_index.render(title)
+            index_span.bytes_out = len(content.encode('utf-8'))
+        combined_content[position] = content
+        print(f"Concept index: {content.count(chr(10) + '- ')} terms, "
+              f"{concept_index.labels} labels")
+
     final_content = '\n'.join(combined_content)
 
     # Apply print-specific line breaks to code lines that overflow
     # the 7x10" page margins. These are formatting-only changes —
     # identical content, just wrapped differently for print.
-    final_content = fix_print_overflows(final_content)
+    with span("fix_print_overflows", "preprocess"):
+        final_content = fix_print_overflows(final_content)
 
     if output_file:
         output_file.write_text(final_content, encoding='utf-8')
         print(f"Written to: {output_file}")
+        map_file = output_file.with_suffix('.map.json')
+        source_map = build_source_map(final_content, docs_dir, headers)
+        map_file.write_text(json.dumps(source_map, indent=2), encoding='utf-8')
+        print(f"Source map: {map_file}")
     else:
         print(final_content)
 
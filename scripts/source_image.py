@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+source_image.py
+
+Decode-once access to the raster logo sources for the OpenCV and Pillow
+scripts (overlay, extractors, vectoriser).
+
+Each file is read and hashed once per process; pixels are decoded lazily,
+once, into a single RGBA numpy buffer. OpenCV works on that array directly
+and Pillow gets a zero-copy read-only view of it (Image.frombuffer), so a
+script that needs both libraries never decodes the same JPEG twice.
+
+Derived data is cached as well:
+  - grayscale conversion and contour searches per threshold, in memory;
+  - bounding boxes of the largest shape per threshold, also on disk in
+    build/image-cache/<content sha1>.json, reused by later runs.
+
+Usage (requires numpy and opencv-python; Pillow only for .pil()):
+    from source_image import load_image
+    src = load_image(path)
+    x, y, w, h = src.bbox(55)
+    crop = src.pil().crop((x, y, x + w, y + h))
+"""
+
+import functools
+import hashlib
+import json
+import os
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+CACHE_DIR = os.path.join(REPO_ROOT, "build", "image-cache")
+
+
+class SourceImage:
+    """One decoded source image shared between OpenCV and Pillow."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self.sha1 = hashlib.sha1(self.data).hexdigest()
+        self._contours = {}
+        self._cache_path = os.path.join(CACHE_DIR, f"{self.sha1}.json")
+        self._disk = None
+
+    @functools.cached_property
+    def rgba(self):
+        """Decoded pixels, (h, w, 4) uint8 RGBA; read-only."""
+        import cv2
+        import numpy as np
+        bgr = cv2.imdecode(np.frombuffer(self.data, np.uint8), cv2.IMREAD_COLOR)
+        if bgr is None:
+            raise ValueError(f"cannot decode image: {self.path}")
+        rgba = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGBA)
+        rgba.flags.writeable = False
+        return rgba
+
+    @functools.cached_property
+    def gray(self):
+        """Grayscale pixels, (h, w) uint8; read-only."""
+        import cv2
+        gray = cv2.cvtColor(self.rgba, cv2.COLOR_RGBA2GRAY)
+        gray.flags.writeable = False
+        return gray
+
+    @property
+    def size(self):
+        """(width, height) in pixels."""
+        h, w = self.rgba.shape[:2]
+        return w, h
+
+    def bgr(self):
+        """A writable BGR copy for OpenCV drawing and cv2.imwrite."""
+        import cv2
+        return cv2.cvtColor(self.rgba, cv2.COLOR_RGBA2BGR)
+
+    def pil(self):
+        """Pillow RGBA image sharing the decoded buffer (read-only, no copy)."""
+        from PIL import Image
+        h, w = self.rgba.shape[:2]
+        return Image.frombuffer("RGBA", (w, h), self.rgba, "raw", "RGBA", 0, 1)
+
+    def contours(self, threshold, external=True):
+        """Contours of gray > threshold, largest first (memoised)."""
+        key = (threshold, external)
+        if key not in self._contours:
+            import cv2
+            import numpy as np
+            mask = (self.gray > threshold).astype(np.uint8)
+            mode = cv2.RETR_EXTERNAL if external else cv2.RETR_CCOMP
+            contours, _ = cv2.findContours(mask, mode, cv2.CHAIN_APPROX_SIMPLE)
+            self._contours[key] = sorted(contours, key=cv2.contourArea, reverse=True)
+        return self._contours[key]
+
+    def bbox(self, threshold):
+        """Bounding box (x, y, w, h) of the largest shape above threshold.
+
+        Cached on disk by content hash, so repeat runs skip the decode and
+        contour search when only the box is needed.
+        """
+        disk = self._load_disk()
+        key = str(threshold)
+        if key not in disk["bbox"]:
+            import cv2
+            contours = self.contours(threshold)
+            if not contours:
+                return None
+            disk["bbox"][key] = [int(v) for v in cv2.boundingRect(contours[0])]
+            self._save_disk()
+        return tuple(disk["bbox"][key])
+
+    def _load_disk(self):
+        if self._disk is None:
+            self._disk = {"bbox": {}}
+            if os.path.exists(self._cache_path):
+                with open(self._cache_path, encoding="utf-8") as f:
+                    self._disk = json.load(f)
+        return self._disk
+
+    def _save_disk(self):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{self._cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._disk, f)
+        os.replace(tmp_path, self._cache_path)
+
+
+@functools.lru_cache(maxsize=16)
+def _load(path, mtime, size):
+    return SourceImage(path)
+
+
+def load_image(path):
+    """Shared SourceImage for path; reloaded only if the file changes."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return _load(path, st.st_mtime_ns, st.st_size)
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+svg_optimize.py
+
+Output optimizer shared by the cover, die and logo generators. Rewrites an
+SVG document so it is smaller and cheaper to parse for RIPs and browsers:
+
+  - Path data is re-serialized with relative or absolute commands (whichever
+    is shorter per segment), H/V/T/S shorthands, implicit repeated commands
+    and minimal number formatting at a configurable precision. Coordinates
+    are quantized in integer space so relative offsets never drift.
+  - Paths repeated elsewhere in the document (same shape, possibly moved)
+    are stored once in <defs> and placed with <use>.
+  - Adjacent paths with identical attributes whose bounding boxes do not
+    overlap are merged into a single path.
+  - Whitespace between elements is dropped; comments are kept.
+
+Used as a module by the generators:
+    from svg_optimize import optimize_svg
+
+Or standalone on existing files (rewritten in place):
+    python scripts/svg_optimize.py [--precision N] FILE.svg [...]
+"""
+
+import argparse
+import re
+import xml.etree.ElementTree as ET
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", XLINK_NS)
+
+PATH_TAG = f"{{{SVG_NS}}}path"
+USE_TAG = f"{{{SVG_NS}}}use"
+DEFS_TAG = f"{{{SVG_NS}}}defs"
+HREF_ATTR = f"{{{XLINK_NS}}}href"
+CONTAINER_TAGS = {f"{{{SVG_NS}}}{tag}" for tag in
+                  ("defs", "pattern", "clipPath", "mask", "marker", "symbol")}
+
+# Attributes whose plain numeric values are reformatted compactly
+NUMERIC_ATTRS = {"x", "y", "width", "height", "x1", "y1", "x2", "y2",
+                 "cx", "cy", "r", "rx", "ry", "stroke-width", "opacity"}
+
+# Shortest relative path data worth sharing through <defs>/<use>
+MIN_SHARED_PATH = 24
+
+_TOKEN_RE = re.compile(r"[MLHVQTCSZAmlhvqtcsza]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_NUMBER_RE = re.compile(r"^[-+]?(?:\d+\.?\d*|\.\d+)$")
+_ARITY = {"M": 2, "L": 2, "H": 1, "V": 1, "Q": 4, "T": 2, "C": 6, "S": 4, "Z": 0}
+
+
+def parse_path(d):
+    """Parse SVG path data into absolute (cmd, [(x, y), ...]) segments.
+
+    Output commands are M, L, Q, C and Z only. Returns None for path data
+    this module does not handle (elliptical arcs).
+    """
+    tokens = _TOKEN_RE.findall(d)
+    segments = []
+    x = y = sx = sy = 0.0
+    last_ctrl = None   # (cmd, control point) for T/S reflection
+    cmd = None
+    i = 0
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            cmd = tokens[i]
+            i += 1
+            if cmd in "Aa":
+                return None
+        elif cmd is None:
+            return None
+        upper = cmd.upper()
+        rel = cmd.islower()
+        arity = _ARITY[upper]
+        args = [float(v) for v in tokens[i:i + arity]]
+        if len(args) < arity:
+            return None
+        i += arity
+
+        def pt(px, py):
+            return (x + px, y + py) if rel else (px, py)
+
+        if upper == "Z":
+            segments.append(("Z", []))
+            x, y = sx, sy
+            last_ctrl = None
+            continue
+        if upper == "M":
+            x, y = pt(*args)
+            sx, sy = x, y
+            segments.append(("M", [(x, y)]))
+            cmd = "l" if rel else "L"  # implicit lineto after moveto
+            last_ctrl = None
+            continue
+        if upper in "LHV":
+            if upper == "H":
+                end = (x + args[0] if rel else args[0], y)
+            elif upper == "V":
+                end = (x, y + args[0] if rel else args[0])
+            else:
+                end = pt(*args)
+            segments.append(("L", [end]))
+            last_ctrl = None
+        elif upper in "QT":
+            if upper == "Q":
+                ctrl, end = pt(*args[:2]), pt(*args[2:])
+            else:
+                ctrl = (2 * x - last_ctrl[1][0], 2 * y - last_ctrl[1][1]) \
+                    if last_ctrl and last_ctrl[0] == "Q" else (x, y)
+                end = pt(*args)
+            segments.append(("Q", [ctrl, end]))
+            last_ctrl = ("Q", ctrl)
+        else:  # C / S
+            if upper == "C":
+                c1, c2, end = pt(*args[:2]), pt(*args[2:4]), pt(*args[4:])
+            else:
+                c1 = (2 * x - last_ctrl[1][0], 2 * y - last_ctrl[1][1]) \
+                    if last_ctrl and last_ctrl[0] == "C" else (x, y)
+                c2, end = pt(*args[:2]), pt(*args[2:])
+            segments.append(("C", [c1, c2, end]))
+            last_ctrl = ("C", c2)
+        x, y = end
+    return segments
+
+
+def _fmt(value, scale):
+    """Format a quantized integer coordinate with no redundant characters."""
+    if scale == 1:
+        return str(value)
+    s = f"{value / scale:.{len(str(scale)) - 1}f}".rstrip("0").rstrip(".")
+    if s.startswith("0."):
+        s = s[1:]
+    elif s.startswith("-0."):
+        s = "-" + s[2:]
+    return "0" if s in ("", "-0", "-") else s
+
+
+def _join(tokens):
+    """Join command letters and numbers, inserting separators only if needed."""
+    out = []
+    prev = None
+    for tok in tokens:
+        if prev is not None and not tok[0].isalpha() and not prev[-1].isalpha():
+            if not (tok[0] == "-" or (tok[0] == "." and "." in prev)):
+                out.append(" ")
+        out.append(tok)
+        prev = tok
+    return "".join(out)
+
+
+def _quantize(segments, scale):
+    return [(cmd, [(round(px * scale), round(py * scale)) for px, py in pts])
+            for cmd, pts in segments]
+
+
+def serialize_path(segments, precision=1, relative_only=False):
+    """Serialize absolute segments to the shortest path data string.
+
+    With relative_only=True every command after the first moveto is
+    relative, which makes the output independent of the path's position.
+    """
+    scale = 10 ** precision
+    q = _quantize(segments, scale)
+    tokens = []
+    last_letter = None
+    cx = cy = sx = sy = 0
+    prev_ctrl = None  # (cmd, ctrl) in quantized space
+
+    def emit(letter, values):
+        nonlocal last_letter
+        nums = [_fmt(v, scale) for v in values]
+        if letter != last_letter or letter in "Mm":
+            tokens.append(letter)
+        tokens.extend(nums)
+        last_letter = letter
+
+    def choose(abs_letter, abs_vals, rel_vals):
+        if relative_only:
+            return abs_letter.lower(), rel_vals
+        a = _join([abs_letter] + [_fmt(v, scale) for v in abs_vals])
+        r = _join([abs_letter.lower()] + [_fmt(v, scale) for v in rel_vals])
+        if len(r) < len(a):
+            return abs_letter.lower(), rel_vals
+        return abs_letter, abs_vals
+
+    first = True
+    for cmd, pts in q:
+        if cmd == "Z":
+            if last_letter not in ("z", None):
+                tokens.append("z")
+                last_letter = "z"
+            cx, cy = sx, sy
+            prev_ctrl = None
+            continue
+        end = pts[-1]
+        dx, dy = end[0] - cx, end[1] - cy
+        if cmd == "M":
+            if first:
+                emit("M", [end[0], end[1]])
+            else:
+                emit(*choose("M", [end[0], end[1]], [dx, dy]))
+            sx, sy = end
+            prev_ctrl = None
+        elif cmd == "L":
+            if dy == 0:
+                emit(*choose("H", [end[0]], [dx]))
+            elif dx == 0:
+                emit(*choose("V", [end[1]], [dy]))
+            else:
+                emit(*choose("L", [end[0], end[1]], [dx, dy]))
+            prev_ctrl = None
+        elif cmd == "Q":
+            ctrl = pts[0]
+            reflected = (prev_ctrl and prev_ctrl[0] == "Q"
+                         and ctrl == (2 * cx - prev_ctrl[1][0], 2 * cy - prev_ctrl[1][1]))
+            if reflected:
+                emit(*choose("T", [end[0], end[1]], [dx, dy]))
+            else:
+                emit(*choose("Q", [ctrl[0], ctrl[1], end[0], end[1]],
+                             [ctrl[0] - cx, ctrl[1] - cy, dx, dy]))
+            prev_ctrl = ("Q", ctrl)
+        else:  # C
+            c1, c2 = pts[0], pts[1]
+            reflected = (prev_ctrl and prev_ctrl[0] == "C"
+                         and c1 == (2 * cx - prev_ctrl[1][0], 2 * cy - prev_ctrl[1][1]))
+            if reflected:
+                emit(*choose("S", [c2[0], c2[1], end[0], end[1]],
+                             [c2[0] - cx, c2[1] - cy, dx, dy]))
+            else:
+                emit(*choose("C", [c1[0], c1[1], c2[0], c2[1], end[0], end[1]],
+                             [c1[0] - cx, c1[1] - cy, c2[0] - cx, c2[1] - cy, dx, dy]))
+            prev_ctrl = ("C", c2)
+        cx, cy = end
+        first = False
+    return _join(tokens)
+
+
+def path_bbox(segments):
+    """Bounding box (x0, y0, x1, y1) of all points, control points included."""
+    xs = [p[0] for _, pts in segments for p in pts]
+    ys = [p[1] for _, pts in segments for p in pts]
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _translate(segments, tx, ty):
+    return [(cmd, [(px + tx, py + ty) for px, py in pts]) for cmd, pts in segments]
+
+
+def _compact_number(value):
+    """Drop redundant zeros from a numeric attribute without changing it."""
+    if not _NUMBER_RE.match(value) or "e" in value.lower():
+        return value
+    sign = "-" if value.startswith("-") else ""
+    value = value.lstrip("+-")
+    if "." in value:
+        value = value.rstrip("0").rstrip(".")
+    value = value.lstrip("0") or "0"
+    return "0" if value == "0" else sign + value
+
+
+def optimize_svg(svg, precision=1, dedupe=True, merge=True):
+    """Return an optimized copy of an SVG document string."""
+    parser = ET.XMLParser(target=ET.TreeBuilder(insert_comments=True))
+    root = ET.fromstring(svg, parser=parser)
+    parents = {child: parent for parent in root.iter() for child in parent}
+
+    # Parse every rendered path once. Paths inside <defs>, patterns, clip
+    # paths etc., paths with an id and paths we cannot parse are left as is.
+    hidden = set()
+    for el in root.iter():
+        if el.tag in CONTAINER_TAGS:
+            hidden.update(el.iter())
+    parsed = {}
+    for el in root.iter(PATH_TAG):
+        d = el.get("d")
+        if d is not None and el.get("id") is None and el not in hidden:
+            segments = parse_path(d)
+            if segments:
+                parsed[el] = segments
+
+    # 1. Dedupe repeated geometry into <defs> + <use>.
+    if dedupe:
+        groups = {}
+        for el, segments in parsed.items():
+            if segments[0][0] != "M":
+                continue
+            x0, y0 = segments[0][1][0]
+            key = serialize_path(_translate(segments, -x0, -y0), precision,
+                                 relative_only=True)
+            groups.setdefault(key, []).append(el)
+        defs = None
+        scale = 10 ** precision
+        n = 0
+        for key, els in groups.items():
+            if len(els) < 2 or len(key) < MIN_SHARED_PATH:
+                continue
+            if defs is None:
+                defs = root.find(DEFS_TAG)
+                if defs is None:
+                    defs = ET.Element(DEFS_TAG)
+                    first_shape = next((i for i, c in enumerate(root)
+                                        if not callable(c.tag)), len(root))
+                    root.insert(first_shape, defs)
+            shape_id = f"p{n}"
+            n += 1
+            ET.SubElement(defs, PATH_TAG, {"id": shape_id, "d": key})
+            for el in els:
+                x0, y0 = parsed.pop(el)[0][1][0]
+                attrs = {k: v for k, v in el.attrib.items() if k != "d"}
+                attrs[HREF_ATTR] = f"#{shape_id}"
+                use = ET.Element(USE_TAG, attrs)
+                for name, value in (("x", x0), ("y", y0)):
+                    if round(value * scale):
+                        use.set(name, _fmt(round(value * scale), scale))
+                use.tail = el.tail
+                parent = parents[el]
+                parent[list(parent).index(el)] = use
+
+    # 2. Merge adjacent, non-overlapping paths with identical attributes.
+    if merge:
+        for parent in list(root.iter()):
+            run, run_boxes = [], []
+            for child in list(parent) + [None]:
+                mergeable = (child is not None and child in parsed
+                             and not (child.tail or "").strip())
+                if run and mergeable:
+                    head = run[0]
+                    same = ({k: v for k, v in head.attrib.items() if k != "d"}
+                            == {k: v for k, v in child.attrib.items() if k != "d"})
+                    box = path_bbox(parsed[child])
+                    if same and box and not any(_overlaps(box, b) for _, b in run_boxes):
+                        run.append(child)
+                        run_boxes.append((child, box))
+                        continue
+                if len(run) > 1:
+                    combined = [seg for el in run for seg in parsed[el]]
+                    parsed[run[0]] = combined
+                    run[0].tail = run[-1].tail
+                    for el in run[1:]:
+                        parent.remove(el)
+                        del parsed[el]
+                run, run_boxes = [], []
+                if mergeable:
+                    box = path_bbox(parsed[child])
+                    if box:
+                        run, run_boxes = [child], [(child, box)]
+
+    # 3. Re-serialize remaining path data and compact numeric attributes.
+    for el, segments in parsed.items():
+        el.set("d", serialize_path(segments, precision))
+    for el in root.iter():
+        if callable(el.tag):
+            continue
+        for name in NUMERIC_ATTRS & set(el.attrib):
+            el.set(name, _compact_number(el.get(name)))
+
+    # 4. Drop indentation; keep one top-level element per line.
+    for el in root.iter():
+        if el.text is not None and not el.text.strip():
+            el.text = None
+        if el.tail is not None and not el.tail.strip():
+            el.tail = None
+    root.text = "\n"
+    for child in root:
+        child.tail = "\n"
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(root, encoding="unicode")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimize SVG files in place.")
+    parser.add_argument("files", nargs="+", help="SVG files to rewrite")
+    parser.add_argument("--precision", type=int, default=1,
+                        help="decimal places kept in coordinates (default: 1)")
+    args = parser.parse_args()
+
+    for path in args.files:
+        with open(path, encoding="utf-8") as f:
+            before = f.read()
+        after = optimize_svg(before, args.precision)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(after)
+        print(f"  {path}: {len(before.encode())} -> {len(after.encode())} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+svg_to_pdf.py
+
+Minimal vector PDF writer for the generated die and bookplate artwork.
+Replaces the Inkscape/Illustrator round trip: the same path data that goes
+into the SVG is written straight into a single-page PDF, with no rendering
+toolkit involved.
+
+Supports the SVG subset our generators emit: <path> (any path commands
+except arcs, quadratics become cubics), <rect>, <use> of <defs> paths and
+<g>/element transforms (translate, rotate, scale, matrix). Fills and
+strokes are solid colours; black is written as DeviceGray 0 so foil dies
+stay single-channel. The page size comes from the root width/height
+(unitless values are CSS px, as Inkscape reads them), so die SVGs declare
+pt to keep one user unit per PDF point.
+
+Used as a module by the generators:
+    from svg_to_pdf import svg_to_pdf
+
+Or standalone (writes FILE.pdf next to each FILE.svg):
+    python scripts/svg_to_pdf.py FILE.svg [...]
+"""
+
+import argparse
+import math
+import os
+import re
+import zlib
+import xml.etree.ElementTree as ET
+
+from svg_optimize import HREF_ATTR, SVG_NS, parse_path
+
+NAMED_COLORS = {"black": (0, 0, 0), "white": (1, 1, 1)}
+# Points per unit for <svg> width/height; unitless lengths are CSS px
+LENGTH_UNITS = {"pt": 1.0, "px": 0.75, "": 0.75, "in": 72.0, "mm": 72 / 25.4, "cm": 72 / 2.54}
+SKIP_TAGS = {f"{{{SVG_NS}}}{tag}" for tag in
+             ("defs", "pattern", "clipPath", "mask", "marker", "symbol")}
+
+_TRANSFORM_RE = re.compile(r"(translate|rotate|scale|matrix)\s*\(([^)]*)\)")
+
+
+def _num(v):
+    """Format a number for a PDF content stream."""
+    s = f"{v:.3f}".rstrip("0").rstrip(".")
+    return "0" if s in ("", "-0") else s
+
+
+def parse_length(value):
+    """Convert an SVG width/height such as "216pt" or "3in" to points."""
+    m = re.fullmatch(r"\s*([-+]?[\d.]+)\s*([a-z]*)\s*", value)
+    return float(m.group(1)) * LENGTH_UNITS[m.group(2)]
+
+
+def _multiply(m, n):
+    """Compose affine matrices (a, b, c, d, e, f): apply n, then m."""
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (a * a2 + c * b2, b * a2 + d * b2,
+            a * c2 + c * d2, b * c2 + d * d2,
+            a * e2 + c * f2 + e, b * e2 + d * f2 + f)
+
+
+def parse_transform(text):
+    """Parse an SVG transform attribute into a single affine matrix."""
+    m = (1, 0, 0, 1, 0, 0)
+    for name, args in _TRANSFORM_RE.findall(text or ""):
+        v = [float(x) for x in re.split(r"[\s,]+", args.strip()) if x]
+        if name == "translate":
+            t = (1, 0, 0, 1, v[0], v[1] if len(v) > 1 else 0)
+        elif name == "scale":
+            t = (v[0], 0, 0, v[1] if len(v) > 1 else v[0], 0, 0)
+        elif name == "rotate":
+            r = math.radians(v[0])
+            t = (math.cos(r), math.sin(r), -math.sin(r), math.cos(r), 0, 0)
+            if len(v) == 3:
+                t = _multiply(_multiply((1, 0, 0, 1, v[1], v[2]), t),
+                              (1, 0, 0, 1, -v[1], -v[2]))
+        else:
+            t = tuple(v)
+        m = _multiply(m, t)
+    return m
+
+
+def parse_color(value):
+    """Return an (r, g, b) tuple in 0..1 for a solid colour, or None."""
+    if not value or value == "none" or value.startswith("url("):
+        return None
+    if value in NAMED_COLORS:
+        return NAMED_COLORS[value]
+    if value.startswith("#"):
+        h = value[1:]
+        if len(h) == 3:
+            h = "".join(ch * 2 for ch in h)
+        return tuple(int(h[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    return None
+
+
+def _color_op(rgb, stroke=False):
+    if rgb[0] == rgb[1] == rgb[2]:
+        return f"{_num(rgb[0])} {'G' if stroke else 'g'}"
+    return " ".join(_num(c) for c in rgb) + (" RG" if stroke else " rg")
+
+
+def _path_ops(segments):
+    """PDF path construction operators for parsed absolute segments."""
+    ops = []
+    cx = cy = 0.0
+    for cmd, pts in segments:
+        if cmd == "M":
+            (cx, cy), = pts
+            ops.append(f"{_num(cx)} {_num(cy)} m")
+        elif cmd == "L":
+            (cx, cy), = pts
+            ops.append(f"{_num(cx)} {_num(cy)} l")
+        elif cmd == "Q":
+            (qx, qy), (x, y) = pts
+            c1 = (cx + 2 / 3 * (qx - cx), cy + 2 / 3 * (qy - cy))
+            c2 = (x + 2 / 3 * (qx - x), y + 2 / 3 * (qy - y))
+            ops.append(f"{_num(c1[0])} {_num(c1[1])} {_num(c2[0])} {_num(c2[1])} "
+                       f"{_num(x)} {_num(y)} c")
+            cx, cy = x, y
+        elif cmd == "C":
+            (x1, y1), (x2, y2), (cx, cy) = pts
+            ops.append(f"{_num(x1)} {_num(y1)} {_num(x2)} {_num(y2)} "
+                       f"{_num(cx)} {_num(cy)} c")
+        else:
+            ops.append("h")
+    return ops
+
+
+def _paint_ops(el, inherited):
+    """Fill/stroke state for an element; returns (ops, paint operator) or None."""
+    style = dict(inherited)
+    for name in ("fill", "stroke", "stroke-width", "fill-rule"):
+        if el.get(name) is not None:
+            style[name] = el.get(name)
+    fill = parse_color(style.get("fill", "black"))
+    stroke = parse_color(style.get("stroke"))
+    ops = []
+    if fill:
+        ops.append(_color_op(fill))
+    if stroke:
+        ops.append(_color_op(stroke, stroke=True))
+        ops.append(f"{_num(float(style.get('stroke-width', 1)))} w")
+    if fill and stroke:
+        paint = "B*" if style.get("fill-rule") == "evenodd" else "B"
+    elif fill:
+        paint = "f*" if style.get("fill-rule") == "evenodd" else "f"
+    elif stroke:
+        paint = "S"
+    else:
+        return None
+    return ops, paint
+
+
+def _content(el, defs, inherited, out):
+    """Append PDF operators for an element and its children to out."""
+    if el.tag in SKIP_TAGS:
+        return
+    style = dict(inherited)
+    for name in ("fill", "stroke", "stroke-width", "fill-rule"):
+        if el.get(name) is not None:
+            style[name] = el.get(name)
+
+    matrix = parse_transform(el.get("transform"))
+    tag = el.tag.split("}")[-1]
+    if tag == "use":
+        x, y = float(el.get("x", 0)), float(el.get("y", 0))
+        matrix = _multiply(matrix, (1, 0, 0, 1, x, y))
+    pushed = matrix != (1, 0, 0, 1, 0, 0)
+    if pushed:
+        out.append("q " + " ".join(_num(v) for v in matrix) + " cm")
+
+    geometry = None
+    if tag == "path":
+        geometry = parse_path(el.get("d", ""))
+    elif tag == "use":
+        ref = defs.get((el.get(HREF_ATTR) or el.get("href") or "").lstrip("#"))
+        if ref is not None:
+            geometry = parse_path(ref.get("d", ""))
+    elif tag == "rect":
+        x, y = float(el.get("x", 0)), float(el.get("y", 0))
+        w, h = float(el.get("width", 0)), float(el.get("height", 0))
+        geometry = [("M", [(x, y)]), ("L", [(x + w, y)]), ("L", [(x + w, y + h)]),
+                    ("L", [(x, y + h)]), ("Z", [])]
+
+    if geometry:
+        paint = _paint_ops(el, inherited)
+        if paint:
+            ops, op = paint
+            out.extend(ops)
+            out.extend(_path_ops(geometry))
+            out.append(op)
+
+    for child in el:
+        if not callable(child.tag):
+            _content(child, defs, style, out)
+    if pushed:
+        out.append("Q")
+
+
+def _text_string(text):
+    """A PDF text string: escaped literal if printable ASCII, else UTF-16BE hex.
+
+    Literal strings are read as PDFDocEncoding, so anything beyond ASCII
+    ("Zoë") goes out as <FEFF...> to survive in the viewer's title bar.
+    """
+    if all(" " <= ch <= "~" for ch in text):
+        return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+    return "<FEFF" + text.encode("utf-16-be").hex().upper() + ">"
+
+
+def svg_to_pdf(svg, title=""):
+    """Convert a generator SVG document string into single-page PDF bytes."""
+    root = ET.fromstring(svg)
+    vb = [float(v) for v in re.split(r"[\s,]+", root.get("viewBox", "").strip()) if v]
+    width = parse_length(root.get("width", f"{vb[2]}pt" if vb else "0"))
+    height = parse_length(root.get("height", f"{vb[3]}pt" if vb else "0"))
+    if not vb:
+        vb = [0, 0, width, height]
+    defs = {el.get("id"): el for el in root.iter() if el.get("id")}
+
+    # Flip to PDF's y-up space and map the viewBox onto the page.
+    sx, sy = width / vb[2], height / vb[3]
+    ops = [f"{_num(sx)} 0 0 {_num(-sy)} {_num(-vb[0] * sx)} {_num(height + vb[1] * sy)} cm"]
+    for child in root:
+        if not callable(child.tag):
+            _content(child, defs, {}, ops)
+    stream = zlib.compress("\n".join(ops).encode("ascii"), 9)
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(width)} {_num(height)}] "
+         f"/Contents 4 0 R /Resources << >> >>").encode("ascii"),
+        f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode("ascii")
+        + stream + b"\nendstream",
+        f"<< /Title {_text_string(title)} /Producer (Book of Verse die generator) >>"
+        .encode("ascii"),
+    ]
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("ascii")
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R /Info 5 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n").encode("ascii")
+    return bytes(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert generated SVG artwork to PDF.")
+    parser.add_argument("files", nargs="+", help="SVG files to convert")
+    args = parser.parse_args()
+
+    for path in args.files:
+        with open(path, encoding="utf-8") as f:
+            pdf = svg_to_pdf(f.read(), os.path.basename(path))
+        pdf_path = os.path.splitext(path)[0] + ".pdf"
+        with open(pdf_path, "wb") as f:
+            f.write(pdf)
+        print(f"  Created: {pdf_path} ({len(pdf)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+v_outline.py
+
+The V logo outline shared by every generator, and the engine that measures
+it from a logo image.
+
+The outline lives in cover-design/assets/v-outline.json, written by
+scripts/extract-v-from-2d.py. Generators load it with:
+    from v_outline import load_v_outline
+    V_OUTLINE = load_v_outline()
+
+Extraction (requires opencv-python and numpy, imported on first use):
+  1. Threshold the image at every level in a sweep in one numpy operation.
+  2. Find the largest outer contour of each mask (one findContours call per
+     mask, holes included via RETR_CCOMP) and approximate it at every epsilon.
+  3. Score each candidate polygon by IoU against its mask, weighted by how
+     stable the mask is between neighbouring thresholds; the best 7-vertex
+     fit wins.
+  4. Vertices of 7-vertex fits are refined to subpixel accuracy (lines fitted
+     to the contour points along each edge, neighbouring edges intersected)
+     before scoring.
+  5. Normalise to the 100×100 viewBox in V_OUTLINE vertex order.
+"""
+
+import json
+import os
+import re
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+OUTLINE_PATH = os.path.join(REPO_ROOT, "cover-design", "assets", "v-outline.json")
+
+V_VERTICES = 7
+THRESHOLDS = tuple(range(30, 230, 10))
+EPSILONS = (0.005, 0.0075, 0.01, 0.015, 0.02, 0.025, 0.03, 0.04, 0.05)
+EDGE_TRIM = 0.15   # fraction of each edge ignored near its corners when line fitting
+SUBPIXEL_BITS = 4  # fixed-point fraction bits when rasterising refined polygons
+
+# Vertex names in V_OUTLINE order (clockwise from top-left, y down)
+LABELS = ["top-left outer", "inner top-left", "inner bottom", "notch apex",
+          "notch left", "top-right outer", "outer bottom point"]
+
+
+def load_v_outline(path=OUTLINE_PATH):
+    """Return the V outline as a list of (x, y) tuples in a 100×100 viewBox."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return [tuple(v) for v in data["vertices"]]
+
+
+def _signed_area(points):
+    return sum(x1 * y2 - x2 * y1
+               for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1])) / 2
+
+
+def threshold_stack(gray, thresholds=THRESHOLDS):
+    """Binary masks for every threshold at once: shape (len(thresholds), h, w)."""
+    import numpy as np
+    return gray[None, :, :] > np.asarray(thresholds, dtype=gray.dtype)[:, None, None]
+
+
+def _largest_outer_contour(mask):
+    """Largest outer contour of a boolean mask (points unsimplified)."""
+    import cv2
+    import numpy as np
+    contours, hierarchy = cv2.findContours(mask.astype(np.uint8), cv2.RETR_CCOMP,
+                                           cv2.CHAIN_APPROX_NONE)
+    outer = [c for c, h in zip(contours, hierarchy[0]) if h[3] < 0] if contours else []
+    return max(outer, key=cv2.contourArea) if outer else None
+
+
+def refine_vertices(contour, approx):
+    """Subpixel vertices: intersect lines fitted to the contour between vertices."""
+    import cv2
+    import numpy as np
+    pts = contour[:, 0, :].astype(np.float64)
+    n = len(pts)
+    index = {tuple(p): i for i, p in enumerate(contour[:, 0, :].tolist())}
+    idx = [index[tuple(p)] for p in approx[:, 0, :].tolist()]
+
+    lines = []
+    for a, b in zip(idx, idx[1:] + idx[:1]):
+        span = (b - a) % n
+        trim = int(span * EDGE_TRIM)
+        seg = pts[[(a + trim + k) % n for k in range(max(2, span - 2 * trim + 1))]]
+        vx, vy, x0, y0 = cv2.fitLine(seg.astype(np.float32), cv2.DIST_L2, 0, 0.01, 0.01).ravel()
+        lines.append((np.array([x0, y0]), np.array([vx, vy])))
+
+    refined = []
+    for i, v in enumerate(idx):
+        (p1, d1), (p2, d2) = lines[i - 1], lines[i]
+        det = d1[0] * -d2[1] + d2[0] * d1[1]
+        if abs(det) < 1e-9:
+            refined.append((float(pts[v][0]), float(pts[v][1])))
+            continue
+        t = ((p2[0] - p1[0]) * -d2[1] + d2[0] * (p2[1] - p1[1])) / det
+        refined.append(tuple(float(c) for c in p1 + t * d1))
+    return refined
+
+
+def to_viewbox(points):
+    """Normalise pixel vertices to a 100×100 viewBox in V_OUTLINE order."""
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    x0, y0 = min(xs), min(ys)
+    sx, sy = 100 / (max(xs) - x0), 100 / (max(ys) - y0)
+    vb = [((x - x0) * sx, (y - y0) * sy) for x, y in points]
+
+    # V_OUTLINE runs clockwise on screen (positive area with y down),
+    # starting at the top-left outer corner.
+    if _signed_area(vb) < 0:
+        vb.reverse()
+        points = list(reversed(points))
+    start = min(range(len(vb)), key=lambda i: vb[i][0] + vb[i][1])
+    return vb[start:] + vb[:start], points[start:] + points[:start]
+
+
+def sweep(gray, thresholds=THRESHOLDS, epsilons=EPSILONS):
+    """Score every (threshold, epsilon) candidate; returns a list of dicts."""
+    import cv2
+    import numpy as np
+
+    masks = threshold_stack(gray, thresholds)
+    # Mask stability: IoU of each mask with the next threshold's mask
+    inter = (masks[1:] & masks[:-1]).sum(axis=(1, 2))
+    union = (masks[1:] | masks[:-1]).sum(axis=(1, 2))
+    stability = np.append(inter / np.maximum(union, 1), 0.0)
+
+    candidates = []
+    for t, mask, stable in zip(thresholds, masks, stability):
+        contour = _largest_outer_contour(mask)
+        if contour is None or len(contour) < V_VERTICES:
+            continue
+        region = np.zeros(mask.shape, np.uint8)
+        cv2.drawContours(region, [contour], -1, 1, cv2.FILLED)
+        region = region.astype(bool) & mask
+
+        perimeter = cv2.arcLength(contour, True)
+        approxes = [cv2.approxPolyDP(contour, e * perimeter, True) for e in epsilons]
+        # 7-vertex fits are scored after subpixel refinement, the rest as-is
+        polygons = [refine_vertices(contour, a) if len(a) == V_VERTICES
+                    else [tuple(map(float, p)) for p in a[:, 0, :]] for a in approxes]
+        rasters = np.zeros((len(approxes),) + mask.shape, np.uint8)
+        for raster, polygon in zip(rasters, polygons):
+            fixed = np.round(np.array(polygon) * (1 << SUBPIXEL_BITS)).astype(np.int32)
+            cv2.fillPoly(raster, [fixed], 1, shift=SUBPIXEL_BITS)
+        rasters = rasters.astype(bool)
+        ious = ((rasters & region).sum(axis=(1, 2))
+                / np.maximum((rasters | region).sum(axis=(1, 2)), 1))
+
+        for e, approx, polygon, iou in zip(epsilons, approxes, polygons, ious):
+            candidates.append({
+                "threshold": int(t), "epsilon": e, "vertices": len(approx),
+                "iou": float(iou), "stability": float(stable),
+                "score": float(iou * stable),
+                "contour": contour, "approx": approx, "polygon": polygon,
+            })
+    return candidates
+
+
+def extract(gray, thresholds=THRESHOLDS, epsilons=EPSILONS):
+    """Pick the best 7-vertex candidate and refine it.
+
+    Returns (best candidate dict with "pixel" and "viewbox" vertices added,
+    all candidates), or (None, candidates) if no 7-vertex fit exists.
+    """
+    candidates = sweep(gray, thresholds, epsilons)
+    sevens = [c for c in candidates if c["vertices"] == V_VERTICES]
+    if not sevens:
+        return None, candidates
+    best = max(sevens, key=lambda c: (c["score"], c["epsilon"]))
+    best["viewbox"], best["pixel"] = to_viewbox(best["polygon"])
+    return best, candidates
+
+
+def write_outline(best, source, decimals=0, accept=False, path=OUTLINE_PATH):
+    """Record a measurement in the outline data file the generators load.
+
+    The measurement is always stored under "measured"; it only replaces the
+    approved "vertices" (rounded to decimals places) when accept is true or
+    no outline exists yet, so a re-run never silently moves production art.
+    """
+    def rnd(v):
+        v = round(v, decimals)
+        return int(v) if decimals == 0 else v
+
+    data = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    if accept or "vertices" not in data:
+        data["vertices"] = [[rnd(x), rnd(y)] for x, y in best["viewbox"]]
+    data.update({
+        "labels": LABELS,
+        "source": source,
+        "threshold": best["threshold"],
+        "epsilon": best["epsilon"],
+        "iou": round(best["iou"], 4),
+        "stability": round(best["stability"], 4),
+        "measured": [[round(x, 2), round(y, 2)] for x, y in best["viewbox"]],
+        "pixel": [[round(x, 2), round(y, 2)] for x, y in best["pixel"]],
+    })
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    text = re.sub(r"\[\s+([-\d.]+),\s+([-\d.]+)\s+\]", r"[\1, \2]", text)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+    return data
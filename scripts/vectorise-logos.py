@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+vectorise-logos.py
+
+Batch vectorisation of raster logos and emblems into SVG.
+
+For each image:
+  1. Downscale with an image pyramid (cv2.pyrDown) until it fits in
+     PYRAMID_MAX pixels, pick an Otsu threshold there and find the shapes.
+  2. Re-trace each shape at full resolution, but only inside its own
+     region of interest, so large scans never get a full-size contour search.
+  3. Fit each outline (and its holes) with straight segments (--mode polygon)
+     or cubic Béziers (--mode bezier, split at corners).
+  4. Write a compact SVG (svg_optimize) next to the other results.
+
+Results are cached in build/vector-cache/ keyed by the image's content hash
+and the fitting options, so re-running over an asset folder only processes
+new or changed images. Debug PNGs are only written with --debug.
+
+Requires opencv-python and numpy (pip install opencv-python numpy).
+
+Run from repo root:
+  python scripts/vectorise-logos.py                        # the two repo logos
+  python scripts/vectorise-logos.py path/to/logos/ --mode bezier
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from source_image import load_image
+from svg_optimize import optimize_svg
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+OUTPUT_DIR = os.path.join(REPO_ROOT, "cover-design", "assets", "vectorised")
+CACHE_DIR = os.path.join(REPO_ROOT, "build", "vector-cache")
+DEFAULT_INPUTS = ["VerseLogo2D.png", "verselanguageimage.jpeg"]
+IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".webp"}
+
+CACHE_VERSION = 1       # bump when the fitting output changes
+PYRAMID_MAX = 1024      # longest side of the level used for the coarse search
+ROI_MARGIN = 4          # coarse-level pixels added around each shape's ROI
+CORNER_ANGLE = 50       # degrees of turn that make a contour point a corner
+CORNER_SPAN = 5         # contour points either side used to measure the turn
+
+
+def find_images(paths):
+    """Expand files and directories into a sorted list of image paths."""
+    images = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                images.extend(os.path.join(root, f) for f in files
+                              if os.path.splitext(f)[1].lower() in IMAGE_EXTS)
+        elif os.path.exists(path):
+            images.append(path)
+        else:
+            print(f"  WARNING: {path} not found")
+    return sorted(images)
+
+
+def cache_key(data, args):
+    """Cache key: image content hash plus every option that affects output."""
+    opts = f"|{CACHE_VERSION}|{args.mode}|{args.epsilon}|{args.error}|{args.min_area}|{args.invert}"
+    return hashlib.sha1(data + opts.encode()).hexdigest()
+
+
+def detect_shapes(gray, min_area, invert=None):
+    """Coarse-to-fine contour detection.
+
+    Returns (shapes, threshold, levels) where shapes is a list of
+    (outer contour, [hole contours]) at full resolution.
+    """
+    import cv2
+    import numpy as np
+
+    # Coarse level
+    coarse, levels = gray, 0
+    while max(coarse.shape) > PYRAMID_MAX:
+        coarse = cv2.pyrDown(coarse)
+        levels += 1
+    thresh, mask = cv2.threshold(coarse, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Logos are the minority of the frame: flip dark-on-light artwork
+    if invert is None:
+        invert = np.count_nonzero(mask) > mask.size / 2
+    if invert:
+        mask = 255 - mask
+
+    f = 1 << levels
+    coarse_min = min_area / (f * f)
+    outers, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    full = (gray <= thresh) if invert else (gray > thresh)
+
+    shapes = []
+    h, w = gray.shape
+    for outer in outers:
+        if cv2.contourArea(outer) < coarse_min:
+            continue
+        # Refine at full resolution inside this shape's region only
+        x, y, bw, bh = cv2.boundingRect(outer)
+        x0, y0 = max(0, (x - ROI_MARGIN) * f), max(0, (y - ROI_MARGIN) * f)
+        x1, y1 = min(w, (x + bw + ROI_MARGIN) * f), min(h, (y + bh + ROI_MARGIN) * f)
+        roi = full[y0:y1, x0:x1].astype(np.uint8)
+        contours, hierarchy = cv2.findContours(roi, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_NONE,
+                                               offset=(x0, y0))
+        if not contours:
+            continue
+        # The ROI can also clip neighbouring shapes: keep the outer contour
+        # that matches the coarse one, plus its holes.
+        cx, cy = (x + bw / 2) * f, (y + bh / 2) * f
+        candidates = [i for i, hier in enumerate(hierarchy[0]) if hier[3] < 0]
+        best = max(candidates, key=lambda i: cv2.contourArea(contours[i])
+                   - abs(cv2.pointPolygonTest(contours[i], (cx, cy), True)))
+        holes = [contours[i] for i, hier in enumerate(hierarchy[0])
+                 if hier[3] == best and cv2.contourArea(contours[i]) >= min_area]
+        shapes.append((contours[best], holes))
+    return shapes, float(thresh), levels
+
+
+def polygon_path(contour, epsilon):
+    """Closed straight-segment subpath for a contour."""
+    import cv2
+    approx = cv2.approxPolyDP(contour, epsilon * cv2.arcLength(contour, True), True)
+    pts = approx[:, 0, :]
+    return "M " + " L ".join(f"{x},{y}" for x, y in pts) + " Z"
+
+
+def _corners(pts):
+    """Indices of sharp turns along a closed contour."""
+    import numpy as np
+    fwd = np.roll(pts, -CORNER_SPAN, axis=0) - pts
+    back = pts - np.roll(pts, CORNER_SPAN, axis=0)
+    cross = back[:, 0] * fwd[:, 1] - back[:, 1] * fwd[:, 0]
+    turn = np.degrees(np.abs(np.arctan2(cross, (back * fwd).sum(axis=1))))
+    idx = []
+    for i in np.argsort(-turn):
+        if turn[i] < CORNER_ANGLE:
+            break
+        # keep only the sharpest point of each corner
+        if all(min(abs(i - j), len(pts) - abs(i - j)) > CORNER_SPAN for j in idx):
+            idx.append(int(i))
+    return sorted(idx)
+
+
+def _bezier(ctrl, t):
+    t = t[:, None]
+    mt = 1 - t
+    return (mt ** 3 * ctrl[0] + 3 * mt ** 2 * t * ctrl[1]
+            + 3 * mt * t ** 2 * ctrl[2] + t ** 3 * ctrl[3])
+
+
+def fit_cubics(pts, error, depth=0):
+    """Fit cubic Béziers to an open run of points (least squares, split on error)."""
+    import numpy as np
+    p0, p3 = pts[0], pts[-1]
+    if len(pts) < 4:
+        third = (p3 - p0) / 3
+        return [(p0, p0 + third, p3 - third, p3)]
+
+    chord = np.concatenate([[0], np.cumsum(np.linalg.norm(np.diff(pts, axis=0), axis=1))])
+    t = chord / chord[-1]
+    k = min(len(pts) - 1, CORNER_SPAN)
+    t1 = pts[k] - p0
+    t2 = pts[-1 - k] - p3
+    t1 /= np.linalg.norm(t1) or 1
+    t2 /= np.linalg.norm(t2) or 1
+
+    # Solve for the tangent lengths (Schneider's least-squares fit)
+    b1 = 3 * t * (1 - t) ** 2
+    b2 = 3 * t ** 2 * (1 - t)
+    a1, a2 = b1[:, None] * t1, b2[:, None] * t2
+    rest = pts - (((1 - t) ** 3 + b1)[:, None] * p0 + (b2 + t ** 3)[:, None] * p3)
+    c = np.array([[(a1 * a1).sum(), (a1 * a2).sum()], [(a1 * a2).sum(), (a2 * a2).sum()]])
+    x = np.array([(a1 * rest).sum(), (a2 * rest).sum()])
+    try:
+        alpha1, alpha2 = np.linalg.solve(c, x)
+    except np.linalg.LinAlgError:
+        alpha1 = alpha2 = -1
+    seg_len = np.linalg.norm(p3 - p0)
+    if alpha1 < 1e-6 * seg_len or alpha2 < 1e-6 * seg_len:
+        alpha1 = alpha2 = seg_len / 3
+    ctrl = (p0, p0 + alpha1 * t1, p3 + alpha2 * t2, p3)
+
+    dist = np.linalg.norm(_bezier(ctrl, t) - pts, axis=1)
+    worst = int(np.argmax(dist))
+    if dist[worst] <= error or depth > 12 or len(pts) < 8:
+        return [ctrl]
+    worst = min(max(worst, 3), len(pts) - 4)
+    return (fit_cubics(pts[:worst + 1], error, depth + 1)
+            + fit_cubics(pts[worst:], error, depth + 1))
+
+
+def bezier_path(contour, error):
+    """Closed cubic-Bézier subpath for a contour, split at its corners."""
+    import numpy as np
+    pts = contour[:, 0, :].astype(np.float64)
+    corners = _corners(pts) or [0]
+    n = len(pts)
+    d = []
+    for a, b in zip(corners, corners[1:] + [corners[0] + n]):
+        run = pts[[i % n for i in range(a, b + 1)]]
+        for p0, p1, p2, p3 in fit_cubics(run, error):
+            if not d:
+                d.append(f"M {p0[0]:.2f},{p0[1]:.2f}")
+            d.append(f"C {p1[0]:.2f},{p1[1]:.2f} {p2[0]:.2f},{p2[1]:.2f} "
+                     f"{p3[0]:.2f},{p3[1]:.2f}")
+    d.append("Z")
+    return " ".join(d)
+
+
+def vectorise(src, args):
+    """Vectorise one SourceImage; returns (svg, stats)."""
+    import cv2
+
+    path = src.path
+    gray = src.gray
+    h, w = gray.shape
+    shapes, thresh, levels = detect_shapes(gray, args.min_area, args.invert)
+
+    paths = []
+    for outer, holes in shapes:
+        if args.mode == "bezier":
+            d = " ".join(bezier_path(c, args.error) for c in [outer] + holes)
+        else:
+            d = " ".join(polygon_path(c, args.epsilon) for c in [outer] + holes)
+        paths.append(f'  <path d="{d}" fill="black" fill-rule="evenodd"/>')
+
+    svg = f'''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {w} {h}" width="{w}" height="{h}">
+  <!-- Vectorised from {os.path.basename(path)} ({args.mode}, threshold {thresh:.0f},
+       coarse search at 1/{1 << levels} scale) -->
+{chr(10).join(paths)}
+</svg>'''
+    stats = {"shapes": len(shapes), "holes": sum(len(hs) for _, hs in shapes),
+             "threshold": thresh, "levels": levels}
+
+    if args.debug:
+        debug = src.bgr()
+        for outer, holes in shapes:
+            cv2.drawContours(debug, [outer] + holes, -1, (0, 0, 255), 2)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        cv2.imwrite(os.path.join(args.out, f"debug-{stem}.png"), debug)
+    return svg, stats
+
+
+def _process(job):
+    """Worker: vectorise one image unless a cached result exists."""
+    path, args = job
+    src = load_image(path)  # pixels are only decoded on a cache miss
+    key = cache_key(src.data, args)
+    cached = os.path.join(CACHE_DIR, f"{key}.svg")
+    out_path = os.path.join(args.out, os.path.splitext(os.path.basename(path))[0] + ".svg")
+
+    hit = os.path.exists(cached) and not args.debug
+    stats = None
+    if not hit:
+        start = time.perf_counter()
+        svg, stats = vectorise(src, args)
+        svg = optimize_svg(svg, args.precision)
+        stats["seconds"] = time.perf_counter() - start
+        tmp_path = f"{cached}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(svg)
+        os.replace(tmp_path, cached)
+    shutil.copyfile(cached, out_path)
+    return path, out_path, hit, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorise raster logos and emblems to SVG.")
+    parser.add_argument("inputs", nargs="*",
+                        help="image files or folders (default: the repo logos)")
+    parser.add_argument("--mode", choices=("polygon", "bezier"), default="polygon",
+                        help="fit straight segments or cubic Béziers (default: polygon)")
+    parser.add_argument("--epsilon", type=float, default=0.002,
+                        help="polygon tolerance as a fraction of each outline's "
+                             "perimeter (default: 0.002)")
+    parser.add_argument("--error", type=float, default=1.5,
+                        help="maximum Bézier fit error in pixels (default: 1.5)")
+    parser.add_argument("--min-area", type=float, default=200,
+                        help="ignore shapes and holes smaller than this many "
+                             "full-resolution px² (default: 200)")
+    parser.add_argument("--invert", action=argparse.BooleanOptionalAction, default=None,
+                        help="treat dark (--invert) or light (--no-invert) pixels "
+                             "as the logo (default: auto)")
+    parser.add_argument("--precision", type=int, default=1,
+                        help="decimal places kept in the SVG (default: 1)")
+    parser.add_argument("--out", default=OUTPUT_DIR, help=f"output folder (default: {OUTPUT_DIR})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--debug", action="store_true",
+                        help="also write debug-<name>.png contour overlays (bypasses the cache)")
+    args = parser.parse_args()
+
+    try:
+        import cv2  # noqa: F401
+        import numpy  # noqa: F401
+    except ImportError:
+        print("Error: opencv-python and numpy are required — run: pip install opencv-python numpy")
+        sys.exit(1)
+
+    inputs = args.inputs or [os.path.join(REPO_ROOT, p) for p in DEFAULT_INPUTS]
+    images = find_images(inputs)
+    if not images:
+        print("No images found.")
+        sys.exit(1)
+
+    os.makedirs(args.out, exist_ok=True)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    print(f"Vectorising {len(images)} images ({args.mode})...\n")
+    print(f"  Output: {args.out}\n")
+
+    start = time.perf_counter()
+    hits = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for path, out_path, hit, stats in pool.map(_process, [(p, args) for p in images]):
+            hits += hit
+            name = os.path.basename(out_path)
+            if hit:
+                print(f"  Cached:  {name}")
+            else:
+                print(f"  Created: {name} — {stats['shapes']} shapes, {stats['holes']} holes, "
+                      f"threshold {stats['threshold']:.0f}, 1/{1 << stats['levels']} search, "
+                      f"{stats['seconds']:.2f}s")
+
+    print(f"\nDone! {len(images) - hits} vectorised, {hits} from cache "
+          f"in {time.perf_counter() - start:.2f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+/* Book of Verse — offline search.
+ *
+ * build-html.py writes the inverted index as small script files:
+ *   search/docs.js       every section: [page, anchor, section title, chapter]
+ *   search/terms-X.js    postings for the terms starting with X:
+ *                        term -> [doc, score, doc, score, ...]
+ *   search/tokeniser.js  {stopWords, minLength}: the filters the index was
+ *                        built with, applied to queries too
+ * Each calls VerseSearch.loaded(name, data). Shards are loaded with <script>
+ * tags on first use rather than fetch(), so search works from file:// with
+ * no server.
+ */
+(function () {
+    "use strict";
+
+    var MAX_RESULTS = 20;
+    var MAX_EXPANSIONS = 50;        // prefix matches taken per query term
+
+    var pending = {};
+    var cache = {};
+
+    window.VerseSearch = {
+        loaded: function (name, data) {
+            cache[name] = data;
+            if (pending[name]) {
+                pending[name].forEach(function (resolve) { resolve(data); });
+                delete pending[name];
+            }
+        }
+    };
+
+    function load(name) {
+        if (cache[name]) return Promise.resolve(cache[name]);
+        return new Promise(function (resolve) {
+            if (!pending[name]) {
+                pending[name] = [];
+                var script = document.createElement("script");
+                script.src = "search/" + name + ".js";
+                script.onerror = function () { window.VerseSearch.loaded(name, {}); };
+                document.head.appendChild(script);
+            }
+            pending[name].push(resolve);
+        });
+    }
+
+    // Same tokeniser as build-html.py: lower case, runs of [a-z0-9_], less
+    // stop words, short terms and numbers, none of which are in the index
+    function tokens(text, tokeniser) {
+        return (text.toLowerCase().match(/[a-z0-9_]+/g) || []).filter(function (term) {
+            return term.length >= tokeniser.minLength &&
+                tokeniser.stopWords.indexOf(term) < 0 && !/^[0-9]+$/.test(term);
+        });
+    }
+
+    function shardOf(term) {
+        var c = term.charAt(0);
+        return "terms-" + (c >= "0" && c <= "9" ? "0" : c);
+    }
+
+    // doc -> score for one query term: the exact term, plus terms it prefixes
+    function lookup(term) {
+        return load(shardOf(term)).then(function (shard) {
+            var scores = {};
+            var expansions = 0;
+            Object.keys(shard).forEach(function (key) {
+                if (key.lastIndexOf(term, 0) !== 0) return;
+                if (key !== term && ++expansions > MAX_EXPANSIONS) return;
+                var weight = key === term ? 1 : 0.5;
+                var postings = shard[key];
+                for (var i = 0; i < postings.length; i += 2) {
+                    var doc = postings[i];
+                    scores[doc] = (scores[doc] || 0) + weight * postings[i + 1];
+                }
+            });
+            return scores;
+        });
+    }
+
+    function search(query) {
+        return load("tokeniser").then(function (tokeniser) {
+            return rank(tokens(query, tokeniser));
+        });
+    }
+
+    function rank(terms) {
+        if (!terms.length) return Promise.resolve([]);
+        return Promise.all([load("docs")].concat(terms.map(lookup))).then(function (all) {
+            var docs = all[0];
+            var perTerm = all.slice(1);
+            // Every query term must match
+            return Object.keys(perTerm[0]).filter(function (doc) {
+                return perTerm.every(function (scores) { return doc in scores; });
+            }).map(function (doc) {
+                var score = perTerm.reduce(function (sum, scores) { return sum + scores[doc]; }, 0);
+                return { doc: docs[doc], score: score };
+            }).sort(function (a, b) { return b.score - a.score; }).slice(0, MAX_RESULTS);
+        });
+    }
+
+    function render(list, results) {
+        list.innerHTML = "";
+        results.forEach(function (result) {
+            var item = document.createElement("li");
+            var link = document.createElement("a");
+            link.href = result.doc[0] + (result.doc[1] ? "#" + result.doc[1] : "");
+            link.textContent = result.doc[2];
+            var chapter = document.createElement("span");
+            chapter.className = "chapter";
+            chapter.textContent = result.doc[3];
+            item.appendChild(link);
+            item.appendChild(chapter);
+            list.appendChild(item);
+        });
+    }
+
+    var input = document.getElementById("search-input");
+    var list = document.getElementById("search-results");
+    if (!input || !list) return;
+
+    var timer = null;
+    var latest = 0;
+    input.addEventListener("input", function () {
+        clearTimeout(timer);
+        timer = setTimeout(function () {
+            var ticket = ++latest;
+            search(input.value).then(function (results) {
+                if (ticket === latest) render(list, results);
+            });
+        }, 80);
+    });
+    input.addEventListener("keydown", function (event) {
+        if (event.key === "Enter") {
+            var first = list.querySelector("a");
+            if (first) window.location.href = first.href;
+        } else if (event.key === "Escape") {
+            input.value = "";
+            list.innerHTML = "";
+        }
+    });
+})();